@@ -0,0 +1,5 @@
+-- AlterTable
+ALTER TABLE "PdfProcessingJob" ADD COLUMN "contentHash" TEXT;
+
+-- CreateIndex
+CREATE INDEX "PdfProcessingJob_contentHash_idx" ON "PdfProcessingJob"("contentHash");
@@ -2,7 +2,7 @@
 Flask API service for PDF processing
 Deploy this to Render as a separate service
 """
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 import os
 import tempfile
@@ -10,6 +10,7 @@ from pathlib import Path
 import sys
 import requests
 import threading
+import time
 
 # Add parent directory to path to import process_pdf
 # The process_pdf module is in the python/ directory
@@ -22,13 +23,15 @@ sys.path.insert(0, str(project_root))
 # Import from process_pdf module in python/ directory
 # Try both import styles for compatibility
 try:
-    from python.process_pdf import extract_transactions_with_pdfplumber, StatementMetadata
-    from python.process_pdf import translate_to_english, predict_category, load_classifier
+    from python.process_pdf import extract_transactions, StatementMetadata, ExtractionOptions
+    from python.process_pdf import translate_batch_to_english, predict_category, load_classifier
+    from python.process_pdf import ResultStore, file_sha256, result_key, PIPELINE_METRICS
 except ImportError:
     # Fallback: add python directory directly to path
     sys.path.insert(0, str(python_dir))
-    from process_pdf import extract_transactions_with_pdfplumber, StatementMetadata
-    from process_pdf import translate_to_english, predict_category, load_classifier
+    from process_pdf import extract_transactions, StatementMetadata, ExtractionOptions
+    from process_pdf import translate_batch_to_english, predict_category, load_classifier
+    from process_pdf import ResultStore, file_sha256, result_key, PIPELINE_METRICS
 
 app = Flask(__name__)
 CORS(app)  # Allow requests from Vercel frontend
@@ -38,6 +41,11 @@ default_model_path = project_root / 'python' / 'models' / 'transactions_model.jo
 model_path = Path(os.getenv('CATEGORIES_MODEL_PATH', str(default_model_path)))
 classifier_model = load_classifier(model_path)
 
+# Results of recent uploads keyed by SHA-256 and settings (see result_key), so identical re-uploads/retries skip the pipeline
+result_store_max_entries = int(os.getenv('PDF_RESULT_STORE_MAX_ENTRIES', '200'))
+result_store_dir = Path(os.getenv('PDF_RESULT_STORE_DIR', str(Path(tempfile.gettempdir()) / 'moneta-pdf-results')))
+result_store = ResultStore(result_store_dir, result_store_max_entries) if result_store_max_entries > 0 else None
+
 def report_progress(job_id, callback_url, progress, status="processing", processed_count=None, total_count=None):
     """
     Send progress update to the callback URL.
@@ -60,12 +68,13 @@ def report_progress(job_id, callback_url, progress, status="processing", process
             if total_count is not None:
                 payload['totalCount'] = total_count
             
-            resp = requests.post(
-                callback_url, 
-                json=payload,
-                headers=headers,
-                timeout=5
-            )
+            with PIPELINE_METRICS.timed('callback'):
+                resp = requests.post(
+                    callback_url, 
+                    json=payload,
+                    headers=headers,
+                    timeout=5
+                )
             if not resp.ok:
                 print(f'[process_pdf] Progress update failed for {job_id}: status {resp.status_code}, response: {resp.text[:100]}', flush=True)
         except Exception as e:
@@ -95,12 +104,13 @@ def report_progress_with_result(job_id, callback_url, result):
             'result': result
         }
         
-        resp = requests.post(
-            callback_url, 
-            json=payload,
-            headers=headers,
-            timeout=10
-        )
+        with PIPELINE_METRICS.timed('callback'):
+            resp = requests.post(
+                callback_url, 
+                json=payload,
+                headers=headers,
+                timeout=10
+            )
         if not resp.ok:
             print(f'[process_pdf] Completion update failed for {job_id}: status {resp.status_code}, response: {resp.text[:200]}', flush=True)
         else:
@@ -113,12 +123,17 @@ def health():
     """Health check endpoint"""
     return jsonify({'status': 'ok', 'service': 'pdf-processor'})
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Stage duration histograms and extraction counters of all Gunicorn workers via PDF_METRICS_DIR (Prometheus text format)"""
+    return Response(PIPELINE_METRICS.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/process-pdf', methods=['POST'])
 def process_pdf():
     """
     Process PDF file and return transactions
     Expects multipart/form-data with 'file' field
-    Optional fields: 'jobId', 'callbackUrl'
+    Optional fields: 'jobId', 'callbackUrl', 'tableEngine' ('pdfplumber' or 'grid', default PDF_TABLE_ENGINE)
     """
     try:
         if 'file' not in request.files:
@@ -127,6 +142,7 @@ def process_pdf():
         # Get job tracking info
         job_id = request.form.get('jobId')
         callback_url = request.form.get('callbackUrl')
+        table_engine = request.form.get('tableEngine')
         print(f'[process_pdf] Received request for job {job_id} with callback {callback_url}', flush=True)
         
         file = request.files['file']
@@ -138,12 +154,24 @@ def process_pdf():
             file.save(tmp_file.name)
             pdf_path = Path(tmp_file.name)
         
+        job_started = time.perf_counter()
         try:
+            options = ExtractionOptions(table_engine=table_engine) if table_engine else None
+            content_hash = result_key(file_sha256(pdf_path), options)
+            stored_result = result_store.get(content_hash) if result_store else None
+            if stored_result is not None:
+                print(f'[process_pdf] Job {job_id}: identical upload {content_hash[:12]} already processed with these settings, returning stored result', flush=True)
+                PIPELINE_METRICS.count('jobs_from_stored_result')
+                report_progress_with_result(job_id, callback_url, stored_result)
+                return jsonify(stored_result)
+
             # Initial progress: File received
             report_progress(job_id, callback_url, 10, "processing")
             
             # Extract transactions
-            transactions, metadata = extract_transactions_with_pdfplumber(pdf_path)
+            transactions, metadata = extract_transactions(pdf_path, options)
+            if metadata.peak_rss_mb is not None:
+                print(f'[process_pdf] Job {job_id}: peak RSS during extraction {metadata.peak_rss_mb:.1f} MB', flush=True)
             
             # If no transactions found, return error (don't fall back to sample data)
             if not transactions:
@@ -167,10 +195,15 @@ def process_pdf():
             # Progress after extraction: 30% (we know total now, but haven't processed any yet)
             report_progress(job_id, callback_url, 30, "processing", processed_count=0, total_count=total)
             
+            # One translator call per few thousand characters of distinct descriptions
+            untranslated = set()
+            with PIPELINE_METRICS.timed('translate'):
+                translations = translate_batch_to_english([tx.description for tx in transactions], failed=untranslated)
+            
             result_transactions = []
-            for index, tx in enumerate(transactions, start=1):
-                translated = translate_to_english(tx.description)
-                category, confidence = predict_category(translated, classifier_model)
+            for index, (tx, translated) in enumerate(zip(transactions, translations), start=1):
+                with PIPELINE_METRICS.timed('categorize'):
+                    category, confidence = predict_category(translated, classifier_model)
                 
                 result_transactions.append({
                     'date': tx.date,
@@ -202,9 +235,17 @@ def process_pdf():
                 }
             }
             
+            # A translator outage leaves originals behind; don't replay them to later uploads
+            if untranslated:
+                print(f'[process_pdf] Job {job_id}: {len(untranslated)} descriptions left untranslated by translator errors, not storing the result', flush=True)
+            elif result_store:
+                result_store.put(content_hash, final_result)
+
             # Mark job as completed with final result (can't rely on Next.js background handler in serverless)
             report_progress_with_result(job_id, callback_url, final_result)
             
+            PIPELINE_METRICS.observe('job', time.perf_counter() - job_started)
+            
             # Also return result for backward compatibility
             return jsonify(final_result)
         
@@ -216,6 +257,7 @@ def process_pdf():
                 pass
     
     except Exception as e:
+        PIPELINE_METRICS.count('jobs_failed')
         # Report failure if possible
         # We don't know job_id/callback_url if they weren't parsed yet, 
         # but if they were, try to report.
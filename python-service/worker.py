@@ -6,9 +6,12 @@ import os
 import sys
 import json
 import time
+import hashlib
 import tempfile
+import threading
 from pathlib import Path
 from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 # Add parent directory to path to import process_pdf
 project_root = Path(__file__).resolve().parent.parent
@@ -24,18 +27,22 @@ except ImportError:
 
 try:
     from python.process_pdf import (
-        extract_transactions_with_pdfplumber,
-        translate_to_english,
+        extract_transactions,
+        result_key,
+        translate_batch_to_english,
         predict_category,
         load_classifier,
+        PIPELINE_METRICS,
     )
 except ImportError:
     sys.path.insert(0, str(python_dir))
     from process_pdf import (
-        extract_transactions_with_pdfplumber,
-        translate_to_english,
+        extract_transactions,
+        result_key,
+        translate_batch_to_english,
         predict_category,
         load_classifier,
+        PIPELINE_METRICS,
     )
 
 # Load classifier model once at startup
@@ -43,6 +50,34 @@ default_model_path = project_root / 'python' / 'models' / 'transactions_model.jo
 model_path = Path(os.getenv('CATEGORIES_MODEL_PATH', str(default_model_path)))
 classifier_model = load_classifier(model_path)
 
+# Port serving GET /metrics (Prometheus text format) from this worker; 0 disables it
+metrics_port = int(os.getenv('WORKER_METRICS_PORT', '0'))
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Serves the worker's stage duration histograms and extraction counters."""
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = PIPELINE_METRICS.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would drown the job logs
+        pass
+
+def start_metrics_server(port):
+    """Serve /metrics on a daemon thread so scrapes never wait for the job loop."""
+    server = ThreadingHTTPServer(('0.0.0.0', port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f'[worker] Serving metrics on port {port}', flush=True)
+    return server
+
 def get_db_connection():
     """Get PostgreSQL connection from DATABASE_URL environment variable."""
     database_url = os.getenv('DATABASE_URL')
@@ -81,9 +116,22 @@ def update_job_status(conn, job_id, status, progress=None, result=None, error=No
         WHERE id = %s
     """
     
-    cursor.execute(query, values)
+    with PIPELINE_METRICS.timed('job_status_update'):
+        cursor.execute(query, values)
+        conn.commit()
+    cursor.close()
+
+def delete_file_content(conn, job_id):
+    """Drop the stored PDF bytes once the job has a result."""
+    cursor = conn.cursor()
+    cursor.execute("""
+        UPDATE "PdfProcessingJob"
+        SET "fileContent" = NULL
+        WHERE id = %s
+    """, (job_id,))
     conn.commit()
     cursor.close()
+    print(f'[worker] Deleted PDF content from database for job {job_id}', flush=True)
 
 def create_notification(conn, user_id, message):
     """Create a notification for the user."""
@@ -113,15 +161,51 @@ def create_notification(conn, user_id, message):
         if cursor:
             cursor.close()
 
+def find_completed_result(conn, content_hash, user_id, job_id):
+    """Return the result of this user's latest completed job for identical PDF bytes, if any."""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT result
+        FROM "PdfProcessingJob"
+        WHERE "contentHash" = %s
+          AND "userId" = %s
+          AND id <> %s
+          AND status = 'completed'
+          AND result IS NOT NULL
+        ORDER BY "completedAt" DESC NULLS LAST
+        LIMIT 1
+    """, (content_hash, user_id, job_id))
+    row = cursor.fetchone()
+    cursor.close()
+    return row[0] if row else None
+
 def process_job(conn, job_id, file_content, file_name, user_id):
     """Process a single PDF job."""
     temp_file_path = None
+    job_started = time.perf_counter()
     try:
         print(f'[worker] Processing job {job_id}...', flush=True)
         
         # Update status to processing
         update_job_status(conn, job_id, 'processing', progress=0)
         
+        # Index the job by content and extraction settings so identical uploads can reuse its result
+        file_content = bytes(file_content)
+        content_hash = result_key(hashlib.sha256(file_content).hexdigest())
+        cursor = conn.cursor()
+        cursor.execute('UPDATE "PdfProcessingJob" SET "contentHash" = %s WHERE id = %s', (content_hash, job_id))
+        conn.commit()
+        cursor.close()
+        
+        stored_result = find_completed_result(conn, content_hash, user_id, job_id)
+        if stored_result is not None:
+            print(f'[worker] Job {job_id}: identical PDF {content_hash[:12]} already processed, reusing its result', flush=True)
+            PIPELINE_METRICS.count('jobs_from_stored_result')
+            update_job_status(conn, job_id, 'completed', progress=100, result=stored_result)
+            delete_file_content(conn, job_id)
+            print(f'[worker] Job {job_id} completed from stored result', flush=True)
+            return
+        
         # Write file content to temporary file on Render's filesystem
         temp_dir = Path(tempfile.gettempdir())
         temp_file_path = temp_dir / f'pdf_{job_id}_{file_name}'
@@ -132,7 +216,9 @@ def process_job(conn, job_id, file_content, file_name, user_id):
         
         # Extract transactions
         print(f'[worker] Extracting transactions from {file_name}...', flush=True)
-        transactions, metadata = extract_transactions_with_pdfplumber(temp_file_path)
+        transactions, metadata = extract_transactions(temp_file_path)
+        if metadata.peak_rss_mb is not None:
+            print(f'[worker] Job {job_id}: peak RSS during extraction {metadata.peak_rss_mb:.1f} MB', flush=True)
         
         if not transactions:
             raise ValueError('No transactions found in PDF')
@@ -146,10 +232,15 @@ def process_job(conn, job_id, file_content, file_name, user_id):
         total = len(transactions)
         print(f'[worker] Starting translation + categorization for {total} transactions', flush=True)
         
+        # One translator call per few thousand characters of distinct descriptions
+        untranslated = set()
+        with PIPELINE_METRICS.timed('translate'):
+            translations = translate_batch_to_english([tx.description for tx in transactions], failed=untranslated)
+        
         result_transactions = []
-        for index, tx in enumerate(transactions, start=1):
-            translated = translate_to_english(tx.description)
-            category, confidence = predict_category(translated, classifier_model)
+        for index, (tx, translated) in enumerate(zip(transactions, translations), start=1):
+            with PIPELINE_METRICS.timed('categorize'):
+                category, confidence = predict_category(translated, classifier_model)
             
             result_transactions.append({
                 'date': tx.date,
@@ -179,28 +270,30 @@ def process_job(conn, job_id, file_content, file_name, user_id):
             }
         }
         
+        # A translator outage leaves originals behind: complete the job but keep it out of reuse
+        if untranslated:
+            print(f'[worker] Job {job_id}: {len(untranslated)} descriptions left untranslated by translator errors, result will not be reused', flush=True)
+            cursor = conn.cursor()
+            cursor.execute('UPDATE "PdfProcessingJob" SET "contentHash" = NULL WHERE id = %s', (job_id,))
+            conn.commit()
+            cursor.close()
+        
         # Mark as completed
         update_job_status(conn, job_id, 'completed', progress=100, result=result)
         
         # Delete PDF content to save database storage (we only need the extracted transactions)
-        cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE "PdfProcessingJob"
-            SET "fileContent" = NULL
-            WHERE id = %s
-        """, (job_id,))
-        conn.commit()
-        cursor.close()
-        print(f'[worker] Deleted PDF content from database for job {job_id}', flush=True)
+        delete_file_content(conn, job_id)
         
         # Notification will be created by the API route when it receives the completion status
         # No need to create it here to avoid duplicates
         
+        PIPELINE_METRICS.observe('job', time.perf_counter() - job_started)
         print(f'[worker] Job {job_id} completed successfully', flush=True)
         
     except Exception as e:
         error_msg = str(e)
         print(f'[worker] Error processing job {job_id}: {error_msg}', flush=True)
+        PIPELINE_METRICS.count('jobs_failed')
         update_job_status(conn, job_id, 'failed', error=error_msg)
         
         # Create error notification
@@ -225,6 +318,8 @@ def main():
     """Main worker loop - polls for jobs and processes them."""
     print('[worker] Starting PDF processing worker...', flush=True)
     print(f'[worker] Model path: {model_path}', flush=True)
+    if metrics_port:
+        start_metrics_server(metrics_port)
     
     # Connect to database
     try:
@@ -241,7 +336,8 @@ def main():
             
             # Find next queued job (FOR UPDATE SKIP LOCKED prevents multiple workers from picking same job)
             cursor.execute("""
-                SELECT id, "fileContent", "fileName", "userId"
+                SELECT id, "fileContent", "fileName", "userId",
+                       EXTRACT(EPOCH FROM NOW() - "createdAt") AS queue_wait_seconds
                 FROM "PdfProcessingJob"
                 WHERE status = 'queued'
                 ORDER BY "createdAt" ASC
@@ -257,6 +353,9 @@ def main():
                 file_content = job['fileContent']  # Bytes from database
                 file_name = job['fileName']
                 user_id = job['userId']
+                # Measured by the database clock, so worker clock skew doesn't matter
+                if job['queue_wait_seconds'] is not None:
+                    PIPELINE_METRICS.observe('queue_wait', float(job['queue_wait_seconds']))
                 
                 process_job(conn, job_id, file_content, file_name, user_id)
             else:
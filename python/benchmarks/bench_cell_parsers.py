@@ -0,0 +1,227 @@
+"""
+Microbenchmark for the per-cell helpers in process_pdf.py.
+
+Builds a large synthetic statement table in memory (no PDF needed) and measures rows per
+second through the helpers _process_table leans on for every cell, _normalize_description
+on its own, and _process_table over the rows split into small tables. Pass --baseline <git-ref> to load process_pdf.py as it
+was at that revision and compare speed and outputs against the working tree:
+
+    python python/benchmarks/bench_cell_parsers.py --rows 5000 --baseline HEAD~1
+
+Every run also fuzzes _normalize_description against the chain of re.sub calls it replaced
+(--fuzz strings built from its boilerplate fragments), since the synthetic rows above only
+cover a handful of descriptions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import inspect
+import logging
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+PYTHON_DIR = Path(__file__).resolve().parent.parent
+REPO_ROOT = PYTHON_DIR.parent
+
+GEORGIAN_OPERATIONS = ("საბარათე ოპერაცია", "გადახდები", "გადარიცხვა")
+DESCRIPTIONS = (
+    "გადახდა - LTD MADAGONI 2 3.54 GEL",
+    "გადახდა - CARREFOUR TBILISI 20.65 GEL",
+    "ხელფასის ჩარიცხვა",
+    "123456 Операция по карте ****1234 PYATEROCHKA 1234 MOSCOW RUS",
+    "Оплата по карте ****1234 YANDEX.TAXI  MOSCOW\nRUS",
+    "Перевод на карту ****5678 И. Иван Иванович Продолжение на следующей странице 2",
+    "NETFLIX.COM  Для проверки подлинности документа обратитесь в банк",
+    "Зачисление зарплаты ООО РОМАШКА В ВАЛЮТЕ СЧЁТА 1 000,00",
+)
+# Pieces _normalize_description strips or must keep, glued together at random by fuzz_descriptions
+FUZZ_FRAGMENTS = (
+    "операция по карте", "Операция по карте", "ОПЕРАЦИЯ ПО КАРТЕ", "карте", "по", "оплата",
+    "OZON", "x", "*", "****", "1234", "12", "5", "2", ".", "-", " ", "  ", "\n",
+    "Продолжение на следующей странице", "Для проверки подлинности", "В ВАЛЮТЕ СЧЁТА",
+)
+
+
+def reference_normalize_description(value: str) -> str:
+    """_normalize_description as it was before its patterns were merged, one re.sub per rule."""
+    if not value:
+        return "Imported transaction"
+    text = re.sub(r"\s+", " ", value).strip()
+    text = re.sub(r"^\d{4,}\s+", "", text)
+    text = re.sub(r"\bоперация по карте\s+\*+\d+\b", "", text, flags=re.IGNORECASE)
+    text = re.sub(r"\bоперация по карте\b", "", text, flags=re.IGNORECASE)
+    text = re.sub(r"\bкарте\s+\*+\d+\b", "", text, flags=re.IGNORECASE)
+    text = re.sub(r"Продолжение на следующей странице.*", "", text, flags=re.IGNORECASE)
+    text = re.sub(r"Для проверки подлинности.*", "", text, flags=re.IGNORECASE)
+    text = re.sub(r"В ВАЛЮТЕ СЧЁТА.*", "", text, flags=re.IGNORECASE)
+    text = re.sub(r"\s+", " ", text).strip(" -")
+    return text or "Imported transaction"
+
+
+def fuzz_descriptions(count: int, seed: int = 11) -> List[str]:
+    rng = random.Random(seed)
+    return ["".join(rng.choice(FUZZ_FRAGMENTS) for _ in range(rng.randint(0, 8))) for _ in range(count)]
+
+
+def load_process_pdf(revision: str = ""):
+    """Import process_pdf from the working tree, or from `revision` via `git show`."""
+    if not revision:
+        path = PYTHON_DIR / "process_pdf.py"
+        name = "process_pdf_current"
+    else:
+        source = subprocess.run(
+            ["git", "show", f"{revision}:python/process_pdf.py"],
+            cwd=REPO_ROOT,
+            check=True,
+            capture_output=True,
+        ).stdout
+        handle = tempfile.NamedTemporaryFile(suffix=".py", delete=False)
+        handle.write(source)
+        handle.close()
+        path = Path(handle.name)
+        name = "process_pdf_baseline"
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def synthetic_rows(count: int, seed: int = 7) -> List[List[str]]:
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        amount = f"{rng.uniform(1, 2500):.2f}"
+        debit = rng.random() < 0.8
+        rows.append([
+            f"{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.2025 {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}",
+            rng.choice(GEORGIAN_OPERATIONS),
+            amount if debit else "",
+            "" if debit else amount,
+            f"{rng.uniform(100, 9000):,.2f}".replace(",", "\xa0"),
+            rng.choice(DESCRIPTIONS),
+            f"****{rng.randint(1000, 9999)}",
+        ])
+    return rows
+
+
+GEORGIAN_HEADER = ["თარიღი", "ოპერაცია", "ბრუნვა (დებ)", "ბრუნვა (კრ)", "ნაშთი", "დანიშნულება", "ბენეფიციარის"]
+TABLE_ROWS = 25
+
+
+def synthetic_tables(rows: List[List[str]]) -> List[List[List[str]]]:
+    """Alternate Georgian tables with a header and header-less tables whose amounts sit outside the default columns."""
+    tables = []
+    for number, offset in enumerate(range(0, len(rows), TABLE_ROWS)):
+        chunk = rows[offset:offset + TABLE_ROWS]
+        if number % 2 == 0:
+            tables.append([GEORGIAN_HEADER] + chunk)
+        else:
+            tables.append([
+                [row[0].split()[0], row[0].split()[1], row[1], row[5], row[2] or "+" + row[3], row[4]]
+                for row in chunk
+            ])
+    return tables
+
+
+def document_state(module, func: Callable) -> Dict[str, object]:
+    """Fresh per-document helpers `func` accepts in this revision of process_pdf (none in older ones)."""
+    parameters = inspect.signature(func).parameters
+    if "classifier" in parameters:
+        return {"classifier": module.CellClassifier(module.DateFormatLearner())}
+    if "dates" in parameters:
+        return {"dates": module.DateFormatLearner()}
+    return {}
+
+
+def workloads(module, rows: List[List[str]]) -> Dict[str, Callable[[], List[object]]]:
+    tables = synthetic_tables(rows)
+
+    def cells() -> List[object]:
+        # Parse dates the way _process_table does: through the document's learner when there is one
+        learner = getattr(module, "DateFormatLearner", None)
+        parse_date = learner().parse if learner else module.parse_date
+        outputs = []
+        for row in rows:
+            cleaned = [module._clean_cell_text(cell) for cell in row]
+            outputs.append((
+                [parse_date(cell) for cell in cleaned],
+                [module._looks_like_time(cell) or module._is_masked_value(cell) for cell in cleaned],
+                module._strip_date_prefix(cleaned[0] + " " + cleaned[5]),
+                module._line_starts_with_date(cleaned[0]),
+            ))
+        return outputs
+
+    def normalize() -> List[object]:
+        return [module._normalize_description(row[5]) for row in rows]
+
+    def process_tables() -> List[object]:
+        state = document_state(module, module._process_table)
+        transactions: List[object] = []
+        for index, table in enumerate(tables, start=1):
+            module._process_table(table, 1, index, transactions, **state)
+        return [tuple(vars(item).values()) for item in transactions]
+
+    return {"cell helpers": cells, "_normalize_description": normalize, "_process_table": process_tables}
+
+
+def measure(func: Callable[[], List[object]], rows: int, repeat: int) -> Tuple[float, List[object]]:
+    best = float("inf")
+    outputs: List[object] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        outputs = func()
+        best = min(best, time.perf_counter() - started)
+    return rows / best, outputs
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000, help="synthetic table rows (default: 2000)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per workload, best is reported")
+    parser.add_argument("--baseline", default="", help="git revision to compare against, e.g. HEAD~1")
+    parser.add_argument("--fuzz", type=int, default=200000, help="random descriptions to check (default: 200000, 0 skips)")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    rows = synthetic_rows(args.rows)
+    module = load_process_pdf()
+    current = workloads(module, rows)
+    baseline = workloads(load_process_pdf(args.baseline), rows) if args.baseline else None
+
+    print(f"{args.rows} synthetic rows, best of {args.repeat}")
+    mismatches = 0
+    if args.fuzz:
+        differing = [
+            text for text in fuzz_descriptions(args.fuzz)
+            if module._normalize_description(text) != reference_normalize_description(text)
+        ]
+        mismatches += 1 if differing else 0
+        print(f"  _normalize_description fuzz: {len(differing):,} of {args.fuzz:,} strings differ from the re.sub chain")
+        for text in differing[:5]:
+            print(f"    {text!r}: {module._normalize_description(text)!r} != {reference_normalize_description(text)!r}")
+    for name, func in current.items():
+        current_rate, current_out = measure(func, args.rows, args.repeat)
+        line = f"  {name:<24} {current_rate:>12,.0f} rows/s"
+        if baseline:
+            baseline_rate, baseline_out = measure(baseline[name], args.rows, args.repeat)
+            same = baseline_out == current_out
+            mismatches += 0 if same else 1
+            line += (
+                f"   baseline {baseline_rate:>12,.0f} rows/s   x{current_rate / baseline_rate:.2f}"
+                f"   outputs {'identical' if same else 'DIFFER'}"
+            )
+        print(line)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
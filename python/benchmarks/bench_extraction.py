@@ -0,0 +1,249 @@
+"""
+End-to-end extraction benchmark over synthetic statements.
+
+Generates one statement per layout with synth_statements.py, runs
+extract_transactions_with_pdfplumber on each in a fresh process and reports pages/s,
+rows/s, peak RSS and where the time went (pdfminer layout parsing, each table strategy,
+_process_table, the text fallback). Results are compared against a stored baseline so
+a slowdown shows up in review:
+
+    python python/benchmarks/bench_extraction.py                   # compare with the stored baseline
+    python python/benchmarks/bench_extraction.py --save-baseline   # after an intended change
+    python python/benchmarks/bench_extraction.py --revision HEAD~1 # measure an older process_pdf.py instead
+    python python/benchmarks/bench_extraction.py --table-engine grid
+
+Throughput depends on the machine: refresh the baseline on the machine that reviews
+with it. Row counts and a digest of the rows themselves (date, description, amount) are
+compared too; a difference means the parser changed behaviour. --table-engine grid is
+checked against the same baseline, so the grid must return exactly pdfplumber's rows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import multiprocessing
+import platform
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+from bench_cell_parsers import load_process_pdf
+from synth_statements import LAYOUTS, StatementSpec, generate_statement
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = BENCHMARK_DIR / "extraction_baseline.json"
+
+
+class StageClock:
+    """Exclusive wall time per stage: a stage entered inside another pauses the outer one."""
+
+    def __init__(self) -> None:
+        self.totals: Dict[str, float] = defaultdict(float)
+        self._stack: List[List] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        now = time.perf_counter()
+        if self._stack:
+            outer = self._stack[-1]
+            self.totals[outer[0]] += now - outer[1]
+        self._stack.append([name, now])
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            current, since = self._stack.pop()
+            self.totals[current] += end - since
+            if self._stack:
+                self._stack[-1][1] = end
+
+    def wrap(self, func: Callable, name: Callable[..., str]) -> Callable:
+        @wraps(func)
+        def timed(*args, **kwargs):
+            with self.stage(name(*args, **kwargs)):
+                return func(*args, **kwargs)
+        return timed
+
+
+def _strategy_name(module, settings: Optional[Dict]) -> str:
+    """Name of the TABLE_STRATEGIES entry behind `settings`, including cropped variants of it."""
+    settings = settings or {}
+    # Older revisions kept the strategies inline; an exception here would be swallowed as a failed strategy
+    for strategy in getattr(module, "TABLE_STRATEGIES", ()):
+        expected = strategy["settings"]
+        if settings is expected:
+            return strategy["name"]
+        if all(settings.get(key) == value for key, value in expected.items() if key != "vertical_strategy"):
+            if settings.get("vertical_strategy") == "explicit":
+                return f"{strategy['name']} (cropped)"
+    return "{}/{} snap {}".format(
+        settings.get("vertical_strategy", "lines"), settings.get("horizontal_strategy", "lines"), settings.get("snap_tolerance", 3)
+    )
+
+
+def _instrument(module) -> StageClock:
+    """Time pdfplumber's layout parsing and table finding, and the row parsers of `module`."""
+    from pdfplumber.page import Page
+
+    clock = StageClock()
+    layout_property = Page.layout
+
+    def layout(page):
+        if hasattr(page, "_layout"):
+            return page._layout
+        with clock.stage("layout"):
+            return layout_property.fget(page)
+
+    Page.layout = property(layout)
+    Page.extract_tables = clock.wrap(
+        Page.extract_tables,
+        lambda page, table_settings=None: f"strategy: {_strategy_name(module, table_settings)}",
+    )
+    for name in ("_process_table", "_extract_transactions_from_text", "_extract_grid_rows"):
+        if hasattr(module, name):
+            setattr(module, name, clock.wrap(getattr(module, name), lambda *args, name=name, **kwargs: name))
+    return clock
+
+
+def rows_digest(rows: List) -> str:
+    """SHA-256 of the extracted rows, so two runs can be compared on content and not just count."""
+    content = [[row.date, row.description, round(float(row.amount), 2)] for row in rows]
+    return hashlib.sha256(json.dumps(content, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def run_case(pdf_path: str, revision: str, repeat: int, table_engine: str = "") -> Dict:
+    """Child-process entry point: extract one statement `repeat` times and keep the fastest run."""
+    module = load_process_pdf(revision)
+    logging.disable(logging.CRITICAL)
+    clock = _instrument(module)
+    # Older revisions have no table engines; only pass options when one was asked for
+    options = (module.ExtractionOptions(table_engine=table_engine),) if table_engine else ()
+    best: Optional[Dict] = None
+    for _ in range(repeat):
+        clock.totals.clear()
+        started = time.perf_counter()
+        rows, _metadata = module.extract_transactions_with_pdfplumber(Path(pdf_path), *options)
+        elapsed = time.perf_counter() - started
+        if best is None or elapsed < best["seconds"]:
+            best = {"seconds": elapsed, "rows": len(rows), "rows_digest": rows_digest(rows), "stages": dict(clock.totals)}
+    if resource is not None:
+        scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+        best["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1)
+    return best
+
+
+def measure(cases: Dict[str, Path], pages: int, revision: str, repeat: int, table_engine: str = "") -> Dict[str, Dict]:
+    results: Dict[str, Dict] = {}
+    # spawn: every case starts from a fresh interpreter, so peak RSS and module caches are its own
+    context = multiprocessing.get_context("spawn")
+    for name, path in cases.items():
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            run = executor.submit(run_case, str(path), revision, repeat, table_engine).result()
+        seconds = run["seconds"]
+        results[name] = {
+            "pages": pages,
+            "rows": run["rows"],
+            "rows_digest": run["rows_digest"],
+            "seconds": round(seconds, 3),
+            "pages_per_s": round(pages / seconds, 2),
+            "rows_per_s": round(run["rows"] / seconds, 1),
+            "peak_rss_mb": run.get("peak_rss_mb"),
+            "stages": {stage: round(value, 3) for stage, value in sorted(run["stages"].items())},
+        }
+    return results
+
+
+def report(results: Dict[str, Dict], baseline: Optional[Dict[str, Dict]], tolerance: float) -> int:
+    problems = 0
+    for name, result in results.items():
+        reference = (baseline or {}).get(name)
+        line = (
+            f"{name:<9} {result['pages']:>4} pages {result['rows']:>6} rows  "
+            f"{result['pages_per_s']:>7.2f} pages/s {result['rows_per_s']:>9,.1f} rows/s  "
+            f"peak RSS {result['peak_rss_mb'] or 0:>6.1f} MB"
+        )
+        if reference:
+            change = result["pages_per_s"] / reference["pages_per_s"] - 1
+            verdict = "ok"
+            if result["rows"] != reference["rows"]:
+                verdict = f"ROWS CHANGED (baseline {reference['rows']})"
+            elif reference.get("rows_digest") not in (None, result["rows_digest"]):
+                verdict = "ROW CONTENTS CHANGED"
+            elif change < -tolerance:
+                verdict = "REGRESSION"
+            problems += verdict != "ok"
+            line += f"   vs baseline {change:+.0%} {verdict}"
+        print(line)
+        reference_stages = (reference or {}).get("stages", {})
+        other = result["seconds"] - sum(result["stages"].values())
+        for stage, seconds in list(result["stages"].items()) + [("other", other)]:
+            before = reference_stages.get(stage)
+            suffix = f"   (baseline {before:.3f}s)" if before is not None else ""
+            print(f"    {stage:<40} {seconds:>8.3f}s{suffix}")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--layouts", default=",".join(LAYOUTS), help=f"comma-separated subset of {', '.join(LAYOUTS)}")
+    parser.add_argument("--pages", type=int, default=10, help="pages per statement (default: 10)")
+    parser.add_argument("--rows", type=int, default=30, help="transactions per page (default: 30)")
+    parser.add_argument("--seed", type=int, default=7, help="synthetic statement seed (default: 7)")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per statement, the fastest is reported")
+    parser.add_argument("--revision", default="", help="git revision of process_pdf.py to measure (default: working tree)")
+    parser.add_argument("--table-engine", default="", help="ExtractionOptions.table_engine to run with, e.g. grid")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="stored results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to --baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="pages/s drop reported as a regression (default: 0.15)")
+    args = parser.parse_args()
+
+    layouts = [layout.strip() for layout in args.layouts.split(",") if layout.strip()]
+    with tempfile.TemporaryDirectory(prefix="moneta-bench-") as directory:
+        cases = {
+            layout: generate_statement(
+                StatementSpec(layout, args.pages, args.rows, args.seed), Path(directory) / f"{layout}.pdf"
+            )
+            for layout in layouts
+        }
+        results = measure(cases, args.pages, args.revision, args.repeat, args.table_engine)
+
+    stored = None
+    if args.baseline.exists() and not args.save_baseline:
+        stored = json.loads(args.baseline.read_text(encoding="utf-8"))
+        recorded = (stored.get("pages"), stored.get("rows_per_page"), stored.get("seed", 7))
+        if recorded != (args.pages, args.rows, args.seed):
+            print("Baseline was recorded with --pages {} --rows {} --seed {}; not comparing".format(*recorded))
+            stored = None
+
+    print(f"{args.pages} pages x {args.rows} rows per statement (seed {args.seed}), best of {args.repeat}")
+    problems = report(results, stored["results"] if stored else None, args.tolerance)
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps({
+            "pages": args.pages,
+            "rows_per_page": args.rows,
+            "seed": args.seed,
+            "machine": f"{platform.machine()} {platform.processor() or ''}".strip(),
+            "python": platform.python_version(),
+            "results": results,
+        }, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"Baseline written to {args.baseline}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,115 @@
+"""
+Microbenchmark for the keyword classification in process_pdf.py.
+
+Runs the header check, the credit/debit decision of the text fallback and header column
+detection over synthetic Russian, Georgian and English statement lines (no PDF needed).
+Pass --baseline <git-ref> to compare speed and outputs against process_pdf.py at that revision:
+
+    python python/benchmarks/bench_keywords.py --lines 20000 --baseline HEAD~1
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+from typing import Callable, Dict, List
+
+from bench_cell_parsers import load_process_pdf, measure, synthetic_rows
+
+RUSSIAN_LINES = (
+    "{date} 14:32 284715 Супермаркеты Оплата по карте ****1234 PYATEROCHKA 1234 MOSCOW RUS {amount} {balance}",
+    "{date} 09:05 103948 Перевод на карту ****5678 И. Иван Иванович {amount} {balance}",
+    "{date} 12:00 550012 Прочие операции Зачисление зарплаты ООО РОМАШКА +{amount} {balance}",
+    "{date} 18:47 771203 Рестораны и кафе Оплата по карте ****1234 KOFEMANIYA MOSCOW RUS {amount} {balance}",
+    "{date} 08:15 902211 Перевод от Петров П. П. +{amount} {balance}",
+)
+GEORGIAN_LINES = (
+    "{date} საბარათე ოპერაცია გადახდა - LTD MADAGONI 2 {amount} {balance}",
+    "{date} გადახდები გადახდა - CARREFOUR TBILISI {amount} {balance}",
+    "{date} გადარიცხვა ხელფასის ჩარიცხვა +{amount} {balance}",
+    "{date} საბარათე ოპერაცია გადახდა - WOLT GEORGIA {amount} {balance}",
+)
+ENGLISH_LINES = (
+    "{date} Card payment to TESCO STORES 3021 LONDON {amount} {balance}",
+    "{date} Incoming transfer from J SMITH rent +{amount} {balance}",
+    "{date} Cash withdrawal ATM 0423 HIGH ST {amount} {balance}",
+    "{date} Salary ACME LTD credited +{amount} {balance}",
+    "{date} Direct debit VODAFONE LTD {amount} {balance}",
+)
+HEADERS = {
+    "russian": ["ДАТА ОПЕРАЦИИ", "КАТЕГОРИЯ", "Описание операции", "СУММА В ВАЛЮТЕ СЧЁТА", "ОСТАТОК СРЕДСТВ"],
+    "georgian": ["თარიღი", "ოპერაცია", "ბრუნვა (დებ)", "ბრუნვა (კრ)", "ნაშთი", "დანიშნულება", "ბენეფიციარის"],
+    "english": ["Date", "Description", "Paid out", "Paid in", "Balance"],
+}
+
+
+def _amount(rng: random.Random, low: float, high: float) -> str:
+    return f"{rng.uniform(low, high):,.2f}".replace(",", " ").replace(".", ",")
+
+
+def statement_lines(language: str, count: int, seed: int = 7) -> List[str]:
+    """Text-fallback style lines ("DD.MM.YYYY ... amount balance") for one language."""
+    rng = random.Random(seed)
+    templates = {"russian": RUSSIAN_LINES, "georgian": GEORGIAN_LINES, "english": ENGLISH_LINES}[language]
+    return [
+        rng.choice(templates).format(
+            date=f"{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.2025",
+            amount=_amount(rng, 1, 2500),
+            balance=_amount(rng, 100, 90000),
+        )
+        for _ in range(count)
+    ]
+
+
+def workloads(module, language: str, lines: List[str]) -> Dict[str, Callable[[], List[object]]]:
+    # Georgian table rows as _process_table sees them, for the per-row header check
+    row_texts = [" ".join(row) for row in synthetic_rows(len(lines))] if language == "georgian" else lines
+    headers = [HEADERS[language]] * len(lines)
+
+    def header_check() -> List[object]:
+        return [module._looks_like_header(text) for text in row_texts]
+
+    def text_lines() -> List[object]:
+        return [module._parse_text_transaction_line(line) for line in lines]
+
+    def column_detection() -> List[object]:
+        return [tuple(vars(module._detect_table_columns(header)).values()) for header in headers]
+
+    return {"header check": header_check, "text lines": text_lines, "column detection": column_detection}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=20000, help="synthetic lines per language (default: 20000)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per workload, best is reported")
+    parser.add_argument("--baseline", default="", help="git revision to compare against, e.g. HEAD~1")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    current_module = load_process_pdf()
+    baseline_module = load_process_pdf(args.baseline) if args.baseline else None
+
+    print(f"{args.lines} synthetic lines per language, best of {args.repeat}")
+    mismatches = 0
+    for language in ("russian", "georgian", "english"):
+        lines = statement_lines(language, args.lines)
+        current = workloads(current_module, language, lines)
+        baseline = workloads(baseline_module, language, lines) if baseline_module else None
+        for name, func in current.items():
+            current_rate, current_out = measure(func, args.lines, args.repeat)
+            line = f"  {language:<9} {name:<17} {current_rate:>12,.0f} lines/s"
+            if baseline:
+                baseline_rate, baseline_out = measure(baseline[name], args.lines, args.repeat)
+                same = baseline_out == current_out
+                mismatches += 0 if same else 1
+                line += (
+                    f"   baseline {baseline_rate:>12,.0f} lines/s   x{current_rate / baseline_rate:.2f}"
+                    f"   outputs {'identical' if same else 'DIFFER'}"
+                )
+            print(line)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
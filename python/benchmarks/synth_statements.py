@@ -0,0 +1,283 @@
+"""
+Synthetic bank-statement PDF generator used by the extraction benchmarks.
+
+Statements are written with a tiny dependency-free PDF writer. Text is drawn
+with a non-embedded Type0 font whose ToUnicode map is the identity, which is
+all pdfplumber/pdfminer need to recover Georgian and Cyrillic text. The files
+are not meant to look good in a viewer - only to exercise the parser.
+
+Layouts: "georgian" (ruled debit/credit tables), "sberbank" (text-only lines) and
+"mixed" (alternating pages). To write one statement by hand:
+
+    python python/benchmarks/synth_statements.py --layout sberbank --pages 20 --rows 40 /tmp/sber.pdf
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import zlib
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List, Tuple
+
+PAGE_WIDTH = 595.0
+PAGE_HEIGHT = 842.0
+FONT_SIZE = 7.0
+# Matches the /DW entry of the CID font: every glyph is half an em wide
+CHAR_WIDTH = FONT_SIZE * 0.5
+
+LAYOUTS = ("georgian", "sberbank", "mixed")
+
+GEORGIAN_HEADER = (
+    "თარიღი",
+    "ოპერაცია",
+    "ბრუნვა (დებ)",
+    "ბრუნვა (კრ)",
+    "ნაშთი",
+    "დანიშნულება",
+    "ბენეფიციარის",
+)
+GEORGIAN_COLUMN_WIDTHS = (52.0, 70.0, 48.0, 48.0, 52.0, 170.0, 95.0)
+GEORGIAN_OPERATIONS = ("საბარათე ოპერაცია", "გადახდები", "გადარიცხვა")
+GEORGIAN_MERCHANTS = (
+    "გადახდა - LTD MADAGONI 2",
+    "გადახდა - CARREFOUR TBILISI",
+    "გადახდა - BOLT.EU",
+    "გადახდა - WOLT GEORGIA",
+    "ხელფასის ჩარიცხვა",
+    "გადარიცხვა საკუთარ ანგარიშზე",
+    "გადახდა - SPAR 14",
+    "გადახდა - NETFLIX.COM",
+)
+SBERBANK_CATEGORIES = ("Супермаркеты", "Рестораны и кафе", "Транспорт", "Перевод с карты", "Прочие операции")
+SBERBANK_DETAILS = (
+    "Оплата по карте ****1234 PYATEROCHKA 1234 MOSCOW RUS",
+    "Оплата по карте ****1234 YANDEX.TAXI MOSCOW RUS",
+    "Перевод на карту ****5678 И. Иван Иванович",
+    "Зачисление зарплаты ООО РОМАШКА",
+    "Оплата по карте ****1234 KOFEMANIYA MOSCOW RUS",
+)
+
+
+@dataclass
+class StatementSpec:
+    layout: str = "georgian"
+    pages: int = 10
+    rows_per_page: int = 30
+    seed: int = 7
+
+
+def _hex_text(text: str) -> str:
+    # Identity-H: each character is written as its 2-byte BMP code point
+    return "<" + "".join(f"{ord(ch):04X}" for ch in text if ord(ch) <= 0xFFFF) + ">"
+
+
+def _fit(text: str, width: float) -> str:
+    limit = max(1, int((width - 4) / CHAR_WIDTH))
+    return text if len(text) <= limit else text[:limit]
+
+
+class _Canvas:
+    def __init__(self) -> None:
+        self.ops: List[str] = []
+
+    def text(self, x: float, y: float, value: str) -> None:
+        self.ops.append(f"BT /F1 {FONT_SIZE:g} Tf {x:.2f} {y:.2f} Td {_hex_text(value)} Tj ET")
+
+    def line(self, x1: float, y1: float, x2: float, y2: float) -> None:
+        self.ops.append(f"{x1:.2f} {y1:.2f} m {x2:.2f} {y2:.2f} l S")
+
+    def content(self) -> bytes:
+        return ("0.5 w\n" + "\n".join(self.ops)).encode("latin-1")
+
+
+def _to_unicode_cmap() -> bytes:
+    lines = [
+        "/CIDInit /ProcSet findresource begin",
+        "12 dict begin",
+        "begincmap",
+        "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def",
+        "/CMapName /Adobe-Identity-UCS def",
+        "/CMapType 2 def",
+        "1 begincodespacerange",
+        "<0000> <FFFF>",
+        "endcodespacerange",
+    ]
+    # bfrange entries must not cross a low-byte boundary, so map one 256-code block per entry
+    blocks = [high for high in range(256) if not 0xD8 <= high <= 0xDF]
+    for offset in range(0, len(blocks), 100):
+        chunk = blocks[offset:offset + 100]
+        lines.append(f"{len(chunk)} beginbfrange")
+        lines.extend(f"<{high:02X}00> <{high:02X}FF> <{high:02X}00>" for high in chunk)
+        lines.append("endbfrange")
+    lines.extend(["endcmap", "CMapName currentdict /CMap defineresource pop", "end", "end"])
+    return "\n".join(lines).encode("ascii")
+
+
+def write_pdf(pages: List[bytes], path: Path) -> None:
+    """Write page content streams to a minimal PDF with a Unicode-capable font."""
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    def stream(data: bytes) -> bytes:
+        packed = zlib.compress(data)
+        return b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(packed) + packed + b"\nendstream"
+
+    catalog_id = add(b"")
+    pages_id = add(b"")
+    to_unicode_id = add(stream(_to_unicode_cmap()))
+    descriptor_id = add(
+        b"<< /Type /FontDescriptor /FontName /SyntheticSans /Flags 32 /FontBBox [0 -200 1000 900] "
+        b"/ItalicAngle 0 /Ascent 900 /Descent -200 /CapHeight 700 /StemV 80 >>"
+    )
+    cid_font_id = add(
+        b"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /SyntheticSans "
+        b"/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+        b"/FontDescriptor %d 0 R /DW 500 /CIDToGIDMap /Identity >>" % descriptor_id
+    )
+    font_id = add(
+        b"<< /Type /Font /Subtype /Type0 /BaseFont /SyntheticSans /Encoding /Identity-H "
+        b"/DescendantFonts [%d 0 R] /ToUnicode %d 0 R >>" % (cid_font_id, to_unicode_id)
+    )
+    page_ids: List[int] = []
+    for content in pages:
+        content_id = add(stream(content))
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R >> >> >>"
+            % (pages_id, int(PAGE_WIDTH), int(PAGE_HEIGHT), content_id, font_id)
+        ))
+    objects[catalog_id - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+    offsets: List[int] = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog_id, xref_offset,
+    )
+    path.write_bytes(bytes(out))
+
+
+def _amount(value: float) -> str:
+    return f"{value:,.2f}".replace(",", " ")
+
+
+def _georgian_page(canvas: _Canvas, rng: random.Random, day: date, rows: int, first_page: bool) -> date:
+    top = PAGE_HEIGHT - 60
+    if first_page:
+        canvas.text(40, PAGE_HEIGHT - 30, "ამონაწერი ანგარიშიდან / Statement of account  Currency: GEL")
+    row_height = max(8.0, min(18.0, (top - 60) / (rows + 1)))
+    xs = [40.0]
+    for width in GEORGIAN_COLUMN_WIDTHS:
+        xs.append(xs[-1] + width)
+    bottom = top - row_height * (rows + 1)
+    for x in xs:
+        canvas.line(x, top, x, bottom)
+    for index in range(rows + 2):
+        y = top - row_height * index
+        canvas.line(xs[0], y, xs[-1], y)
+
+    def row(y: float, cells: Tuple[str, ...]) -> None:
+        for col, value in enumerate(cells):
+            if value:
+                canvas.text(xs[col] + 2, y - row_height + 3, _fit(value, GEORGIAN_COLUMN_WIDTHS[col]))
+
+    row(top, GEORGIAN_HEADER)
+    balance = rng.uniform(500, 5000)
+    for index in range(rows):
+        if rng.random() < 0.3:
+            day += timedelta(days=1)
+        amount = round(rng.uniform(1, 250), 2)
+        merchant = rng.choice(GEORGIAN_MERCHANTS)
+        credit = merchant.startswith("ხელფასის")
+        balance += amount if credit else -amount
+        row(top - row_height * (index + 1), (
+            day.strftime("%d.%m.%Y"),
+            rng.choice(GEORGIAN_OPERATIONS),
+            "" if credit else _amount(amount),
+            _amount(amount) if credit else "",
+            _amount(balance),
+            f"{merchant} {amount:.2f} GEL",
+            f"****{rng.randint(1000, 9999)}",
+        ))
+    canvas.text(40, 30, "Для проверки подлинности документа обратитесь в банк")
+    return day
+
+
+def _sberbank_page(canvas: _Canvas, rng: random.Random, day: date, rows: int, first_page: bool) -> date:
+    y = PAGE_HEIGHT - 40
+    if first_page:
+        canvas.text(40, y, "Выписка по счёту дебетовой карты  Валюта: RUB")
+        y -= 12
+        canvas.text(40, y, "ДАТА ОПЕРАЦИИ  КАТЕГОРИЯ  СУММА В ВАЛЮТЕ СЧЁТА  ОСТАТОК СРЕДСТВ")
+        y -= 14
+    line_height = max(8.0, min(12.0, (y - 60) / (rows * 2)))
+    balance = rng.uniform(10000, 90000)
+    for _ in range(rows):
+        if rng.random() < 0.3:
+            day += timedelta(days=1)
+        amount = round(rng.uniform(50, 9000), 2)
+        detail = rng.choice(SBERBANK_DETAILS)
+        credit = detail.startswith("Зачисление")
+        balance += amount if credit else -amount
+        sign = "+" if credit else ""
+        canvas.text(40, y, (
+            f"{day.strftime('%d.%m.%Y')} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d} "
+            f"{rng.randint(100000, 999999)} {rng.choice(SBERBANK_CATEGORIES)} "
+            f"{sign}{_amount(amount).replace('.', ',')} {_amount(balance).replace('.', ',')}"
+        ))
+        y -= line_height
+        canvas.text(40, y, f"{day.strftime('%d.%m.%Y')} {detail}")
+        y -= line_height
+    canvas.text(40, 30, "Продолжение на следующей странице")
+    return day
+
+
+def generate_statement(spec: StatementSpec, path: Path) -> Path:
+    """Write a synthetic statement described by `spec` to `path` and return the path."""
+    if spec.layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {spec.layout!r}; expected one of {', '.join(LAYOUTS)}")
+    rng = random.Random(spec.seed)
+    day = date(2025, 1, 1)
+    pages: List[bytes] = []
+    for page_number in range(spec.pages):
+        canvas = _Canvas()
+        first_page = page_number == 0
+        if spec.layout == "georgian" or (spec.layout == "mixed" and page_number % 2 == 0):
+            day = _georgian_page(canvas, rng, day, spec.rows_per_page, first_page)
+        else:
+            day = _sberbank_page(canvas, rng, day, spec.rows_per_page, first_page)
+        pages.append(canvas.content())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_pdf(pages, path)
+    return path
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Write a synthetic bank statement PDF.")
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--layout", choices=LAYOUTS, default="georgian")
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=30, help="transactions per page")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    generate_statement(StatementSpec(args.layout, args.pages, args.rows, args.seed), args.output)
+    print(args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
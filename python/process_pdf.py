@@ -4,27 +4,39 @@ Lightweight PDF processing worker used by the Next.js upload route.
 The workflow is:
 1. Read the PDF path passed from Node (argv[1]).
 2. Optionally load a scikit-learn text-classification pipeline from `transactions_model.joblib`.
-3. Try pdfplumber first for structured extraction; fall back to MinerU sample stub.
+3. Run the extraction engines cheapest first (pypdfium2 text layer, pdfplumber tables),
+   escalating while the rows score poorly; see ExtractionEngine.
 4. Emit a JSON payload to stdout that matches TransactionUploadResponse plus metadata.
+   With --ndjson, stream one {"transaction": ...} line per row as pages finish, then a
+   final {"metadata": ..., "count": ...} line.
 """
 
 from __future__ import annotations
 
+import atexit
+import gc
+import hashlib
 import json
+import os
+import random
 import re
+import sqlite3
 import sys
+import threading
+import time
 import traceback
-from dataclasses import dataclass
-from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
-from typing import Iterable, List, Optional, Tuple, Dict
+from typing import FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple, Dict
 
 import logging
 
-logging.basicConfig(level=logging.INFO, format="[process_pdf] %(message)s")
-logger = logging.getLogger(__name__)
-
 try:
     import joblib  # type: ignore
 except ImportError:  # pragma: no cover
@@ -36,9 +48,19 @@ except ImportError:  # pragma: no cover
     pdfplumber = None  # type: ignore
 
 try:
-    import mineru  # noqa: F401  # type: ignore  # pragma: no cover
-except ImportError:  # pragma: no cover
-    mineru = None  # type: ignore
+    import resource  # type: ignore
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore
+
+try:
+    import pypdfium2 as pdfium  # type: ignore
+except ImportError:  # pragma: no cover - installed with pdfplumber; only the pdfium_text engine needs it
+    pdfium = None  # type: ignore
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - only the grid table engine needs it
+    np = None  # type: ignore
 
 try:
     from deep_translator import GoogleTranslator  # type: ignore
@@ -46,6 +68,30 @@ except ImportError:  # pragma: no cover
     GoogleTranslator = None  # type: ignore
 
 
+def _resolve_log_level(level) -> int:
+    if isinstance(level, int):
+        return level
+    resolved = logging.getLevelName(str(level).strip().upper())
+    return resolved if isinstance(resolved, int) else logging.INFO
+
+
+# PDF_LOG_LEVEL sets the start-up verbosity (e.g. WARNING in production); set_log_level() changes it later
+logger = logging.getLogger(__name__)
+logger.setLevel(_resolve_log_level(os.getenv("PDF_LOG_LEVEL", "INFO")))
+if not logging.getLogger().handlers:
+    # Nothing configured logging (CLI, Gunicorn): give this module a handler of its own instead of
+    # configuring the root logger, which would also change Flask, Gunicorn and requests logging
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(logging.Formatter("[process_pdf] %(message)s"))
+    logger.addHandler(_log_handler)
+    logger.propagate = False
+
+
+def set_log_level(level) -> None:
+    """Change this module's log level at runtime; accepts a logging constant or a name like "WARNING"."""
+    logger.setLevel(_resolve_log_level(level))
+
+
 DATE_FORMATS: Tuple[str, ...] = (
     "%Y-%m-%d",
     "%d.%m.%Y",
@@ -85,8 +131,88 @@ COMMON_CURRENCY_CODES = {
     "KZT",
     "UAH",
     "INR",
+    "AMD",
+}
+
+# Every currency signal CurrencyDetector looks for, in one alternation (see CURRENCY_SIGNALS)
+CURRENCY_SIGNAL_PATTERN = re.compile(
+    r"(?i:(?:currency|валюта)\s*[:\-]?\s*(?P<label>[A-Z]{3})\b)"
+    r"|\d[.,]\d{2}\s*(?P<suffix>" + "|".join(sorted(COMMON_CURRENCY_CODES)) + r")\b"
+    r"|(?P<symbol>[" + "".join(re.escape(symbol) for symbol in CURRENCY_SYMBOL_MAP) + r"])"
+    r"|(?i:(?P<rub>\bруб(?:\.|ля|лей|\b))|(?P<lari>\blari\b)|(?P<tenge>\btenge\b)|(?P<dram>\bdram\b))"
+    r"|\b(?P<iso>[A-Z]{3})\b"
+)
+# Named group of CURRENCY_SIGNAL_PATTERN -> (currency code, or None to read it from the match; confidence; method)
+CURRENCY_SIGNALS: Dict[str, Tuple[Optional[str], float, str]] = {
+    # Explicit labels like "Currency: RUB" or "Валюта: RUB"
+    "label": (None, 0.95, "header-label"),
+    "symbol": (None, 0.9, "symbol"),
+    "rub": ("RUB", 0.85, "keyword:rub"),
+    "lari": ("GEL", 0.8, "keyword:lari"),
+    "tenge": ("KZT", 0.75, "keyword:tenge"),
+    "dram": ("AMD", 0.75, "keyword:dram"),
+    # An amount followed by its currency, e.g. the "3.54 GEL" at the end of card payment descriptions
+    "suffix": (None, 0.7, "amount-suffix"),
+    # ISO codes appearing in context (lower confidence because it might be part of text)
+    "iso": (None, 0.65, "iso-token"),
 }
 
+# Precompiled patterns for the per-cell/per-row hot paths. Keep every pattern that runs
+# on each cell or line here rather than passing pattern strings to re.* at the call site.
+WHITESPACE_PATTERN = re.compile(r"\s+")
+INLINE_DATE_PATTERN = re.compile(r"(\d{1,2}[./-]\d{1,2}[./-]\d{2,4})")
+ISO_DATE_PATTERN = re.compile(r"(\d{4}[./-]\d{1,2}[./-]\d{1,2})")
+SHORT_YEAR_DATE_PATTERN = re.compile(r"^(\d{2})/(\d{2})/(\d{2})$")
+# strptime's %Y only matches four digits, so a value without a run of four can't parse with DATE_FORMATS
+YEAR_DIGITS_PATTERN = re.compile(r"\d{4}")
+# Superset of the strings any DATE_FORMATS entry can match (strptime's %d also allows " 5"),
+# so candidates of any other shape are skipped without trying every format
+DATE_CANDIDATE_PATTERN = re.compile(r"\d{4}-\d{1,2}-[ \d]?\d|\d{1,2}[./-]\d{1,2}[./-]\d{4}|\d{1,2}\s.*\s\d{4}", re.DOTALL)
+DIGIT_PATTERN = re.compile(r"\d")
+TIME_SUFFIX_PATTERN = re.compile(r"\s+\d{2}:\d{2}(?::\d{2})?")
+DATE_PREFIX_PATTERN = re.compile(r"^\d{1,2}[./-]\d{1,2}[./-]\d{2,4}")
+DATE_PREFIX_REMAINDER_PATTERN = re.compile(r"^\d{1,2}[./-]\d{1,2}[./-]\d{2,4}\s*(\d{2}:\d{2})?\s*(\d{6,})?\s*(.*)$")
+DATE_LIKE_PATTERN = re.compile(r"\d{1,2}[./-]\d{1,2}[./-]\d{2,4}")
+TIME_PATTERN = re.compile(r"\d{1,2}:\d{2}(:\d{2})?")
+MASKED_VALUE_PATTERN = re.compile(r"\*{2,}\d{2,}")
+ASCII_LETTER_PATTERN = re.compile(r"[A-Za-z]")
+# Tokens that vary between otherwise identical descriptions: card masks, dates, times, amounts, IDs/references
+TRANSLATION_TOKEN_PATTERN = re.compile(
+    r"\*{2,}\d{2,}|\d{4,6}\*{2,}\d{4}"
+    r"|\d{1,2}[./-]\d{1,2}[./-]\d{2,4}"
+    r"|\d{1,2}:\d{2}(?::\d{2})?"
+    r"|[+-]?(?:\d{1,3}(?:[ \xa0,]\d{3})+|\d+)[.,]\d{2}(?!\d)"
+    r"|\d{3,}"
+)
+TRANSLATION_PLACEHOLDER_PATTERN = re.compile(r"\{(\d+)\}")
+AMOUNT_NOISE_PATTERN = re.compile(r"[A-Za-zА-Яа-я$€£¥₽₾₴₺₹]")
+NUMBER_PATTERN = re.compile(r"[+-]?\d[\d\s]*[.,]\d{2}")
+TEXT_TRANSACTION_LINE_PATTERN = re.compile(r"(?P<date>\d{2}\.\d{2}\.\d{4})(?:\s+(?P<time>\d{2}:\d{2}))?\s+(?P<body>.+)")
+# Amounts with an optional currency suffix, most specific first ("20.65 GEL", "20.6", "20 GEL")
+AMOUNT_IN_TEXT_PATTERNS: Tuple[re.Pattern, ...] = (
+    re.compile(r'([+-]?\d+[.,]\d{2})\s*(?:GEL|USD|EUR|RUB|₾|₽|\$|€)?', re.IGNORECASE),
+    re.compile(r'([+-]?\d+[.,]\d{1,2})\s*(?:GEL|USD|EUR|RUB|₾|₽|\$|€)?', re.IGNORECASE),
+    re.compile(r'([+-]?\d+)\s*(?:GEL|USD|EUR|RUB|₾|₽|\$|€)', re.IGNORECASE),
+)
+# Page pre-screen patterns, run on the raw character stream where words are often left unspaced
+PAGE_DATE_PATTERN = re.compile(r"\d{1,2}[./-]\d{1,2}[./-]\d{2,4}|\d{4}-\d{1,2}-\s?\d{1,2}|\d{1,2}\s*[A-Za-z]{3,9}\s*\d{4}")
+PAGE_NUMBER_PATTERN = re.compile(r"\d+")
+EMBEDDED_AMOUNT_PATTERN = re.compile(r'\d+\.\d{2}\s*(?:GEL|USD|EUR|RUB|₾|₽|\$|€)', re.IGNORECASE)
+# Everything _normalize_description strips, in two alternations: a leading reference number and
+# Sberbank card-operation boilerplate first, then card references and page footers that run to the
+# end of the text. The second pass sees what the first one removed, e.g. "карте" left in front of a
+# card mask once the "операция по карте" between them is gone.
+DESCRIPTION_PREFIX_NOISE_PATTERN = re.compile(
+    r"^\d{4,}\s+"
+    r"|\bоперация по карте(?:\s+\*+\d+)?\b",
+    re.IGNORECASE,
+)
+DESCRIPTION_NOISE_PATTERN = re.compile(
+    r"\bкарте\s+\*+\d+\b"
+    r"|(?:Продолжение на следующей странице|Для проверки подлинности|В ВАЛЮТЕ СЧЁТА).*",
+    re.IGNORECASE,
+)
+
 
 @dataclass
 class RawTransaction:
@@ -102,6 +228,15 @@ class _PendingTextTransaction:
     detail_parts: List[str]
 
 
+@dataclass(frozen=True)
+class TableColumns:
+    """Column indices used by _process_table; the defaults match the Georgian bank layout."""
+    date: int = 0
+    debit: int = 2
+    credit: int = 3
+    description: int = 5
+
+
 @dataclass
 class StatementMetadata:
     currency: str = "GEL"
@@ -110,9 +245,180 @@ class StatementMetadata:
     source: Optional[str] = None
     period_start: Optional[str] = None
     period_end: Optional[str] = None
+    # Highest RSS sampled while extracting this statement (across parallel workers), for instance sizing
+    peak_rss_mb: Optional[float] = None
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Number of processes used to extract pages in parallel (1 = sequential, 0 = one per CPU core)
+EXTRACTION_WORKERS = _env_int("PDF_EXTRACTION_WORKERS", 1)
+# Documents shorter than this are always extracted sequentially; pool start-up isn't worth it
+PARALLEL_MIN_PAGES = _env_int("PDF_PARALLEL_MIN_PAGES", 8)
+STRATEGY_LOCK_IN = _env_bool("PDF_STRATEGY_LOCK_IN", False)
+# Pages with rows on which every table strategy is scored before one is locked in
+STRATEGY_PROBE_PAGES = _env_int("PDF_STRATEGY_PROBE_PAGES", 2)
+LAYOUT_CACHE_PATH = os.getenv("PDF_LAYOUT_CACHE_PATH") or None
+LOW_MEMORY = _env_bool("PDF_LOW_MEMORY", False)
+RSS_CEILING_MB = _env_int("PDF_RSS_CEILING_MB", 0)
+# Crop later pages to the ruled transaction table found on the first productive page
+TABLE_CROPPING = _env_bool("PDF_TABLE_CROPPING", False)
+# Skip pages that can't hold a transaction row before any table strategy runs (see PageScreen)
+PAGE_PRESCREEN = _env_bool("PDF_PAGE_PRESCREEN", False)
+PRESCREEN_MIN_CHARS = _env_int("PDF_PRESCREEN_MIN_CHARS", 20)
+PRESCREEN_MIN_DATES = _env_int("PDF_PRESCREEN_MIN_DATES", 1)
+PRESCREEN_MIN_NUMBERS = _env_int("PDF_PRESCREEN_MIN_NUMBERS", 1)
+# Distinct no-row page texts remembered per process, so recurring legal pages are skipped in later documents
+BOILERPLATE_CACHE_SIZE = _env_int("PDF_BOILERPLATE_CACHE_SIZE", 512)
+# Pages whose text is streamed into the currency detector until it is confident (1 = first page only)
+CURRENCY_SCAN_PAGES = _env_int("PDF_CURRENCY_SCAN_PAGES", 3)
+# "pdfplumber" runs the table strategies on every page; "grid" first tries GridTable (needs NumPy)
+TABLE_ENGINE = os.getenv("PDF_TABLE_ENGINE", "pdfplumber").strip().lower()
+# Extraction engines to run, cheapest first (see ExtractionEngine), e.g. "pdfium_text,pdfplumber"
+EXTRACTION_ENGINE_NAMES: Tuple[str, ...] = tuple(
+    name.strip() for name in os.getenv("PDF_EXTRACTION_ENGINES", "pdfplumber").split(",") if name.strip()
+)
+# An engine's rows are escalated when headers or zero amounts push _score_transactions above median x this
+ENGINE_MAX_PENALTY = _env_float("PDF_ENGINE_MAX_PENALTY", 1.1)
+# Text-layer rows are only trusted when this share of consecutive lines agrees with the printed running balance
+ENGINE_MIN_BALANCE_AGREEMENT = _env_float("PDF_ENGINE_MIN_BALANCE_AGREEMENT", 0.9)
+ENGINE_MIN_BALANCE_CHECKS = 3
+# Characters per joined translation request; Google's web endpoint refuses more than 5000
+TRANSLATION_BATCH_CHARS = _env_int("PDF_TRANSLATION_BATCH_CHARS", 4500)
+# SQLite file sharing translations between processes and restarts (see TranslationStore); unset disables it
+TRANSLATION_CACHE_PATH = os.getenv("PDF_TRANSLATION_CACHE_PATH") or None
+# Most used stored translations loaded into memory when a process first translates
+TRANSLATION_CACHE_PRELOAD = _env_int("PDF_TRANSLATION_CACHE_PRELOAD", 5000)
+TRANSLATION_CACHE_MAX_ENTRIES = _env_int("PDF_TRANSLATION_CACHE_MAX_ENTRIES", 200000)
+TRANSLATION_TARGET = "en"
+# Plain-ASCII descriptions (merchant names like "UBER *TRIP") are kept as they are instead of translated
+TRANSLATION_SKIP_ASCII = _env_bool("PDF_TRANSLATION_SKIP_ASCII", True)
+# In-process translation cache bounds; translator failures expire sooner so the text is retried
+TRANSLATION_MEMORY_ENTRIES = _env_int("PDF_TRANSLATION_MEMORY_ENTRIES", 20000)
+TRANSLATION_MEMORY_MB = _env_float("PDF_TRANSLATION_MEMORY_MB", 16.0)
+TRANSLATION_TTL_SECONDS = _env_int("PDF_TRANSLATION_TTL_SECONDS", 7 * 24 * 3600)
+TRANSLATION_FAILURE_TTL_SECONDS = _env_int("PDF_TRANSLATION_FAILURE_TTL_SECONDS", 300)
+# Fraction of documents whose per-page/per-row trace is logged; the rest only log a counter summary
+TRACE_SAMPLE_RATE = _env_float("PDF_TRACE_SAMPLE_RATE", 1.0)
+
+
+@dataclass
+class ExtractionOptions:
+    workers: int = EXTRACTION_WORKERS
+    parallel_min_pages: int = PARALLEL_MIN_PAGES
+    # Pages handed to a worker at a time; None splits the document into two ranges per worker
+    pages_per_chunk: Optional[int] = None
+    # Score the table strategies on the first pages and only run the winner afterwards
+    strategy_lock_in: bool = STRATEGY_LOCK_IN
+    strategy_probe_pages: int = STRATEGY_PROBE_PAGES
+    # JSON file remembering the winning strategy/columns per layout fingerprint; None disables it
+    layout_cache_path: Optional[str] = LAYOUT_CACHE_PATH
+    # Release each page's parsed layout as soon as it has been processed
+    low_memory: bool = LOW_MEMORY
+    # Abort extraction instead of growing past this RSS (per process); None/0 disables the ceiling
+    rss_ceiling_mb: Optional[int] = RSS_CEILING_MB or None
+    # Learn the ruled table's column lines once and crop later pages to that table (see TableRegion)
+    table_cropping: bool = TABLE_CROPPING
+    # Pre-screen pages by text, date and number counts and skip known boilerplate pages (see PageScreen)
+    page_prescreen: bool = PAGE_PRESCREEN
+    # Leading pages read for currency evidence; table cells only count when those pages had none
+    currency_scan_pages: int = CURRENCY_SCAN_PAGES
+    # 1.0 traces every document, 0 never does (counters are still collected and summarised)
+    trace_sample_rate: float = TRACE_SAMPLE_RATE
+    # One of TABLE_ENGINES; "grid" falls back to the table strategies page by page
+    table_engine: str = TABLE_ENGINE
+    # Names in EXTRACTION_ENGINES; extract_transactions() runs them cheapest first
+    engines: Tuple[str, ...] = EXTRACTION_ENGINE_NAMES
+
+
+class TranslationCache:
+    """
+    Thread-safe LRU of translations bounded by entry count and by UTF-8 bytes of text plus translation.
 
+    Each entry expires after `ttl` seconds, or `failure_ttl` for a text kept untranslated
+    because the translator failed, so a transient error is retried by a later statement
+    instead of sticking for the life of the process. A ttl of 0 never expires.
+    """
 
-_translation_cache: Dict[str, str] = {}
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float, failure_ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        # text -> (translation, expiry on the monotonic clock or None, size in bytes, failed)
+        self._entries: "OrderedDict[str, Tuple[str, Optional[float], int, bool]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, text: str) -> Optional[str]:
+        entry = self.get_entry(text)
+        return entry[0] if entry else None
+
+    def get_entry(self, text: str) -> Optional[Tuple[str, bool]]:
+        """(translation, whether it is an original kept after a translator failure), or None."""
+        with self._lock:
+            entry = self._entries.get(text)
+            if entry is None:
+                return None
+            if entry[1] is not None and entry[1] <= time.monotonic():
+                self._remove(text)
+                return None
+            self._entries.move_to_end(text)
+            return entry[0], entry[3]
+
+    def put(self, text: str, translated: str, failed: bool = False) -> None:
+        self.update({text: translated}, failed)
+
+    def update(self, translations: Dict[str, str], failed: bool = False) -> None:
+        ttl = self.failure_ttl if failed else self.ttl
+        expires = time.monotonic() + ttl if ttl > 0 else None
+        with self._lock:
+            for text, translated in translations.items():
+                size = len(text.encode("utf-8")) + len(translated.encode("utf-8"))
+                if text in self._entries:
+                    self._remove(text)
+                self._entries[text] = (translated, expires, size, failed)
+                self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, text: str) -> None:
+        self._bytes -= self._entries.pop(text)[2]
+
+
+_translation_cache = TranslationCache(
+    TRANSLATION_MEMORY_ENTRIES,
+    int(TRANSLATION_MEMORY_MB * 1024 * 1024),
+    TRANSLATION_TTL_SECONDS,
+    TRANSLATION_FAILURE_TTL_SECONDS,
+)
 _translator: Optional[GoogleTranslator] = None
 
 # Temporary flag to keep categorization on the Node.js side only
@@ -120,7 +426,7 @@ DISABLE_CATEGORY_PREDICTION = True
 
 if GoogleTranslator is not None:
     try:  # pragma: no cover
-        _translator = GoogleTranslator(source="auto", target="en")
+        _translator = GoogleTranslator(source="auto", target=TRANSLATION_TARGET)
     except Exception:
         _translator = None
 
@@ -264,54 +570,229 @@ CATEGORY_KEYWORDS: Dict[str, Dict[str, float]] = {
 }
 
 
+def needs_translation(text: str) -> bool:
+    """
+    Whether `text` is worth sending to the translator, judged by the scripts of its letters.
+
+    Any letter outside ASCII - Georgian, Cyrillic, or Latin with diacritics - needs it.
+    Text without letters (card masks, amounts, references) never does, and ASCII-only text
+    only when TRANSLATION_SKIP_ASCII is off.
+    """
+    # isascii() is a C-level check, so the common all-ASCII merchant name never loops in Python
+    if not text.isascii() and any(char.isalpha() for char in text if not char.isascii()):
+        return True
+    return not TRANSLATION_SKIP_ASCII and ASCII_LETTER_PATTERN.search(text) is not None
+
+
 def translate_to_english(text: str) -> str:
-    if not text:
-        return text
-    cached = _translation_cache.get(text)
-    if cached is not None:
-        return cached
+    return translate_batch_to_english([text])[0]
+
+
+def translation_template(text: str) -> Tuple[str, List[str]]:
+    """
+    `text` with its volatile tokens replaced by numbered placeholders, and the tokens.
+
+    "გადახდა - LTD MADAGONI 2 3.54 GEL" becomes ("გადახდა - LTD MADAGONI 2 {0} GEL", ["3.54"]),
+    so every payment to that merchant shares one translation. Text that already contains
+    braces is left alone, since its own braces could be mistaken for placeholders.
+    """
+    if "{" in text or "}" in text:
+        return text, []
+    tokens: List[str] = []
+
+    def placeholder(match: "re.Match[str]") -> str:
+        tokens.append(match.group(0))
+        return "{%d}" % (len(tokens) - 1)
+
+    return TRANSLATION_TOKEN_PATTERN.sub(placeholder, text), tokens
+
+
+def _fill_template(translated: str, tokens: List[str]) -> Optional[str]:
+    """Put `tokens` back into a translated template; None when the translator lost or mangled a placeholder."""
+    if not tokens:
+        return translated
+    found = TRANSLATION_PLACEHOLDER_PATTERN.findall(translated)
+    if sorted(int(number) for number in found) != list(range(len(tokens))):
+        return None
+    return TRANSLATION_PLACEHOLDER_PATTERN.sub(lambda match: tokens[int(match.group(1))], translated)
+
+
+def _translate_uncached(text: str, failed: Set[str]) -> str:
     if _translator is None:
-        _translation_cache[text] = text
+        _translation_cache.put(text, text)
         return text
+    PIPELINE_METRICS.count("translation_requests")
     try:  # pragma: no cover
         translated = _translator.translate(text)
-        _translation_cache[text] = translated
+        _remember_translations({text: translated})
         return translated
     except Exception:
-        _translation_cache[text] = text
+        PIPELINE_METRICS.count("translation_failures")
+        _translation_cache.put(text, text, failed=True)
+        failed.add(text)
         return text
 
 
-def sample_transactions() -> List[RawTransaction]:
-    today = datetime.utcnow().date()
-    return [
-        RawTransaction(
-            date=today.replace(day=1).isoformat(),
-            description="Sample Subscription",
-            amount=-9.99,
-        ),
-        RawTransaction(
-            date=today.replace(day=2).isoformat(),
-            description="Coffee Shop",
-            amount=-4.5,
-        ),
-        RawTransaction(
-            date=today.replace(day=3).isoformat(),
-            description="Salary",
-            amount=2450.0,
-        ),
-    ]
+def translate_batch_to_english(texts: Iterable[str], failed: Optional[Set[str]] = None) -> List[str]:
+    """
+    Translate many descriptions with as few translator calls as possible; results keep the input order.
+
+    Texts that don't need it (see needs_translation) are returned as they are. The rest are
+    reduced to their translation_template(), so variants differing only in amounts, dates or
+    references share one cache entry and one translation. The distinct uncached templates
+    are joined with newlines into requests of at most TRANSLATION_BATCH_CHARS characters and
+    the reply is split back into lines; a reply with a different number of lines is retried
+    one text at a time. A template whose placeholders don't survive translation is dropped
+    in favour of translating its original texts.
+
+    Texts returned untranslated because the translator failed, now or within the failure
+    TTL, are added to `failed`, so callers can avoid keeping such a result for good.
+    """
+    texts = list(texts)
+    failed_keys: Set[str] = set()
+    translations: Dict[str, str] = {}
+    templates: Dict[str, Tuple[str, List[str]]] = {}
+    for text in dict.fromkeys(texts):
+        if not text:
+            continue
+        if needs_translation(text):
+            templates[text] = translation_template(text)
+        else:
+            translations[text] = text
+    if translations:
+        PIPELINE_METRICS.count("translation_bypassed", len(translations))
+    distinct = list(dict.fromkeys(template for template, _tokens in templates.values()))
+    if len(distinct) < len(templates):
+        PIPELINE_METRICS.count("translation_templates_shared", len(templates) - len(distinct))
+    translated_templates = _translate_distinct(distinct, failed_keys)
+    retry: List[str] = []
+    for text, (template, tokens) in templates.items():
+        filled = _fill_template(translated_templates[template], tokens)
+        if filled is None:
+            retry.append(text)
+        else:
+            translations[text] = filled
+            if failed is not None and template in failed_keys:
+                failed.add(text)
+    if retry:
+        PIPELINE_METRICS.count("translation_template_fallbacks", len(retry))
+        translations.update(_translate_distinct(retry, failed_keys))
+        if failed is not None:
+            failed.update(text for text in retry if text in failed_keys)
+    return [translations[text] if text else text for text in texts]
+
+
+def _translate_distinct(texts: List[str], failed: Set[str]) -> Dict[str, str]:
+    translations = _lookup_translations(texts, failed)
+    pending = [text for text in texts if text not in translations]
+    for batch in _translation_batches(pending, TRANSLATION_BATCH_CHARS):
+        translations.update(_translate_joined(batch, failed))
+    return translations
+
+
+def _lookup_translations(texts: List[str], failed: Set[str]) -> Dict[str, str]:
+    """Known translations of `texts`: the in-process cache first, then the shared TranslationStore."""
+    # Created first: its preload fills the in-process cache
+    store = _get_translation_store()
+    found: Dict[str, str] = {}
+    missing: List[str] = []
+    for text in texts:
+        entry = _translation_cache.get_entry(text)
+        if entry is None:
+            missing.append(text)
+            continue
+        found[text] = entry[0]
+        if entry[1]:
+            failed.add(text)
+    if found:
+        PIPELINE_METRICS.count("translation_cache_hits:memory", len(found))
+    if store is not None and missing:
+        stored = store.get_many(missing)
+        if stored:
+            _translation_cache.update(stored)
+            found.update(stored)
+            PIPELINE_METRICS.count("translation_cache_hits:disk", len(stored))
+    if len(texts) > len(found):
+        PIPELINE_METRICS.count("translation_cache_misses", len(texts) - len(found))
+    return found
+
+
+def _remember_translations(translations: Dict[str, str]) -> None:
+    """Cache translator output in this process and in the TranslationStore; failures never reach the store."""
+    _translation_cache.update(translations)
+    store = _get_translation_store()
+    if store is not None:
+        store.put_many(translations)
+
+
+def _translation_batches(texts: List[str], max_chars: int) -> Iterator[List[str]]:
+    batch: List[str] = []
+    size = 0
+    for text in texts:
+        # +1 for the joining newline; an oversized text still goes out, on its own
+        if batch and size + len(text) + 1 > max_chars:
+            yield batch
+            batch, size = [], 0
+        batch.append(text)
+        size += len(text) + 1
+    if batch:
+        yield batch
+
+
+def _translate_joined(batch: List[str], failed: Set[str]) -> Dict[str, str]:
+    if _translator is None:
+        _translation_cache.update({text: text for text in batch})
+        return {text: text for text in batch}
+    if len(batch) == 1:
+        return {batch[0]: _translate_uncached(batch[0], failed)}
+    PIPELINE_METRICS.count("translation_requests")
+    try:  # pragma: no cover
+        reply = _translator.translate("\n".join(text.replace("\n", " ") for text in batch))
+    except Exception:
+        # Same as a failed single translation: keep the originals until the failure TTL runs out
+        PIPELINE_METRICS.count("translation_failures")
+        _translation_cache.update({text: text for text in batch}, failed=True)
+        failed.update(batch)
+        return {text: text for text in batch}
+    lines = (reply or "").split("\n")
+    if len(lines) != len(batch):
+        logger.info("Joined translation of %d texts came back as %d lines, translating them one by one", len(batch), len(lines))
+        return {text: _translate_uncached(text, failed) for text in batch}
+    translations = {text: line.strip() or text for text, line in zip(batch, lines)}
+    _remember_translations(translations)
+    return translations
 
 
 def parse_date(value: str) -> Optional[str]:
+    return _parse_date_with_format(value)[0]
+
+
+def _parse_date_with_format(value: str) -> Tuple[Optional[str], Optional[str]]:
+    """Parse a date and also return the DATE_FORMATS entry that matched (None for the short-year form)."""
     cleaned = value.strip()
     if not cleaned:
-        return None
+        return None, None
+    if YEAR_DIGITS_PATTERN.search(cleaned):
+        parsed = _parse_date_candidates(cleaned)
+        if parsed[0]:
+            return parsed
+    # Sometimes date comes as DD/MM/YY without century
+    match = SHORT_YEAR_DATE_PATTERN.match(cleaned)
+    if match:
+        day, month, year = match.groups()
+        century = "20" if int(year) < 70 else "19"
+        try:
+            return datetime.strptime(f"{day}/{month}/{century}{year}", "%d/%m/%Y").date().isoformat(), None
+        except ValueError:
+            return None, None
+    return None, None
 
+
+def _parse_date_candidates(cleaned: str) -> Tuple[Optional[str], Optional[str]]:
     candidates = [cleaned]
     # Extract obvious date fragments from longer strings like "31.10.2025 20:21"
-    inline_match = re.search(r"(\d{1,2}[./-]\d{1,2}[./-]\d{2,4})", cleaned)
-    iso_match = re.search(r"(\d{4}[./-]\d{1,2}[./-]\d{1,2})", cleaned)
+    inline_match = INLINE_DATE_PATTERN.search(cleaned)
+    iso_match = ISO_DATE_PATTERN.search(cleaned)
     if inline_match:
         candidates.insert(0, inline_match.group(1))
     if iso_match:
@@ -320,21 +801,86 @@ def parse_date(value: str) -> Optional[str]:
         candidates.extend(part for part in cleaned.split() if part)
 
     for candidate in candidates:
+        candidate = candidate.strip()
+        if not DATE_CANDIDATE_PATTERN.fullmatch(candidate):
+            continue
         for fmt in DATE_FORMATS:
             try:
-                return datetime.strptime(candidate.strip(), fmt).date().isoformat()
+                return datetime.strptime(candidate, fmt).date().isoformat(), fmt
             except ValueError:
                 continue
-    # Sometimes date comes as DD/MM/YY without century
-    match = re.match(r"^(\d{2})/(\d{2})/(\d{2})$", cleaned)
-    if match:
-        day, month, year = match.groups()
-        century = "20" if int(year) < 70 else "19"
-        try:
-            return datetime.strptime(f"{day}/{month}/{century}{year}", "%d/%m/%Y").date().isoformat()
-        except ValueError:
-            return None
-    return None
+    return None, None
+
+
+# Numeric DATE_FORMATS that can be read by slicing a fixed-width value:
+# separator, separator positions, and the year/month/day slices
+DATE_SLICE_LAYOUTS: Dict[str, Tuple[str, Tuple[int, int], slice, slice, slice]] = {
+    "%Y-%m-%d": ("-", (4, 7), slice(0, 4), slice(5, 7), slice(8, 10)),
+    "%d.%m.%Y": (".", (2, 5), slice(6, 10), slice(3, 5), slice(0, 2)),
+    "%d/%m/%Y": ("/", (2, 5), slice(6, 10), slice(3, 5), slice(0, 2)),
+    "%d-%m-%Y": ("-", (2, 5), slice(6, 10), slice(3, 5), slice(0, 2)),
+}
+
+
+def _parse_date_by_layout(cleaned: str, fmt: str) -> Optional[str]:
+    """
+    Read a date that is exactly `fmt` (optionally followed by a time) without strptime.
+
+    Returns None whenever the value has any other shape, so callers can fall back to
+    parse_date(); for the values it does accept the result is the same as parse_date()'s.
+    """
+    if len(cleaned) < 10 or (len(cleaned) > 10 and not TIME_SUFFIX_PATTERN.fullmatch(cleaned, 10)):
+        return None
+    separator, (first, second), year, month, day = DATE_SLICE_LAYOUTS[fmt]
+    if cleaned[first] != separator or cleaned[second] != separator:
+        return None
+    year_text, month_text, day_text = cleaned[year], cleaned[month], cleaned[day]
+    if not (year_text.isdecimal() and month_text.isdecimal() and day_text.isdecimal()):
+        return None
+    try:
+        return date(int(year_text), int(month_text), int(day_text)).isoformat()
+    except ValueError:
+        return None
+
+
+class DateFormatLearner:
+    """
+    Learns a statement's date format from its first dates and parses the rest by slicing.
+
+    Until `learn_after` dates agree on one of DATE_SLICE_LAYOUTS every value goes through
+    parse_date(). Afterwards values in the learned format skip strptime entirely and
+    anything else (other formats, descriptions, amounts) still falls back to parse_date(),
+    so results never differ from calling parse_date() directly.
+    """
+
+    def __init__(self, learn_after: int = 3):
+        self.learn_after = learn_after
+        self.format: Optional[str] = None
+        self._votes: Dict[str, int] = {}
+
+    def parse(self, value: str) -> Optional[str]:
+        if self.format is not None:
+            parsed = _parse_date_by_layout(value.strip(), self.format)
+            if parsed is not None:
+                self._votes[self.format] += 1
+                return parsed
+        parsed, fmt = _parse_date_with_format(value)
+        if fmt in DATE_SLICE_LAYOUTS:
+            self._learn(fmt)
+        return parsed
+
+    def _learn(self, fmt: str) -> None:
+        votes = self._votes.get(fmt, 0) + 1
+        self._votes[fmt] = votes
+        if fmt == self.format or votes < self.learn_after:
+            return
+        if self.format is None:
+            logger.info("Date format learned: %s (after %d matching dates)", fmt, votes)
+            self.format = fmt
+        elif votes > self._votes[self.format] + self.learn_after:
+            # Only switch when another format clearly dominates, so mixed columns don't flip-flop
+            logger.info("Date format switched: %s -> %s", self.format, fmt)
+            self.format = fmt
 
 
 def parse_amount(candidates: Iterable[str]) -> Optional[float]:
@@ -357,7 +903,7 @@ def parse_amount(candidates: Iterable[str]) -> Optional[float]:
         elif normalized.startswith("-"):
             normalized = normalized[1:]
             sign = -1
-        normalized = re.sub(r"[A-Za-zА-Яа-я$€£¥₽₾₴₺₹]", "", normalized)
+        normalized = AMOUNT_NOISE_PATTERN.sub("", normalized)
         normalized = normalized.replace(" ", "")
         normalized = normalized.replace("'", "")
         if not normalized:
@@ -380,297 +926,2323 @@ def parse_amount(candidates: Iterable[str]) -> Optional[float]:
     return None
 
 
-def extract_amount_from_text(text: str) -> Optional[float]:
+def extract_amount_from_text(text: str) -> Optional[float]:
+    """
+    Extract amount from text that may contain currency codes like "20.65 GEL" or "3.54 GEL".
+    Returns the first valid amount found in the text.
+    """
+    if not text:
+        return None
+    
+    # Matches amounts like "20.65 GEL", "3.54 GEL", "86.56", etc.
+    for pattern in AMOUNT_IN_TEXT_PATTERNS:
+        for match in pattern.finditer(text):
+            amount_str = match.group(1)
+            amount = parse_amount([amount_str])
+            if amount is not None and amount != 0:
+                return amount
+    
+    return None
+
+
+def detect_currency_from_text(text: Optional[str]) -> Optional[Tuple[str, float, str]]:
+    """
+    Attempt to detect currency codes from statement text.
+    Returns (currency_code, confidence, detection_method).
+    """
+    detector = CurrencyDetector()
+    detector.feed(text)
+    return detector.result()
+
+
+class _CurrencyEvidence:
+    """Running totals, strongest signal per currency and explicit label from one kind of text."""
+
+    def __init__(self) -> None:
+        self.best: Dict[str, Tuple[float, str]] = {}
+        self.totals: Dict[str, float] = {}
+        self.label: Optional[Tuple[str, float, str]] = None
+
+    def add(self, code: str, confidence: float, method: str) -> None:
+        self.totals[code] = self.totals.get(code, 0.0) + confidence
+        best = self.best.get(code)
+        if best is None or confidence > best[0]:
+            self.best[code] = (confidence, method)
+
+    def merge(self, other: "_CurrencyEvidence") -> None:
+        self.label = self.label or other.label
+        for code, total in other.totals.items():
+            self.totals[code] = self.totals.get(code, 0.0) + total
+        for code, (confidence, method) in other.best.items():
+            best = self.best.get(code)
+            if best is None or confidence > best[0]:
+                self.best[code] = (confidence, method)
+
+    def result(self) -> Optional[Tuple[str, float, str]]:
+        if self.label:
+            return self.label
+        if not self.totals:
+            return None
+        # max() keeps the first currency seen on a full tie
+        code = max(self.totals, key=lambda name: (self.totals[name], self.best[name][0]))
+        confidence, method = self.best[code]
+        return code, confidence, method
+
+
+class CurrencyDetector:
+    """
+    Accumulates currency evidence from a stream of texts: page texts, table cells.
+
+    Each text is scanned once with CURRENCY_SIGNAL_PATTERN. Every signal adds its confidence
+    to its currency's running total and the result is the currency with the largest total,
+    so forty "3.54 GEL" amounts outweigh one "12.99 USD" subscription. Only an explicit
+    "Currency: XXX" label overrides the totals, and it ends the scan at once. Page texts and
+    table cells are kept apart: cells (fed with `cell=True`) only decide when the page texts
+    held no evidence at all, since a foreign merchant amount in a description says nothing
+    about the account. A currency whose total reaches `settle_total` with at least 90% of the
+    deciding evidence marks the detector `done`, so callers can stop feeding it.
+    """
+
+    def __init__(self, settle_total: float = 5.0):
+        self.settle_total = settle_total
+        self.texts_fed = 0
+        self._pages = _CurrencyEvidence()
+        self._cells = _CurrencyEvidence()
+
+    @property
+    def has_page_evidence(self) -> bool:
+        return bool(self._pages.totals)
+
+    @property
+    def done(self) -> bool:
+        evidence = self._deciding()
+        if evidence.label:
+            return True
+        if not evidence.totals:
+            return False
+        leader = max(evidence.totals.values())
+        return leader >= self.settle_total and leader >= 0.9 * sum(evidence.totals.values())
+
+    def feed(self, text: Optional[str], cell: bool = False) -> bool:
+        """Add the evidence in `text`, a table cell when `cell` is set. Returns `done`."""
+        evidence = self._cells if cell else self._pages
+        if not text or evidence.label:
+            return self.done
+        self.texts_fed += 1
+        for match in CURRENCY_SIGNAL_PATTERN.finditer(text):
+            group = match.lastgroup
+            code, confidence, method = CURRENCY_SIGNALS[group]
+            value = match.group(group)
+            if group == "symbol":
+                code, method = CURRENCY_SYMBOL_MAP[value], f"symbol:{value}"
+            elif group == "label":
+                code = value.upper()
+            elif code is None:
+                # Bare three-letter words are mostly not currencies; labels name one by definition
+                code = value
+                if code not in COMMON_CURRENCY_CODES:
+                    continue
+            evidence.add(code, confidence, method)
+            if group == "label":
+                evidence.label = (code, confidence, method)
+                break
+        return self.done
+
+    def merge(self, other: "CurrencyDetector") -> None:
+        """Fold in the evidence a parallel worker collected from its page range."""
+        self._pages.merge(other._pages)
+        self._cells.merge(other._cells)
+
+    def result(self) -> Optional[Tuple[str, float, str]]:
+        """(currency_code, confidence, detection_method) of the best-supported currency, or None."""
+        return self._deciding().result()
+
+    def _deciding(self) -> _CurrencyEvidence:
+        return self._pages if self._pages.totals else self._cells
+
+
+class MemoryCeilingExceeded(RuntimeError):
+    """Raised when extraction would keep growing past ExtractionOptions.rss_ceiling_mb."""
+
+
+def _current_rss_mb() -> Optional[float]:
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if resource is None:
+        return None
+    # No /proc (macOS): fall back to the lifetime peak, reported in bytes there
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024)
+
+
+class ExtractionStats:
+    """
+    Per-document counters (strategies tried, tables seen, rows skipped by reason) that stand
+    in for per-row log lines, and whether this document's detailed trace is written at all.
+
+    Untraced documents skip the trace logging entirely, including formatting its arguments,
+    and end with a single summary line.
+    """
+
+    def __init__(self, trace: bool = True):
+        self.trace = trace
+        self.counters: Dict[str, int] = {}
+        # Stage durations in seconds ("page", "table", "strategy:<name>", ...), folded into PIPELINE_METRICS
+        self.timings: Dict[str, List[float]] = {}
+
+    @classmethod
+    def sampled(cls, sample_rate: float) -> "ExtractionStats":
+        return cls(trace=sample_rate >= 1 or random.random() < sample_rate)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, stage: str, seconds: float) -> None:
+        self.timings.setdefault(stage, []).append(seconds)
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def merge(self, counters: Dict[str, int], timings: Optional[Dict[str, List[float]]] = None) -> None:
+        for name, amount in counters.items():
+            self.count(name, amount)
+        for stage, durations in (timings or {}).items():
+            self.timings.setdefault(stage, []).extend(durations)
+
+    def summary(self) -> str:
+        return ", ".join(f"{name}={self.counters[name]}" for name in sorted(self.counters)) or "no tables"
+
+
+# Upper bounds (seconds) of the stage duration histograms: per-row table work up to whole jobs
+METRICS_BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+STRATEGY_STAGE_PREFIX = "strategy:"
+# Directory where each process writes its metrics so /metrics can sum all Gunicorn workers; unset = per process
+METRICS_DIR = os.getenv("PDF_METRICS_DIR") or None
+
+
+class PipelineMetrics:
+    """
+    Process-wide stage duration histograms and event counters in the Prometheus text format.
+
+    Extraction stages are collected per document on ExtractionStats (parallel workers send
+    theirs back with their counters) and folded in by record_document(); callers time their
+    own stages (translation, categorisation, callbacks, queue wait) with timed()/observe().
+    "strategy:<name>" stages become pdf_table_strategy_seconds{strategy="<name>"}, the rest
+    pdf_stage_seconds{stage="<stage>"}.
+
+    Each process has its own registry. With a `directory` (PDF_METRICS_DIR), every process
+    also writes its totals to metrics-<pid>-<start>.json there, at most every `flush_interval`
+    seconds, and render() sums all the files, so whichever Gunicorn worker answers a scrape
+    reports the whole instance. Files of exited workers stay, keeping the totals monotonic;
+    the start time (taken when the process first flushes) keeps a worker that is given a
+    recycled PID from overwriting an exited worker's file and taking its totals down.
+    """
+
+    def __init__(
+        self,
+        buckets: Tuple[float, ...] = METRICS_BUCKETS,
+        directory: Optional[Path] = None,
+        flush_interval: float = 1.0,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        # stage -> [count per bucket..., +Inf count, sum]; buckets are cumulated when rendering
+        self._histograms: Dict[str, List[float]] = {}
+        self._counters: Dict[str, int] = {}
+        self._next_flush = 0.0
+        # (pid, file) of the process that last flushed; a forked child picks a file of its own
+        self._file: Optional[Tuple[int, Path]] = None
+        if directory is not None:
+            atexit.register(self.flush)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._observe(stage, seconds)
+        self._maybe_flush()
+
+    def _observe(self, stage: str, seconds: float) -> None:
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            histogram = self._histograms[stage] = [0.0] * (len(self.buckets) + 2)
+        index = 0
+        while index < len(self.buckets) and seconds > self.buckets[index]:
+            index += 1
+        histogram[index] += 1
+        histogram[-1] += seconds
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def count(self, event: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[event] = self._counters.get(event, 0) + amount
+        self._maybe_flush()
+
+    def record_document(self, stats: ExtractionStats) -> None:
+        """Fold one finished document's stage timings and counters into the process totals."""
+        with self._lock:
+            for stage, durations in stats.timings.items():
+                for seconds in durations:
+                    self._observe(stage, seconds)
+            for event, amount in stats.counters.items():
+                self._counters[event] = self._counters.get(event, 0) + amount
+            self._counters["documents"] = self._counters.get("documents", 0) + 1
+        self._maybe_flush()
+
+    def flush(self) -> None:
+        """Write this process's totals to its file in `directory`."""
+        if self.directory is None:
+            return
+        with self._lock:
+            snapshot = {"buckets": self.buckets, "histograms": self._histograms, "counters": self._counters}
+            payload = json.dumps(snapshot)
+            self._next_flush = time.monotonic() + self.flush_interval
+        path = self._file_path()
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(payload, encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not write metrics to %s: %s", path, str(e))
+
+    def _file_path(self) -> Path:
+        pid = os.getpid()
+        if self._file is None or self._file[0] != pid:
+            self._file = (pid, self.directory / f"metrics-{pid}-{time.time_ns()}.json")
+        return self._file[1]
+
+    def _maybe_flush(self) -> None:
+        if self.directory is not None and time.monotonic() >= self._next_flush:
+            self.flush()
+
+    def _totals(self) -> Tuple[Dict[str, List[float]], Dict[str, int]]:
+        """This process's histograms and counters, or with a `directory` those of every process summed."""
+        if self.directory is None:
+            with self._lock:
+                return {stage: list(values) for stage, values in self._histograms.items()}, dict(self._counters)
+        self.flush()
+        histograms: Dict[str, List[float]] = {}
+        counters: Dict[str, int] = {}
+        for path in sorted(self.directory.glob("metrics-*.json")):
+            try:
+                snapshot = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                # Another process may be replacing it right now; its next flush brings it back
+                continue
+            if tuple(snapshot.get("buckets", ())) != self.buckets:
+                continue
+            for stage, values in snapshot.get("histograms", {}).items():
+                total = histograms.setdefault(stage, [0.0] * len(values))
+                for index, value in enumerate(values):
+                    total[index] += value
+            for event, amount in snapshot.get("counters", {}).items():
+                counters[event] = counters.get(event, 0) + amount
+        return histograms, counters
+
+    def render(self) -> str:
+        histograms, counters = self._totals()
+        families = (
+            ("pdf_stage_seconds", "stage", "Duration of PDF pipeline stages in seconds.", False),
+            ("pdf_table_strategy_seconds", "strategy", "Duration of extract_tables per table strategy in seconds.", True),
+        )
+        lines: List[str] = []
+        for family, label, description, strategies in families:
+            lines += [f"# HELP {family} {description}", f"# TYPE {family} histogram"]
+            for stage in sorted(histograms):
+                if stage.startswith(STRATEGY_STAGE_PREFIX) != strategies:
+                    continue
+                name = stage[len(STRATEGY_STAGE_PREFIX):] if strategies else stage
+                values = histograms[stage]
+                labels = f'{label}="{_metric_label(name)}"'
+                cumulative = 0.0
+                for bound, observed in zip(self.buckets + (float("inf"),), values):
+                    cumulative += observed
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{family}_bucket{{{labels},le="{le}"}} {cumulative:.0f}')
+                lines.append(f"{family}_sum{{{labels}}} {values[-1]:.6f}")
+                lines.append(f"{family}_count{{{labels}}} {cumulative:.0f}")
+        lines += [
+            "# HELP pdf_extraction_events_total Extraction events: documents, tables, strategies tried, rows parsed and skipped, pages skipped.",
+            "# TYPE pdf_extraction_events_total counter",
+        ]
+        lines += [
+            f'pdf_extraction_events_total{{event="{_metric_label(event)}"}} {counters[event]}' for event in sorted(counters)
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _metric_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+PIPELINE_METRICS = PipelineMetrics(directory=Path(METRICS_DIR).expanduser() if METRICS_DIR else None)
+
+
+class MemoryMonitor:
+    """Samples this process's RSS between pages, tracking the peak and enforcing an optional ceiling."""
+
+    def __init__(self, ceiling_mb: Optional[float] = None):
+        self.ceiling_mb = ceiling_mb
+        self.start_mb = _current_rss_mb()
+        self.peak_mb = self.start_mb
+
+    def sample(self) -> Optional[float]:
+        current = _current_rss_mb()
+        if current is not None and (self.peak_mb is None or current > self.peak_mb):
+            self.peak_mb = current
+        return current
+
+    def over_ceiling(self, current: Optional[float]) -> bool:
+        return bool(self.ceiling_mb) and current is not None and current > self.ceiling_mb
+
+
+class ParsedDocument:
+    """
+    One open pdfplumber document whose per-page text and words are extracted at most once.
+
+    Shared by the currency detector, the layout fingerprint, the table pass diagnostics and
+    the text fallback so a statement's layout analysis isn't repeated. Page indices are 1-based.
+
+    In low-memory mode each page's parsed layout (chars, lines, rects, table objects) is
+    released by finish_page() once the page has been consumed; only the page text is kept.
+    """
+
+    def __init__(self, pdf, path: Path, low_memory: bool = False, rss_ceiling_mb: Optional[float] = None):
+        self.pdf = pdf
+        self.path = path
+        self.low_memory = low_memory
+        self.memory = MemoryMonitor(rss_ceiling_mb)
+        # Highest RSS reported by parallel workers that processed page ranges of this document
+        self.worker_peak_rss_mb: Optional[float] = None
+        # Date format learned from this document's first rows, shared by the table and text passes
+        self.dates = DateFormatLearner()
+        # Fed with the leading page texts and every distinct table cell (see CellClassifier)
+        self.currency = CurrencyDetector()
+        self.cells = CellClassifier(self.dates, self.currency)
+        self.stats = ExtractionStats()
+        self._texts: Dict[int, str] = {}
+        self._words: Dict[int, List[Dict]] = {}
+
+    @classmethod
+    @contextmanager
+    def open(
+        cls,
+        path: Path,
+        low_memory: bool = False,
+        rss_ceiling_mb: Optional[float] = None,
+    ) -> Iterator["ParsedDocument"]:
+        with pdfplumber.open(path) as pdf:
+            yield cls(pdf, path, low_memory, rss_ceiling_mb)
+
+    def finish_page(self, page_index: int) -> None:
+        """Called after a page has been processed: frees it in low-memory mode and checks the ceiling."""
+        if self.low_memory:
+            self.release_page(page_index)
+        current = self.memory.sample()
+        if not self.memory.over_ceiling(current):
+            return
+        # Over the ceiling: drop every page's cached layout before giving up
+        for index in range(1, self.page_count + 1):
+            self.release_page(index)
+        gc.collect()
+        current = self.memory.sample()
+        if self.memory.over_ceiling(current):
+            raise MemoryCeilingExceeded(
+                f"RSS {current:.0f} MB exceeds the {self.memory.ceiling_mb:.0f} MB ceiling "
+                f"after page {page_index} of {self.path.name}"
+            )
+        logger.warning("Page %d: RSS was over the %.0f MB ceiling, released cached page layouts", page_index, self.memory.ceiling_mb)
+
+    def release_page(self, page_index: int) -> None:
+        self._words.pop(page_index, None)
+        page = self.page(page_index)
+        if hasattr(page, "close"):
+            page.close()
+        else:  # pragma: no cover - older pdfplumber
+            page.flush_cache()
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pdf.pages)
+
+    def page(self, page_index: int):
+        return self.pdf.pages[page_index - 1]
+
+    def page_text(self, page_index: int) -> str:
+        text = self._texts.get(page_index)
+        if text is None:
+            text = self._texts[page_index] = self.page(page_index).extract_text() or ""
+        return text
+
+    def page_words(self, page_index: int) -> List[Dict]:
+        words = self._words.get(page_index)
+        if words is None:
+            words = self._words[page_index] = self.page(page_index).extract_words()
+        return words
+
+    def cached_texts(self) -> Dict[int, str]:
+        return dict(self._texts)
+
+    def add_cached_texts(self, texts: Dict[int, str]) -> None:
+        """Adopt page texts extracted elsewhere, e.g. by a parallel worker that opened its own copy."""
+        for page_index, text in texts.items():
+            self._texts.setdefault(page_index, text)
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ExtractionOptions fields that only change speed, memory or logging, never the rows extracted
+_RESULT_NEUTRAL_OPTIONS = frozenset({
+    "workers", "parallel_min_pages", "pages_per_chunk", "low_memory", "rss_ceiling_mb", "trace_sample_rate",
+})
+
+
+def result_key(content_hash: str, options: Optional[ExtractionOptions] = None) -> str:
+    """
+    SHA-256 naming a processed result: the upload's digest plus every setting that can change it.
+
+    Covers the ExtractionOptions fields outside _RESULT_NEUTRAL_OPTIONS (table engine,
+    extraction engines, strategy lock-in, ...) and the translation target and ASCII bypass,
+    so a request with a different tableEngine, or a redeploy with other engines, doesn't
+    get a result produced under other settings.
+    """
+    settings = {
+        name: value for name, value in asdict(options or ExtractionOptions()).items() if name not in _RESULT_NEUTRAL_OPTIONS
+    }
+    settings["translation"] = [TRANSLATION_TARGET, TRANSLATION_SKIP_ASCII]
+    payload = json.dumps([content_hash, settings], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultStore:
+    """
+    Bounded directory of processed results keyed by the uploaded file's SHA-256.
+
+    Lets the service answer a re-uploaded or retried statement without running extraction,
+    translation and classification again. One JSON file per digest; reads refresh the file's
+    mtime and the least recently used files are pruned beyond `max_entries`. Writes are
+    atomic, so several gunicorn workers can share the directory.
+    """
+
+    def __init__(self, directory: Path, max_entries: int = 200):
+        self.directory = directory
+        self.max_entries = max_entries
+
+    def get(self, digest: str) -> Optional[Dict]:
+        path = self._path(digest)
+        try:
+            result = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return result if isinstance(result, dict) else None
+
+    def put(self, digest: str, result: Dict) -> None:
+        path = self._path(digest)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(json.dumps(result, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, path)
+            self._prune()
+        except OSError as e:
+            logger.warning("Could not store result %s: %s", digest[:12], str(e))
+
+    def _path(self, digest: str) -> Path:
+        if not re.fullmatch(r"[0-9a-f]{64}", digest):
+            raise ValueError(f"Not a SHA-256 hex digest: {digest!r}")
+        return self.directory / f"{digest}.json"
+
+    def _prune(self) -> None:
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(reverse=True)
+        for _mtime, path in entries[self.max_entries:]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+class TranslationStore:
+    """
+    SQLite table of translations keyed by (source text, target language), shared by all processes.
+
+    Merchant descriptions repeat across users and months, so a translation is paid for once
+    and reused by every gunicorn worker, queue worker and CLI run pointed at the same file.
+    The database is in WAL mode, so readers in any number of processes neither block each
+    other nor the writer. Each thread (and each forked process) opens its own connection.
+    Lookups only read: their hits are counted in memory and written in one transaction
+    every `hit_flush_every` hits or with the next put_many(), and preload() uses them to
+    pick the hot entries for the in-process cache. The least recently used rows are pruned
+    beyond `max_entries`. SQLite and filesystem errors are logged and treated as misses.
+    """
+
+    # SQLite's default limit on bound parameters is 999 in older builds
+    LOOKUP_CHUNK = 500
+
+    def __init__(
+        self, path: Path, target: str = TRANSLATION_TARGET, max_entries: int = 200000, hit_flush_every: int = 256
+    ):
+        self.path = path
+        self.target = target
+        self.max_entries = max_entries
+        self.hit_flush_every = hit_flush_every
+        self._local = threading.local()
+        self._pending_hits: Dict[str, int] = {}
+        self._hits_lock = threading.Lock()
+
+    def open(self) -> None:
+        """Open (and if needed create) the database now; raises sqlite3.Error or OSError if it can't be."""
+        self._connect()
+
+    def get_many(self, texts: List[str]) -> Dict[str, str]:
+        found: Dict[str, str] = {}
+        try:
+            connection = self._connect()
+            for offset in range(0, len(texts), self.LOOKUP_CHUNK):
+                chunk = texts[offset:offset + self.LOOKUP_CHUNK]
+                found.update(connection.execute(
+                    "SELECT source, translated FROM translations WHERE target = ? AND source IN ({})".format(
+                        ", ".join("?" * len(chunk))
+                    ),
+                    [self.target, *chunk],
+                ))
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Could not read translation cache %s: %s", self.path, str(e))
+            return {}
+        if found:
+            with self._hits_lock:
+                for text in found:
+                    self._pending_hits[text] = self._pending_hits.get(text, 0) + 1
+                due = len(self._pending_hits) >= self.hit_flush_every
+            if due:
+                self.flush_hits()
+        return found
+
+    def put_many(self, translations: Dict[str, str]) -> None:
+        if not translations:
+            return
+        now = time.time()
+        try:
+            connection = self._connect()
+            with self._transaction(connection):
+                connection.executemany(
+                    "INSERT INTO translations (source, target, translated, hits, last_used) VALUES (?, ?, ?, 0, ?) "
+                    "ON CONFLICT (source, target) DO UPDATE SET translated = excluded.translated, last_used = excluded.last_used",
+                    [(source, self.target, translated, now) for source, translated in translations.items()],
+                )
+                connection.execute(
+                    "DELETE FROM translations WHERE last_used < "
+                    "(SELECT last_used FROM translations ORDER BY last_used DESC LIMIT 1 OFFSET ?)",
+                    (max(self.max_entries - 1, 0),),
+                )
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Could not write translation cache %s: %s", self.path, str(e))
+            return
+        self.flush_hits()
+
+    def flush_hits(self) -> None:
+        """Write the hits counted since the last flush, in one transaction."""
+        with self._hits_lock:
+            hits, self._pending_hits = self._pending_hits, {}
+        if not hits:
+            return
+        now = time.time()
+        try:
+            connection = self._connect()
+            with self._transaction(connection):
+                connection.executemany(
+                    "UPDATE translations SET hits = hits + ?, last_used = ? WHERE source = ? AND target = ?",
+                    [(count, now, text, self.target) for text, count in hits.items()],
+                )
+        except (sqlite3.Error, OSError) as e:
+            # Hit counts only steer preloading; losing a batch of them is harmless
+            logger.warning("Could not record translation cache hits in %s: %s", self.path, str(e))
+
+    def preload(self, limit: int) -> Dict[str, str]:
+        """The `limit` most used translations into the target language."""
+        if limit <= 0:
+            return {}
+        try:
+            return dict(self._connect().execute(
+                "SELECT source, translated FROM translations WHERE target = ? ORDER BY hits DESC, last_used DESC LIMIT ?",
+                (self.target, limit),
+            ))
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Could not preload translation cache %s: %s", self.path, str(e))
+            return {}
+
+    @staticmethod
+    @contextmanager
+    def _transaction(connection: sqlite3.Connection) -> Iterator[None]:
+        # Connections are in autocommit mode, so batches need an explicit transaction
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection must not cross a fork, so a gunicorn worker never reuses the master's
+        if getattr(self._local, "pid", None) == os.getpid():
+            return self._local.connection
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "source TEXT NOT NULL, target TEXT NOT NULL, translated TEXT NOT NULL, "
+            "hits INTEGER NOT NULL DEFAULT 0, last_used REAL NOT NULL, "
+            "PRIMARY KEY (source, target)) WITHOUT ROWID"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)")
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
+
+
+# Layout-cache marker for statements that only parse through _extract_transactions_from_text
+TEXT_LAYOUT_RECIPE = "text"
+
+
+@dataclass
+class LayoutRecipe:
+    """What worked for a bank layout: the table strategy (or TEXT_LAYOUT_RECIPE) and its columns."""
+    strategy: str
+    columns: Optional[TableColumns] = None
+
+
+class LayoutRecipeCache:
+    """
+    JSON file mapping layout fingerprints to the extraction recipe that worked for them.
+
+    Safe to share between threads and processes: every write re-reads the file, merges,
+    and atomically replaces it, so concurrent writers can at worst drop each other's
+    newest entry. The least recently used entries are evicted beyond `max_entries`.
+    """
+
+    def __init__(self, path: Path, max_entries: int = 256):
+        self.path = path
+        self.max_entries = max_entries
+        self._entries: Dict[str, Dict] = {}
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint: str) -> Optional[LayoutRecipe]:
+        with self._lock:
+            self._refresh()
+            entry = self._entries.get(fingerprint)
+        if not entry or not entry.get("strategy"):
+            return None
+        columns = entry.get("columns")
+        try:
+            return LayoutRecipe(
+                strategy=entry["strategy"],
+                columns=TableColumns(*columns) if columns else None,
+            )
+        except TypeError:
+            return None
+
+    def put(self, fingerprint: str, recipe: LayoutRecipe) -> None:
+        columns = recipe.columns
+        entry = {
+            "strategy": recipe.strategy,
+            "columns": [columns.date, columns.debit, columns.credit, columns.description] if columns else None,
+            "lastUsed": time.time(),
+        }
+        with self._lock:
+            self._refresh()
+            self._entries[fingerprint] = entry
+            self._save()
+
+    def discard(self, fingerprint: str) -> None:
+        with self._lock:
+            self._refresh()
+            if self._entries.pop(fingerprint, None) is not None:
+                self._save()
+
+    def _refresh(self) -> None:
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable layout cache %s: %s", self.path, str(e))
+            return
+        self._entries = data if isinstance(data, dict) else {}
+        self._mtime = mtime
+
+    def _save(self) -> None:
+        if len(self._entries) > self.max_entries:
+            newest = sorted(self._entries.items(), key=lambda item: item[1].get("lastUsed", 0), reverse=True)
+            self._entries = dict(newest[:self.max_entries])
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(self._entries, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+            self._mtime = self.path.stat().st_mtime
+        except OSError as e:
+            logger.warning("Could not write layout cache %s: %s", self.path, str(e))
+
+
+class BoilerplatePageCache:
+    """
+    Bounded set of page-text digests known to yield no transaction rows with any table strategy
+    or the text fallback, learned from statements whose other pages did yield table rows.
+
+    Lets recurring terms-and-conditions and tariff pages skip the table search in every later
+    statement processed by this process. Safe to share between threads; the least recently
+    seen digests are evicted beyond `max_entries`.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._digests: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, digest: str) -> bool:
+        with self._lock:
+            if digest not in self._digests:
+                return False
+            self._digests.move_to_end(digest)
+            return True
+
+    def add(self, digest: str) -> None:
+        with self._lock:
+            self._digests[digest] = None
+            self._digests.move_to_end(digest)
+            while len(self._digests) > self.max_entries:
+                self._digests.popitem(last=False)
+
+
+def _boilerplate_digest(text: str) -> str:
+    # Page numbers and print dates change between statements; the wording of a legal page doesn't
+    skeleton = PAGE_NUMBER_PATTERN.sub("0", WHITESPACE_PATTERN.sub("", text))
+    return hashlib.sha1(skeleton.encode("utf-8")).hexdigest()
+
+
+_boilerplate_pages = BoilerplatePageCache(BOILERPLATE_CACHE_SIZE)
+_layout_caches: Dict[str, LayoutRecipeCache] = {}
+_translation_store: Optional[TranslationStore] = None
+_translation_store_lock = threading.Lock()
+_translation_store_failed = False
+
+
+def _get_layout_cache(path: Optional[str]) -> Optional[LayoutRecipeCache]:
+    if not path:
+        return None
+    cache = _layout_caches.get(path)
+    if cache is None:
+        cache = _layout_caches[path] = LayoutRecipeCache(Path(path).expanduser())
+    return cache
+
+
+def _get_translation_store() -> Optional[TranslationStore]:
+    """The process's TranslationStore; the first call preloads its hot entries into the in-process cache."""
+    global _translation_store, _translation_store_failed
+    if not TRANSLATION_CACHE_PATH:
+        return None
+    if _translation_store is None:
+        with _translation_store_lock:
+            if _translation_store is None and not _translation_store_failed:
+                store = TranslationStore(Path(TRANSLATION_CACHE_PATH).expanduser(), max_entries=TRANSLATION_CACHE_MAX_ENTRIES)
+                try:
+                    store.open()
+                except (sqlite3.Error, OSError) as e:
+                    # Translation carries on with the in-process cache only
+                    logger.warning("Translation cache %s is unavailable, caching in memory only: %s", TRANSLATION_CACHE_PATH, str(e))
+                    _translation_store_failed = True
+                    return None
+                preloaded = store.preload(TRANSLATION_CACHE_PRELOAD)
+                _translation_cache.update(preloaded)
+                PIPELINE_METRICS.count("translation_cache_preloaded", len(preloaded))
+                atexit.register(store.flush_hits)
+                _translation_store = store
+    return _translation_store
+
+
+def _layout_fingerprint(document: ParsedDocument) -> Optional[str]:
+    """
+    Fingerprint a bank layout from the first page: page size plus the text and x-positions
+    of the line with the most header keywords. Returns None when no header line is found.
+    """
+    page = document.page(1)
+    words = sorted(document.page_words(1), key=lambda word: (word["top"], word["x0"]))
+    lines: List[List[Dict]] = []
+    for word in words:
+        if lines and abs(word["top"] - lines[-1][0]["top"]) <= 2:
+            lines[-1].append(word)
+        else:
+            lines.append([word])
+
+    header_line: Optional[List[Dict]] = None
+    best_hits = 0
+    for line in lines:
+        hits = TRANSACTION_KEYWORDS.hits(" ".join(word["text"] for word in line), "header")
+        if hits > best_hits:
+            header_line, best_hits = line, hits
+    if not header_line:
+        return None
+
+    parts = [f"{round(page.width)}x{round(page.height)}"]
+    for word in sorted(header_line, key=lambda word: word["x0"]):
+        # Digits vary between statements of the same layout (dates, account numbers)
+        token = DIGIT_PATTERN.sub("", word["text"].lower())
+        if token:
+            parts.append(f"{token}@{round(word['x0'] / 5)}")
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+# Table extraction strategies, tried in order on each page until one yields rows.
+TABLE_STRATEGIES: Tuple[Dict, ...] = (
+    {
+        "name": "lines (strict)",
+        "settings": {
+            "vertical_strategy": "lines",
+            "horizontal_strategy": "lines",
+            "snap_tolerance": 3,
+            "join_tolerance": 3,
+            "edge_min_length": 3,
+            "text_tolerance": 3,
+            "text_strategy": "lines",
+            "intersection_tolerance": 3,
+            "intersection_x_tolerance": 3,
+            "intersection_y_tolerance": 3,
+        }
+    },
+    {
+        "name": "lines (relaxed)",
+        "settings": {
+            "vertical_strategy": "lines",
+            "horizontal_strategy": "lines",
+            "snap_tolerance": 5,
+            "join_tolerance": 5,
+            "edge_min_length": 1,
+            "text_tolerance": 5,
+            "text_strategy": "lines",
+            "intersection_tolerance": 5,
+            "intersection_x_tolerance": 5,
+            "intersection_y_tolerance": 5,
+        }
+    },
+    {
+        "name": "text (explicit)",
+        "settings": {
+            "vertical_strategy": "text",
+            "horizontal_strategy": "text",
+            "snap_tolerance": 3,
+            "join_tolerance": 3,
+        }
+    },
+    {
+        "name": "lines_strict + explicit",
+        "settings": {
+            "vertical_strategy": "lines_strict",
+            "horizontal_strategy": "lines_strict",
+            "snap_tolerance": 3,
+            "join_tolerance": 3,
+        }
+    },
+)
+
+# Values of ExtractionOptions.table_engine (see PDF_TABLE_ENGINE)
+TABLE_ENGINES = ("pdfplumber", "grid")
+# Name the grid engine's rows are recorded under, next to the TABLE_STRATEGIES names
+GRID_STRATEGY = "grid"
+GRID_MIN_ROWS = 3
+GRID_MIN_COLUMNS = 3
+# Empty vertical strips narrower than this many characters are word spaces, not column gaps
+GRID_MIN_GAP_CHARS = 1.5
+# Share of data lines that must agree on the date column, that must fit the header's columns
+# (see _grid_columns_agree), and that must come back as rows
+GRID_MIN_AGREEMENT = 0.9
+# Occupancy histogram bins per point
+GRID_RESOLUTION = 2
+
+
+def extract_transactions_with_pdfplumber(
+    pdf_path: Path,
+    options: Optional[ExtractionOptions] = None,
+) -> Tuple[List[RawTransaction], StatementMetadata]:
+    if pdfplumber is None:
+        logger.warning("pdfplumber is not available")
+        return [], StatementMetadata()
+
+    metadata = StatementMetadata(source=pdf_path.name)
+    transactions: List[RawTransaction] = []
+    try:  # pragma: no cover - requires runtime dependency
+        for batch in _iter_statement_batches(pdf_path, options or ExtractionOptions(), metadata):
+            transactions.extend(batch)
+    except MemoryCeilingExceeded:
+        # Let the caller fail the job with a clear reason instead of reporting "no transactions"
+        raise
+    except Exception as e:  # pragma: no cover
+        logger.error("Exception during PDF extraction: %s", str(e))
+        traceback.print_exc()
+        return [], metadata
+
+    logger.info("PDF extraction completed: found %d transactions", len(transactions))
+    return transactions, metadata
+
+
+def iter_transactions(
+    pdf_path: Path,
+    model=None,
+    options: Optional[ExtractionOptions] = None,
+    metadata: Optional[StatementMetadata] = None,
+) -> Iterator[Dict]:
+    """
+    Stream translated and categorised transaction rows as each page is extracted (see _iter_engine_batches).
+
+    Yields the same dicts as the "transactions" list of the CLI payload. Pass a
+    StatementMetadata to read the detected currency once the generator is exhausted.
+    Extraction errors propagate to the caller, which may already have consumed rows.
+    """
+    metadata = metadata if metadata is not None else StatementMetadata()
+    metadata.source = metadata.source or pdf_path.name
+    for batch in _iter_engine_batches(pdf_path, options or ExtractionOptions(), metadata):
+        yield from _enrich_batch(batch, model)
+
+
+@dataclass
+class EngineResult:
+    rows: List[RawTransaction]
+    metadata: StatementMetadata
+    # Share of consecutive rows whose printed running balance moves by the row's amount; None when unknown
+    balance_agreement: Optional[float] = None
+
+
+class ExtractionEngine:
+    """
+    One way of turning a statement PDF into rows, registered in EXTRACTION_ENGINES.
+
+    extract_transactions() runs the engines named in ExtractionOptions.engines cheapest first
+    and stops at the first whose result accepts() approves; otherwise the result with the best
+    _score_transactions wins. Subclasses set `name` and `cost` and implement extract();
+    iter_batches() is only overridden by engines that can hand rows over page by page.
+    """
+
+    name = ""
+    # Relative cost per page, only used for ordering
+    cost = 0
+
+    def available(self) -> bool:
+        return True
+
+    def extract(self, pdf_path: Path, options: ExtractionOptions) -> EngineResult:
+        raise NotImplementedError
+
+    def iter_batches(
+        self, pdf_path: Path, options: ExtractionOptions, metadata: StatementMetadata
+    ) -> Iterator[List[RawTransaction]]:
+        result = self.extract(pdf_path, options)
+        _copy_metadata(result.metadata, metadata)
+        if result.rows:
+            yield result.rows
+
+    def accepts(self, result: EngineResult) -> bool:
+        return _transaction_penalty(result.rows) <= ENGINE_MAX_PENALTY
+
+
+class PdfplumberEngine(ExtractionEngine):
+    """The table strategies (or GridTable) with the text fallback, see _iter_statement_batches."""
+
+    name = "pdfplumber"
+    cost = 100
+
+    def available(self) -> bool:
+        return pdfplumber is not None
+
+    def extract(self, pdf_path: Path, options: ExtractionOptions) -> EngineResult:
+        rows, metadata = extract_transactions_with_pdfplumber(pdf_path, options)
+        return EngineResult(rows, metadata)
+
+    def iter_batches(
+        self, pdf_path: Path, options: ExtractionOptions, metadata: StatementMetadata
+    ) -> Iterator[List[RawTransaction]]:
+        metadata.source = metadata.source or pdf_path.name
+        yield from _iter_statement_batches(pdf_path, options, metadata)
+
+
+class PdfiumTextEngine(ExtractionEngine):
+    """
+    Reads the text layer with PDFium (pypdfium2) instead of pdfminer's layout analysis and
+    parses it with the text-fallback line parser.
+
+    PDFium returns text in content order without layout analysis, and on table statements the
+    line parser can mistake a balance for the amount, so the rows are only accepted when the
+    running balances printed on the lines confirm them.
+    """
+
+    name = "pdfium_text"
+    cost = 10
+
+    def available(self) -> bool:
+        return pdfium is not None
+
+    def extract(self, pdf_path: Path, options: ExtractionOptions) -> EngineResult:
+        metadata = StatementMetadata(source=pdf_path.name)
+        page_texts = _pdfium_page_texts(pdf_path)
+        dates = DateFormatLearner()
+        rows = _parse_statement_lines(page_texts, dates)
+        detector = CurrencyDetector()
+        for text in page_texts:
+            if detector.feed(text):
+                break
+        _apply_detected_currency(detector, metadata)
+        return EngineResult(rows, metadata, _balance_agreement(page_texts, dates))
+
+    def accepts(self, result: EngineResult) -> bool:
+        agreement = result.balance_agreement
+        return super().accepts(result) and agreement is not None and agreement >= ENGINE_MIN_BALANCE_AGREEMENT
+
+
+EXTRACTION_ENGINES: Dict[str, ExtractionEngine] = {}
+
+
+def register_engine(engine: ExtractionEngine) -> ExtractionEngine:
+    """Add (or replace) an engine; ExtractionOptions.engines refers to it by name."""
+    EXTRACTION_ENGINES[engine.name] = engine
+    return engine
+
+
+register_engine(PdfplumberEngine())
+register_engine(PdfiumTextEngine())
+
+
+def _pdfium_page_texts(pdf_path: Path) -> List[str]:
+    # PDFium is not thread-safe and the service runs threaded workers
+    with _pdfium_lock:
+        document = pdfium.PdfDocument(str(pdf_path))
+        try:
+            texts = []
+            for page in document:
+                textpage = page.get_textpage()
+                texts.append(textpage.get_text_bounded())
+                textpage.close()
+                page.close()
+            return texts
+        finally:
+            document.close()
+
+
+_pdfium_lock = threading.Lock()
+
+
+def _text_line_balance(line: str) -> Optional[float]:
+    """The running balance _parse_text_transaction_line leaves after the amount, if the line has one."""
+    match = TEXT_TRANSACTION_LINE_PATTERN.match(line)
+    if not match:
+        return None
+    number_matches = list(NUMBER_PATTERN.finditer(match.group("body")))
+    return parse_amount([number_matches[-1].group()]) if len(number_matches) > 1 else None
+
+
+def _balance_agreement(page_texts: Iterable[str], dates: DateFormatLearner) -> Optional[float]:
+    """
+    Share of consecutive transaction lines whose balance moves by the parsed amount, in
+    either date order. None when fewer than ENGINE_MIN_BALANCE_CHECKS pairs carry a balance.
+    """
+    previous: Optional[Tuple[float, float]] = None
+    checked = forward = backward = 0
+    for text in page_texts:
+        for raw_line in text.splitlines():
+            line = raw_line.strip()
+            parsed = _parse_text_transaction_line(line, dates) if line else None
+            if not parsed:
+                continue
+            balance = _text_line_balance(line)
+            if balance is None:
+                previous = None
+                continue
+            amount = parsed[2]
+            if previous is not None:
+                previous_amount, previous_balance = previous
+                checked += 1
+                forward += abs(previous_balance + amount - balance) < 0.005
+                backward += abs(balance + previous_amount - previous_balance) < 0.005
+            previous = (amount, balance)
+    if checked < ENGINE_MIN_BALANCE_CHECKS:
+        return None
+    return max(forward, backward) / checked
+
+
+def _copy_metadata(source: StatementMetadata, target: StatementMetadata) -> None:
+    for name, value in vars(source).items():
+        setattr(target, name, value)
+
+
+def _engine_chain(options: ExtractionOptions) -> List[ExtractionEngine]:
+    engines = []
+    for name in options.engines:
+        engine = EXTRACTION_ENGINES.get(name)
+        if engine is None:
+            logger.warning("Unknown extraction engine '%s' (registered: %s)", name, ", ".join(EXTRACTION_ENGINES))
+        elif not engine.available():
+            logger.warning("Extraction engine '%s' is not available", name)
+        else:
+            engines.append(engine)
+    return sorted(engines, key=lambda engine: engine.cost)
+
+
+def _run_engine(engine: ExtractionEngine, pdf_path: Path, options: ExtractionOptions) -> EngineResult:
+    try:
+        with PIPELINE_METRICS.timed(f"engine:{engine.name}"):
+            return engine.extract(pdf_path, options)
+    except MemoryCeilingExceeded:
+        raise
+    except Exception:
+        logger.exception("Extraction engine '%s' failed", engine.name)
+        return EngineResult([], StatementMetadata(source=pdf_path.name))
+
+
+def _escalate(engine: ExtractionEngine, result: EngineResult, best: Optional[EngineResult]) -> EngineResult:
+    """Record that `engine`'s result was not accepted and keep the better of it and `best`."""
+    PIPELINE_METRICS.count(f"engine_escalations:{engine.name}")
+    logger.info(
+        "Engine '%s' found %d rows (score %.2f, balance agreement %s), escalating",
+        engine.name,
+        len(result.rows),
+        _score_transactions(result.rows),
+        "n/a" if result.balance_agreement is None else f"{result.balance_agreement:.0%}",
+    )
+    # Later engines are costlier and win ties
+    if best is None or _score_transactions(result.rows) <= _score_transactions(best.rows):
+        return result
+    return best
+
+
+def extract_transactions(
+    pdf_path: Path,
+    options: Optional[ExtractionOptions] = None,
+) -> Tuple[List[RawTransaction], StatementMetadata]:
+    """Run the engines of `options.engines` cheapest first; see ExtractionEngine."""
+    options = options or ExtractionOptions()
+    best: Optional[EngineResult] = None
+    for engine in _engine_chain(options):
+        result = _run_engine(engine, pdf_path, options)
+        if engine.accepts(result):
+            logger.info("Engine '%s' accepted with %d rows", engine.name, len(result.rows))
+            return result.rows, result.metadata
+        best = _escalate(engine, result, best)
+    if best is None:
+        return [], StatementMetadata(source=pdf_path.name)
+    return best.rows, best.metadata
+
+
+def _iter_engine_batches(
+    pdf_path: Path,
+    options: ExtractionOptions,
+    metadata: StatementMetadata,
+) -> Iterator[List[RawTransaction]]:
+    """Streaming counterpart of extract_transactions: the last engine hands its rows over as pages finish."""
+    chain = _engine_chain(options)
+    best: Optional[EngineResult] = None
+    for engine in chain[:-1]:
+        result = _run_engine(engine, pdf_path, options)
+        if engine.accepts(result):
+            _copy_metadata(result.metadata, metadata)
+            yield result.rows
+            return
+        best = _escalate(engine, result, best)
+    streamed = 0
+    if chain:
+        # Nothing is left to escalate to, and its rows may already be consumed
+        for batch in chain[-1].iter_batches(pdf_path, options, metadata):
+            streamed += len(batch)
+            yield batch
+    if not streamed and best is not None and best.rows:
+        _copy_metadata(best.metadata, metadata)
+        yield best.rows
+
+
+def _enrich_batch(items: List[RawTransaction], model) -> List[Dict]:
+    """Translate a batch's descriptions in one go (see translate_batch_to_english), then categorise each row."""
+    with PIPELINE_METRICS.timed("translate"):
+        translations = translate_batch_to_english([item.description for item in items])
+    return [_enrich_transaction(item, translated, model) for item, translated in zip(items, translations)]
+
+
+def _enrich_transaction(item: RawTransaction, translated: str, model) -> Dict:
+    with PIPELINE_METRICS.timed("categorize"):
+        category, confidence = predict_category(translated, model)
+    return {
+        "date": item.date,
+        "description": item.description,
+        "translatedDescription": translated,
+        "amount": round(float(item.amount), 2),
+        "category": category,
+        "confidence": round(float(confidence), 2),
+    }
+
+
+def _metadata_payload(metadata: StatementMetadata) -> Dict:
+    return {
+        "currency": metadata.currency,
+        "currencyConfidence": metadata.currency_confidence,
+        "currencyDetectionMethod": metadata.currency_detection_method,
+        "source": metadata.source,
+        "periodStart": metadata.period_start,
+        "periodEnd": metadata.period_end,
+    }
+
+
+def _iter_statement_batches(
+    pdf_path: Path,
+    options: ExtractionOptions,
+    metadata: StatementMetadata,
+) -> Iterator[List[RawTransaction]]:
+    """
+    Core extraction pipeline: yields each page's table rows as soon as the page is done,
+    or the text-fallback rows in one batch at the end. Fills `metadata` along the way.
+    """
+    logger.info("Starting PDF extraction with pdfplumber for: %s", pdf_path.name)
+    fingerprint: Optional[str] = None
+    recipe: Optional[LayoutRecipe] = None
+    scan: Optional[_StrategyScan] = None
+    rows_found = 0
+    used_text_extraction = False
+    layout_cache = _get_layout_cache(options.layout_cache_path)
+    currency_pages = 0
+
+    opened = time.perf_counter()
+    with ParsedDocument.open(pdf_path, options.low_memory, options.rss_ceiling_mb) as document:
+        document.stats = ExtractionStats.sampled(options.trace_sample_rate)
+        document.stats.observe("open", time.perf_counter() - opened)
+        total_pages = document.page_count
+        logger.info("Opened %s with %d pages (processing all pages)", pdf_path.name, total_pages)
+        
+        # First, get some diagnostic info about the PDF
+        if total_pages > 0:
+            text_sample = document.page_text(1)
+            if text_sample:
+                # Show first 200 chars to understand PDF structure
+                if document.stats.trace:
+                    preview = text_sample[:200].replace('\n', ' ').strip()
+                    logger.info("Page 1 text preview: %s...", preview)
+            else:
+                logger.warning("Page 1: No text extracted - PDF might be image-based or encrypted")
+            currency_pages = _scan_currency_pages(document, options.currency_scan_pages)
+            _apply_detected_currency(document.currency, metadata)
+
+        if layout_cache is not None and total_pages > 0:
+            fingerprint = _layout_fingerprint(document)
+            recipe = layout_cache.get(fingerprint) if fingerprint else None
+            if recipe:
+                logger.info("Layout %s recognised: using cached strategy '%s'", fingerprint[:12], recipe.strategy)
+
+        if recipe and recipe.strategy == TEXT_LAYOUT_RECIPE:
+            # Known text-only layout: go straight to line parsing
+            with document.stats.timed("text_fallback"):
+                text_rows = _extract_transactions_from_text(pdf_path, document)
+            if text_rows:
+                used_text_extraction = True
+                rows_found = len(text_rows)
+                _scan_currency_pages(document, document.page_count, first_page=currency_pages + 1)
+                yield text_rows
+            else:
+                logger.info("Cached text recipe found nothing, running the table pass")
+                recipe = None
+
+        if not rows_found:
+            screen = PageScreen() if options.page_prescreen else None
+            grid = _table_engine_uses_grid(options.table_engine)
+            # A grid recipe only says the grid worked; its pages still get the full search when it doesn't
+            if recipe and recipe.strategy != GRID_STRATEGY:
+                scan = _StrategyScan(
+                    locked=recipe.strategy,
+                    columns=recipe.columns,
+                    crop_tables=options.table_cropping,
+                    screen=screen,
+                    grid=grid,
+                )
+            else:
+                scan = _StrategyScan(
+                    options.strategy_lock_in,
+                    options.strategy_probe_pages,
+                    crop_tables=options.table_cropping,
+                    screen=screen,
+                    grid=grid,
+                )
+            for _page_index, page_rows in _iter_table_pages(document, options, scan):
+                if page_rows:
+                    rows_found += len(page_rows)
+                    yield page_rows
+
+            # Only use text-based extraction if table-based extraction found no transactions
+            # Table-based extraction is more reliable, so we prefer it when it finds transactions
+            if not rows_found:
+                logger.info("No transactions found via table extraction, trying text-based extraction")
+                with document.stats.timed("text_fallback"):
+                    text_based_rows = _extract_transactions_from_text(pdf_path, document)
+                if text_based_rows:
+                    logger.info("Text-based extraction found %d transactions", len(text_based_rows))
+                    used_text_extraction = True
+                    rows_found = len(text_based_rows)
+                    _scan_currency_pages(document, document.page_count, first_page=currency_pages + 1)
+                    yield text_based_rows
+            else:
+                logger.info("Using table-based extraction results (%d transactions found)", rows_found)
+                scan.remember_boilerplate()
+
+        _apply_detected_currency(document.currency, metadata)
+        _record_peak_memory(document, metadata)
+        logger.info("Extraction summary for %s: %s", pdf_path.name, document.stats.summary())
+        PIPELINE_METRICS.record_document(document.stats)
+
+    if layout_cache is not None and fingerprint:
+        if used_text_extraction:
+            layout_cache.put(fingerprint, LayoutRecipe(strategy=TEXT_LAYOUT_RECIPE))
+        elif rows_found and scan is not None and scan.dominant_strategy:
+            layout_cache.put(fingerprint, LayoutRecipe(strategy=scan.dominant_strategy, columns=scan.learned_columns))
+        else:
+            # Nothing extracted, or pages disagreed on the strategy: don't steer the next upload
+            layout_cache.discard(fingerprint)
+
+
+def _scan_currency_pages(document: ParsedDocument, last_page: int, first_page: int = 1) -> int:
+    """Stream page texts into the document's currency detector until it is done. Returns the last page fed."""
+    fed = first_page - 1
+    for page_index in range(first_page, min(last_page, document.page_count) + 1):
+        fed = page_index
+        if document.currency.feed(document.page_text(page_index)):
+            break
+    return fed
+
+
+def _apply_detected_currency(detector: CurrencyDetector, metadata: StatementMetadata) -> None:
+    detected = detector.result()
+    if detected:
+        metadata.currency, metadata.currency_confidence, metadata.currency_detection_method = detected
+
+
+def _record_peak_memory(document: ParsedDocument, metadata: StatementMetadata) -> None:
+    document.memory.sample()
+    peaks = [peak for peak in (document.memory.peak_mb, document.worker_peak_rss_mb) if peak is not None]
+    if not peaks:
+        return
+    metadata.peak_rss_mb = round(max(peaks), 1)
+    logger.info(
+        "Peak RSS during extraction: %.1f MB (started at %.1f MB%s)",
+        document.memory.peak_mb or 0.0,
+        document.memory.start_mb or 0.0,
+        f", parallel workers peaked at {document.worker_peak_rss_mb:.1f} MB" if document.worker_peak_rss_mb else "",
+    )
+
+
+def _iter_table_pages(
+    document: ParsedDocument,
+    options: ExtractionOptions,
+    scan: _StrategyScan,
+) -> Iterator[Tuple[int, List[RawTransaction]]]:
+    """Run the table pass over every page, in parallel when the options allow it."""
+    total_pages = document.page_count
+    next_page = 1
+    if _should_extract_in_parallel(total_pages, options):
+        try:
+            for page_index, page_rows in _iter_pages_in_parallel(document, options, scan):
+                next_page = page_index + 1
+                yield page_index, page_rows
+            return
+        except (OSError, BrokenProcessPool) as e:
+            # Process pools can be unavailable in restricted containers; finish on one core
+            logger.warning("Parallel extraction failed (%s), continuing sequentially from page %d", str(e), next_page)
+    yield from _iter_page_range(document, next_page, total_pages, scan)
+
+
+class _StrategyScan:
+    """
+    Decides which table strategies run on each page during one extraction pass.
+
+    Without lock-in every page tries TABLE_STRATEGIES in order until one yields rows.
+    With lock-in the first `probe_pages` pages that produce rows run every strategy
+    (keeping the rows the ordinary search would have kept). Candidates that, on every probe
+    page where they yield rows, find at least MIN_COVERAGE of the most rows any strategy
+    found there are compared with _score_transactions, so a strategy that only picks up a
+    few small rows can't win on its median; the winner is the only strategy tried
+    afterwards. A page where it yields nothing, or less than MIN_ROW_SHARE of its rows per
+    productive probe page, gets the full search.
+    """
+
+    MIN_COVERAGE = 0.9
+    MIN_ROW_SHARE = 0.5
+
+    def __init__(
+        self,
+        lock_in: bool = False,
+        probe_pages: int = 2,
+        locked: Optional[str] = None,
+        columns: Optional[TableColumns] = None,
+        crop_tables: bool = False,
+        screen: Optional["PageScreen"] = None,
+        grid: bool = False,
+        expected_rows: Optional[float] = None,
+    ):
+        self.lock_in = lock_in
+        self.locked = locked
+        # Rows per page the locked strategy found while probing; None when it came from a cached recipe
+        self.expected_rows = expected_rows
+        # Row count per strategy on each probe page
+        self._probe_counts: List[Dict[str, int]] = []
+        # Known column layout (from a cached recipe); None means detect it from each table header
+        self.columns = columns
+        self.probe_pages_left = max(1, probe_pages) if lock_in and locked is None else 0
+        self._probe_rows: Dict[str, List[RawTransaction]] = {}
+        # Rows produced per strategy and the first header-derived column layout, for the layout cache
+        self.strategy_rows: Dict[str, int] = {}
+        self.learned_columns: Optional[TableColumns] = None
+        # Learned once, from the first page that yields rows, when table cropping is enabled
+        self.crop_tables = crop_tables
+        self.region: Optional[TableRegion] = None
+        self._region_attempted = False
+        # Page pre-screen, and the digests of pages that yielded no rows at all (handed back by parallel
+        # workers); they only reach _boilerplate_pages through remember_boilerplate()
+        self.screen = screen
+        self.boilerplate_digests: List[str] = []
+        # Try the grid engine before the strategies on every page (see GridTable)
+        self.grid = grid
+
+    def learn_region(self, page, strategy: Dict) -> None:
+        if not self.crop_tables or self._region_attempted:
+            return
+        self._region_attempted = True
+        self.region = _learn_table_region(page, strategy)
+        if self.region is not None:
+            logger.info(
+                "Table region learned from strategy '%s': %d column lines, x %.0f-%.0f",
+                strategy["name"], len(self.region.columns), self.region.x0, self.region.x1,
+            )
+
+    def record_page(self, strategy_name: str, rows: int, columns: Optional[TableColumns]) -> None:
+        self.strategy_rows[strategy_name] = self.strategy_rows.get(strategy_name, 0) + rows
+        if self.learned_columns is None and columns is not None:
+            self.learned_columns = columns
+
+    def remember_boilerplate(self) -> None:
+        """
+        Add the no-row pages to _boilerplate_pages so later statements skip them. Only called once
+        the document produced table rows elsewhere: a statement whose pages all come up empty is
+        read by the text fallback, and its pages are transaction pages, not boilerplate.
+        """
+        for digest in self.boilerplate_digests:
+            _boilerplate_pages.add(digest)
+
+    def merge(self, strategy_rows: Dict[str, int], learned_columns: Optional[TableColumns]) -> None:
+        """Fold in the tallies of a worker that scanned a later page range."""
+        for name, rows in strategy_rows.items():
+            self.strategy_rows[name] = self.strategy_rows.get(name, 0) + rows
+        if self.learned_columns is None:
+            self.learned_columns = learned_columns
+
+    @property
+    def dominant_strategy(self) -> Optional[str]:
+        """The strategy behind nearly all rows, or None for empty or mixed-layout documents."""
+        total = sum(self.strategy_rows.values())
+        if not total:
+            return None
+        best = max(self.strategy_rows, key=lambda name: self.strategy_rows[name])
+        return best if self.strategy_rows[best] >= total * 0.9 else None
+
+    @property
+    def probing(self) -> bool:
+        return self.lock_in and self.locked is None and self.probe_pages_left > 0
+
+    def strategies_for_page(self) -> List[Dict]:
+        if self.locked is None:
+            return list(TABLE_STRATEGIES)
+        return [strategy for strategy in TABLE_STRATEGIES if strategy["name"] == self.locked]
+
+    def fallback_strategies(self) -> List[Dict]:
+        return [strategy for strategy in TABLE_STRATEGIES if strategy["name"] != self.locked]
+
+    def undershoots(self, rows: int) -> bool:
+        """Whether the locked strategy found so few rows on a page that the full search should run too."""
+        if self.locked is None:
+            return False
+        if not rows:
+            return True
+        return self.expected_rows is not None and rows < self.MIN_ROW_SHARE * self.expected_rows
+
+    def record_probe(self, page_index: int, candidates: Dict[str, List[RawTransaction]]) -> None:
+        if not candidates:
+            # Pages without rows (cover pages, summaries) say nothing about the table layout
+            return
+        for name, rows in candidates.items():
+            self._probe_rows.setdefault(name, []).extend(rows)
+        self._probe_counts.append({name: len(rows) for name, rows in candidates.items()})
+        self.probe_pages_left -= 1
+        if self.probe_pages_left > 0:
+            return
+        scores = {name: _score_transactions(rows) for name, rows in self._probe_rows.items()}
+        # min() keeps the earliest strategy on ties, matching the default search order
+        self.locked = min(
+            self._covering_strategies() or [name for name in self._strategy_order() if name in scores],
+            key=lambda name: scores[name],
+        )
+        productive_pages = sum(1 for counts in self._probe_counts if self.locked in counts)
+        self.expected_rows = len(self._probe_rows[self.locked]) / productive_pages
+        logger.info(
+            "Page %d: locking table strategy '%s' for the rest of the document (scores: %s; rows: %s)",
+            page_index,
+            self.locked,
+            ", ".join(f"{name}={score:.2f}" for name, score in scores.items()),
+            ", ".join(f"{name}={len(rows)}" for name, rows in self._probe_rows.items()),
+        )
+        self._probe_rows = {}
+        self._probe_counts = []
+
+    def _covering_strategies(self) -> List[str]:
+        """Probed strategies, in TABLE_STRATEGIES order, that found nearly all rows on each page they yielded rows on."""
+        return [
+            name
+            for name in self._strategy_order()
+            if name in self._probe_rows
+            and all(
+                counts[name] >= self.MIN_COVERAGE * max(counts.values())
+                for counts in self._probe_counts
+                if name in counts
+            )
+        ]
+
+    @staticmethod
+    def _strategy_order() -> List[str]:
+        return [strategy["name"] for strategy in TABLE_STRATEGIES]
+
+
+@dataclass(frozen=True)
+class PageScreen:
     """
-    Extract amount from text that may contain currency codes like "20.65 GEL" or "3.54 GEL".
-    Returns the first valid amount found in the text.
+    Cheap check, before any table strategy runs, that a page can hold transaction rows at all.
+
+    Every row needs a date and an amount, so pages with too little text, no date-like token or
+    no other number (cover pages, image-only pages, terms and conditions) are skipped. Works on
+    the page's raw character stream, which costs about a millisecond against the hundreds a
+    fruitless search through TABLE_STRATEGIES takes.
     """
-    if not text:
+
+    min_chars: int = PRESCREEN_MIN_CHARS
+    min_dates: int = PRESCREEN_MIN_DATES
+    min_numbers: int = PRESCREEN_MIN_NUMBERS
+
+    def skip_reason(self, text: str) -> Optional[str]:
+        """Why the page can't hold transaction rows, or None when it should be searched."""
+        if len(WHITESPACE_PATTERN.sub("", text)) < self.min_chars:
+            return "no_text"
+        dates = sum(1 for _ in PAGE_DATE_PATTERN.finditer(text))
+        if dates < self.min_dates:
+            return "no_dates"
+        numbers = sum(1 for _ in PAGE_NUMBER_PATTERN.finditer(PAGE_DATE_PATTERN.sub(" ", text)))
+        if numbers < self.min_numbers:
+            return "no_numbers"
         return None
-    
-    # Pattern to match amounts like "20.65 GEL", "3.54 GEL", "86.56", etc.
-    # Matches: optional sign, digits, optional dot/comma, digits, optional currency code
-    patterns = [
-        r'([+-]?\d+[.,]\d{2})\s*(?:GEL|USD|EUR|RUB|₾|₽|\$|€)?',  # "20.65 GEL" or "20.65"
-        r'([+-]?\d+[.,]\d{1,2})\s*(?:GEL|USD|EUR|RUB|₾|₽|\$|€)?',  # "20.6 GEL" or "20.6"
-        r'([+-]?\d+)\s*(?:GEL|USD|EUR|RUB|₾|₽|\$|€)',  # "20 GEL"
-    ]
-    
-    for pattern in patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
-            amount_str = match.group(1)
-            amount = parse_amount([amount_str])
-            if amount is not None and amount != 0:
-                return amount
-    
-    return None
 
 
-def detect_currency_from_text(text: Optional[str]) -> Optional[Tuple[str, float, str]]:
+def _screen_page(page, screen: PageScreen) -> Tuple[Optional[str], Optional[str]]:
+    """Returns (skip reason, boilerplate digest); the digest is only computed for pages that pass the screen."""
+    text = "".join(char["text"] for char in page.chars)
+    reason = screen.skip_reason(text)
+    if reason is not None:
+        return reason, None
+    digest = _boilerplate_digest(text)
+    return ("boilerplate" if digest in _boilerplate_pages else None), digest
+
+
+@dataclass(frozen=True)
+class TableRegion:
     """
-    Attempt to detect currency codes from statement text.
-    Returns (currency_code, confidence, detection_method).
+    Column lines of a ruled transaction table, learned on the first page that yields rows.
+
+    Later pages are cropped to the table and searched with these lines as explicit verticals,
+    so letterheads, footers and summary blocks stay out of pdfplumber's per-row character
+    scans. A page is only cropped when its own vertical rulings sit on exactly these lines
+    and span the same height (see _crop_to_table_region), which keeps the cells identical.
     """
 
-    if not text:
-        return None
+    strategy: str
+    columns: Tuple[float, ...]
 
-    detection_candidates: List[Tuple[str, float, str]] = []
+    @property
+    def x0(self) -> float:
+        return self.columns[0]
 
-    # Highest confidence: explicit labels like "Currency: RUB" or "Валюта: RUB"
-    currency_match = re.search(r"(?:currency|валюта)\s*[:\-]?\s*([A-Z]{3})", text, re.IGNORECASE)
-    if currency_match:
-        detection_candidates.append((currency_match.group(1).upper(), 0.95, "header-label"))
+    @property
+    def x1(self) -> float:
+        return self.columns[-1]
 
-    # Symbols map (€, $, ₽, ₾, etc.)
-    for symbol, code in CURRENCY_SYMBOL_MAP.items():
-        if symbol and symbol in text:
-            detection_candidates.append((code, 0.9, f"symbol:{symbol}"))
 
-    # Common language-specific keywords
-    keyword_patterns: List[Tuple[str, str, float, str]] = [
-        (r"\bруб(?:\.|ля|лей|\b)", "RUB", 0.85, "keyword:rub"),
-        (r"\blari\b", "GEL", 0.8, "keyword:lari"),
-        (r"\btenge\b", "KZT", 0.75, "keyword:tenge"),
-        (r"\bdram\b", "AMD", 0.75, "keyword:dram"),
-    ]
-    for pattern, code, confidence, method in keyword_patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            detection_candidates.append((code, confidence, method))
+def _learn_table_region(page, strategy: Dict) -> Optional[TableRegion]:
+    settings = strategy["settings"]
+    # Only ruled tables: text-derived column boundaries move from page to page
+    if settings.get("vertical_strategy") != "lines" or settings.get("horizontal_strategy") != "lines":
+        return None
+    try:
+        tables = page.find_tables(table_settings=settings)
+    except Exception as e:
+        logger.debug("Could not learn the table region: %s", e)
+        return None
+    if not tables:
+        return None
+    table = max(tables, key=lambda found: len(found.rows))
+    columns = sorted({round(cell[0], 2) for cell in table.cells} | {round(cell[2], 2) for cell in table.cells})
+    if len(columns) < 2:
+        return None
+    return TableRegion(strategy["name"], tuple(columns))
 
-    # ISO codes appearing in context (lower confidence because it might be part of text)
-    code_candidates = re.findall(r"\b[A-Z]{3}\b", text)
-    for candidate in code_candidates:
-        upper_candidate = candidate.upper()
-        if upper_candidate in COMMON_CURRENCY_CODES:
-            detection_candidates.append((upper_candidate, 0.65, "iso-token"))
 
-    if not detection_candidates:
+def _crop_to_table_region(page, region: TableRegion, settings: Dict):
+    """
+    Returns (cropped page, settings with explicit column lines), or None when the page's vertical
+    rulings don't match the region (other table, cover page, merged cells) and it needs the full search.
+    """
+    tolerance = max(settings.get(key, 3) for key in ("snap_tolerance", "join_tolerance", "intersection_tolerance"))
+    min_length = settings.get("edge_min_length", 1)
+    spans: Dict[float, List[Tuple[float, float]]] = {}
+    for edge in page.vertical_edges:
+        if edge["bottom"] - edge["top"] < min_length:
+            continue
+        if not region.x0 - tolerance <= edge["x0"] <= region.x1 + tolerance:
+            continue
+        column = min(region.columns, key=lambda x: abs(x - edge["x0"]))
+        if abs(column - edge["x0"]) > tolerance:
+            return None
+        spans.setdefault(column, []).append((edge["top"], edge["bottom"]))
+    if len(spans) != len(region.columns):
         return None
 
-    # Return the candidate with highest confidence
-    detection_candidates.sort(key=lambda item: item[1], reverse=True)
-    return detection_candidates[0]
+    # Explicit lines run the full height of the crop, so every column must be ruled continuously over it
+    extents: List[Tuple[float, float]] = []
+    for segments in spans.values():
+        segments.sort()
+        top, bottom = segments[0]
+        for segment_top, segment_bottom in segments[1:]:
+            if segment_top > bottom + tolerance:
+                return None
+            bottom = max(bottom, segment_bottom)
+        extents.append((top, bottom))
+    top = min(extent[0] for extent in extents)
+    bottom = max(extent[1] for extent in extents)
+    if any(abs(extent[0] - top) > tolerance or abs(extent[1] - bottom) > tolerance for extent in extents):
+        return None
 
+    x0, page_top, x1, page_bottom = page.bbox
+    bbox = (
+        max(x0, region.x0 - tolerance),
+        max(page_top, top - tolerance),
+        min(x1, region.x1 + tolerance),
+        min(page_bottom, bottom + tolerance),
+    )
+    return page.crop(bbox), dict(settings, vertical_strategy="explicit", explicit_vertical_lines=list(region.columns))
 
-def extract_transactions_with_pdfplumber(pdf_path: Path) -> Tuple[List[RawTransaction], StatementMetadata]:
-    if pdfplumber is None:
-        logger.warning("pdfplumber is not available")
-        return [], StatementMetadata()
 
-    logger.info("Starting PDF extraction with pdfplumber for: %s", pdf_path.name)
-    metadata = StatementMetadata(source=pdf_path.name)
-    transactions: List[RawTransaction] = []
+class GridTable:
+    """
+    Table built from word boxes by the "grid" engine instead of pdfplumber's table finder.
+
+    Words are binned into text lines by their top coordinate. Lines that start with a date
+    and carry an amount are data lines. Columns are the x ranges between empty vertical
+    strips of an occupancy histogram of the data lines' words. Each data line starts a row;
+    the other lines of the table (wrapped descriptions) join the nearest data line. The
+    header line just above the first data line, when it looks like one, becomes row 0, so
+    rows has the header-first row-of-cells shape _process_table reads from extract_tables.
+    from_words() returns None with a reason when the grid is ambiguous or has no header (the
+    default TableColumns positions only fit pdfplumber's Georgian tables); the page then goes
+    through the table strategies.
+    """
 
-    # Try multiple table extraction strategies
-    table_strategies = [
-        {
-            "name": "lines (strict)",
-            "settings": {
-                "vertical_strategy": "lines",
-                "horizontal_strategy": "lines",
-                "snap_tolerance": 3,
-                "join_tolerance": 3,
-                "edge_min_length": 3,
-                "text_tolerance": 3,
-                "text_strategy": "lines",
-                "intersection_tolerance": 3,
-                "intersection_x_tolerance": 3,
-                "intersection_y_tolerance": 3,
-            }
-        },
-        {
-            "name": "lines (relaxed)",
-            "settings": {
-                "vertical_strategy": "lines",
-                "horizontal_strategy": "lines",
-                "snap_tolerance": 5,
-                "join_tolerance": 5,
-                "edge_min_length": 1,
-                "text_tolerance": 5,
-                "text_strategy": "lines",
-                "intersection_tolerance": 5,
-                "intersection_x_tolerance": 5,
-                "intersection_y_tolerance": 5,
-            }
-        },
-        {
-            "name": "text (explicit)",
-            "settings": {
-                "vertical_strategy": "text",
-                "horizontal_strategy": "text",
-                "snap_tolerance": 3,
-                "join_tolerance": 3,
-            }
-        },
-        {
-            "name": "lines_strict + explicit",
-            "settings": {
-                "vertical_strategy": "lines_strict",
-                "horizontal_strategy": "lines_strict",
-                "snap_tolerance": 3,
-                "join_tolerance": 3,
-            }
-        },
-    ]
+    def __init__(self, rows: List[List[str]], data_lines: int):
+        self.rows = rows
+        # Rows the table should yield; fewer parsed rows means the grid was misread
+        self.data_lines = data_lines
+
+    @classmethod
+    def from_words(cls, words: List[Dict]) -> Tuple[Optional["GridTable"], str]:
+        if not words:
+            return None, "no_words"
+        lines = _grid_lines(words)
+        data_indices = [index for index, line in enumerate(lines) if _is_grid_data_line(line)]
+        if len(data_indices) < GRID_MIN_ROWS:
+            return None, "few_rows"
+        data_lines = [lines[index] for index in data_indices]
+        char_width = float(np.median([(word["x1"] - word["x0"]) / max(1, len(word["text"])) for word in words]))
+        bounds = _grid_column_bounds(data_lines, char_width * GRID_MIN_GAP_CHARS)
+        if len(bounds) + 1 < GRID_MIN_COLUMNS:
+            return None, "few_columns"
+        date_columns = np.searchsorted(bounds, [(line[0]["x0"] + line[0]["x1"]) / 2 for line in data_lines])
+        if np.bincount(date_columns).max() < len(data_lines) * GRID_MIN_AGREEMENT:
+            return None, "irregular"
+
+        tops = [line[0]["top"] for line in lines]
+        pitch = float(np.median(np.diff([tops[index] for index in data_indices])))
+        first, last = data_indices[0], data_indices[-1]
+        # Wrapped text just below the last data line still belongs to its row
+        while last + 1 < len(lines) and tops[last + 1] - tops[last] <= pitch and not _is_grid_data_line(lines[last + 1]):
+            last += 1
+        data_tops = np.array([tops[index] for index in data_indices])
+        members: List[List[List[Dict]]] = [[] for _ in data_indices]
+        for index in range(first, last + 1):
+            # Nearest data line; ties go to the earlier one
+            members[int(np.argmin(np.abs(data_tops - tops[index])))].append(lines[index])
+        rows = [_grid_cells(row_lines, bounds) for row_lines in members]
+
+        header = _grid_header(lines, first, pitch, bounds)
+        if header is None:
+            return None, "no_header"
+        return cls([header] + rows, len(data_indices)), ""
+
+
+def _grid_lines(words: List[Dict]) -> List[List[Dict]]:
+    """Bin word boxes into text lines by top coordinate, top to bottom, each line sorted by x."""
+    tops = np.array([word["top"] for word in words])
+    heights = np.array([word["bottom"] - word["top"] for word in words])
+    order = np.argsort(tops, kind="stable")
+    tolerance = max(1.0, float(np.median(heights)) * 0.5)
+    breaks = np.flatnonzero(np.diff(tops[order]) > tolerance) + 1
+    return [sorted((words[index] for index in chunk), key=lambda word: word["x0"]) for chunk in np.split(order, breaks)]
+
+
+def _is_grid_data_line(line: List[Dict]) -> bool:
+    text = " ".join(word["text"] for word in line)
+    match = PAGE_DATE_PATTERN.match(text)
+    return bool(match) and bool(NUMBER_PATTERN.search(text, match.end()))
+
+
+def _grid_column_bounds(data_lines: List[List[Dict]], min_gap: float) -> "np.ndarray":
+    """x positions splitting columns: middles of the empty strips at least `min_gap` wide among the data lines."""
+    boxes = np.array([(word["x0"], word["x1"]) for line in data_lines for word in line])
+    origin = boxes[:, 0].min()
+    start = np.floor((boxes[:, 0] - origin) * GRID_RESOLUTION).astype(np.int64)
+    end = np.ceil((boxes[:, 1] - origin) * GRID_RESOLUTION).astype(np.int64)
+    coverage = np.zeros(int(end.max()) + 2, dtype=np.int64)
+    np.add.at(coverage, start, 1)
+    np.add.at(coverage, end, -1)
+    occupied = (np.cumsum(coverage) > 0).astype(np.int8)
+    steps = np.diff(occupied)
+    gap_starts = np.flatnonzero(steps == -1) + 1
+    gap_ends = np.flatnonzero(steps == 1) + 1
+    # The strip right of the last word never ends, so zip() drops it
+    gaps = [(first, last) for first, last in zip(gap_starts, gap_ends) if (last - first) / GRID_RESOLUTION >= min_gap]
+    return np.array([origin + (first + last) / 2 / GRID_RESOLUTION for first, last in gaps])
+
+
+def _grid_cells(lines: List[List[Dict]], bounds: "np.ndarray") -> List[str]:
+    """Cell texts of one grid row: words joined by spaces within a line and by newlines across lines."""
+    cells: List[List[str]] = [[] for _ in range(len(bounds) + 1)]
+    for line in lines:
+        columns = np.searchsorted(bounds, [(word["x0"] + word["x1"]) / 2 for word in line])
+        parts: Dict[int, List[str]] = {}
+        for column, word in zip(columns.tolist(), line):
+            parts.setdefault(column, []).append(word["text"])
+        for column, texts in parts.items():
+            cells[column].append(" ".join(texts))
+    return ["\n".join(parts) for parts in cells]
+
+
+def _grid_header(lines: List[List[Dict]], first_data: int, pitch: float, bounds: "np.ndarray") -> Optional[List[str]]:
+    """Header cells from the line above the first data line (and a tightly set line above that), if they look like one."""
+    below = first_data - 1
+    if below < 0 or lines[first_data][0]["top"] - lines[below][0]["top"] > pitch * 2:
+        return None
+    header_lines = [lines[below]]
+    above = below - 1
+    line_height = max(word["bottom"] - word["top"] for word in lines[below])
+    if above >= 0 and lines[below][0]["top"] - lines[above][0]["top"] <= line_height * 1.5:
+        header_lines.insert(0, lines[above])
+    for candidate in (header_lines, header_lines[-1:]):
+        cells = _grid_cells(candidate, bounds)
+        if _looks_like_header(" ".join(cells).lower()):
+            return cells
+    return None
 
-    try:  # pragma: no cover - requires runtime dependency
-        with pdfplumber.open(pdf_path) as pdf:
-            total_pages = len(pdf.pages)
-            logger.info("Opened %s with %d pages (processing all pages)", pdf_path.name, total_pages)
-            
-            # First, get some diagnostic info about the PDF
-            if len(pdf.pages) > 0:
-                first_page = pdf.pages[0]
-                text_sample = first_page.extract_text()
-                if text_sample:
-                    # Show first 200 chars to understand PDF structure
-                    preview = text_sample[:200].replace('\n', ' ').strip()
-                    logger.info("Page 1 text preview: %s...", preview)
-                    currency_hint = detect_currency_from_text(text_sample)
-                    if currency_hint:
-                        metadata.currency = currency_hint[0]
-                        metadata.currency_confidence = currency_hint[1]
-                        metadata.currency_detection_method = currency_hint[2]
-                else:
-                    logger.warning("Page 1: No text extracted - PDF might be image-based or encrypted")
+
+def _grid_columns_agree(rows: List[List[str]], columns: TableColumns, classifier: "CellClassifier") -> bool:
+    """
+    Whether the header's date, debit and credit columns hold what the data lines do there.
+
+    The header is split at bounds learned from the data lines alone, so a header word can land
+    in the next column ("ბრუნვა (კრ)" read as "ბრუნვა" | "(კრ) ნაშთი") and point credit at the
+    balance. Then the row count still adds up and only the amounts are wrong, so besides the
+    column kinds (see _TableSchema) this checks that debit and credit are never both filled
+    on the same line, which the running balance always is.
+    """
+    schema = _TableSchema.infer(rows, columns, classifier, sample_rows=len(rows))
+    if schema is None or max(columns.date, columns.debit, columns.credit) >= schema.width:
+        return False
+    if schema.kinds[columns.date] != "date":
+        return False
+    if any(schema.kinds[idx] not in ("amount", "empty") for idx in (columns.debit, columns.credit)):
+        return False
+    if columns.debit == columns.credit:
+        return True
+    both = sum(
+        1 for cells in rows
+        if len(cells) == schema.width
+        and classifier.classify(_clean_cell_text(cells[columns.debit])).amount
+        and classifier.classify(_clean_cell_text(cells[columns.credit])).amount
+    )
+    return both <= len(rows) * (1 - GRID_MIN_AGREEMENT)
+
+
+def _table_engine_uses_grid(engine: str) -> bool:
+    """Whether a page should try the grid engine first; unknown engines and a missing NumPy mean no."""
+    engine = (engine or "").strip().lower()
+    if engine not in TABLE_ENGINES:
+        logger.warning("Unknown table engine '%s', using pdfplumber (expected one of %s)", engine, ", ".join(TABLE_ENGINES))
+        return False
+    if engine == GRID_STRATEGY and np is None:
+        logger.warning("The grid table engine needs NumPy, which is not installed; using pdfplumber")
+        return False
+    return engine == GRID_STRATEGY
+
+
+def _extract_grid_rows(document: ParsedDocument, page_index: int, scan: "_StrategyScan") -> List[RawTransaction]:
+    """Run the grid engine on one page; an empty list sends the page through the table strategies."""
+    stats = document.stats
+    with stats.timed(STRATEGY_STAGE_PREFIX + GRID_STRATEGY):
+        grid, reason = GridTable.from_words(document.page_words(page_index))
+    page_transactions: List[RawTransaction] = []
+    if grid is not None:
+        # The grid's columns are its own (empty columns vanish), so always detect them from its header
+        columns = _detect_table_columns(grid.rows[0])
+        if not _grid_columns_agree(grid.rows[1:], columns, document.cells):
+            reason = "columns_disagree"
+        else:
+            _process_page_tables([grid.rows], page_index, GRID_STRATEGY, page_transactions, columns, document.cells, stats)
+            if len(page_transactions) < grid.data_lines * GRID_MIN_AGREEMENT:
+                reason = "rows_lost"
+    if reason:
+        stats.count(f"grid_fallback_{reason}")
+        if stats.trace:
+            logger.info("Page %d: grid engine fell back to the table strategies (%s)", page_index, reason.replace("_", " "))
+        return []
+    stats.count(f"strategy:{GRID_STRATEGY}")
+    scan.record_page(GRID_STRATEGY, len(page_transactions), None)
+    return page_transactions
+
+
+def _extract_strategy_tables(page, strategy: Dict, scan: "_StrategyScan", stats: "ExtractionStats") -> List[List[List]]:
+    region = scan.region
+    if region is not None and region.strategy == strategy["name"]:
+        cropped = _crop_to_table_region(page, region, strategy["settings"])
+        if cropped is not None:
+            stats.count("pages_cropped")
+            cropped_page, settings = cropped
+            with stats.timed(STRATEGY_STAGE_PREFIX + strategy["name"]):
+                return cropped_page.extract_tables(table_settings=settings)
+        stats.count("crop_fallbacks")
+    with stats.timed(STRATEGY_STAGE_PREFIX + strategy["name"]):
+        return page.extract_tables(table_settings=strategy["settings"])
+
+
+def _run_table_strategies(
+    page,
+    page_index: int,
+    strategies: List[Dict],
+    scan: _StrategyScan,
+    classifier: Optional["CellClassifier"] = None,
+    stats: Optional[ExtractionStats] = None,
+) -> Tuple[List[RawTransaction], bool]:
+    """Try strategies in order until one yields rows. Returns (rows, whether any tables were found)."""
+    stats = stats or ExtractionStats()
+    page_transactions: List[RawTransaction] = []
+    tables_found = False
+
+    # Try each extraction strategy
+    for strategy in strategies:
+        try:
+            tables = _extract_strategy_tables(page, strategy, scan, stats)
+            stats.count(f"strategy:{strategy['name']}")
+            if stats.trace:
+                logger.info("Page %d: strategy '%s' extracted %d tables", page_index, strategy["name"], len(tables))
             
-            for page_index, page in enumerate(pdf.pages, start=1):
-                tables_found = False
-                transactions_before_page = len(transactions)
-                
-                # Try each extraction strategy
-                for strategy in table_strategies:
-                    try:
-                        tables = page.extract_tables(table_settings=strategy["settings"])
-                        logger.info("Page %d: strategy '%s' extracted %d tables", page_index, strategy["name"], len(tables))
-                        
-                        if tables and len(tables) > 0:
-                            tables_found = True
-                            # Process tables with this strategy
-                            for table_index, table in enumerate(tables, start=1):
-                                if not table or len(table) <= 1:
-                                    continue
-                                
-                                # Log table structure for debugging
-                                logger.info("Page %d table %d (strategy: %s): %d rows, %d columns", 
-                                          page_index, table_index, strategy["name"], len(table), len(table[0]) if table else 0)
-                                
-                                # Show header row if available
-                                if table and len(table) > 0:
-                                    header_preview = " | ".join(str(cell)[:20] if cell else "" for cell in table[0][:5])
-                                    logger.info("Page %d table %d header: %s", page_index, table_index, header_preview)
-                                
-                                # Process this table
-                                processed = _process_table(table, page_index, table_index, transactions)
-                                if processed > 0:
-                                    logger.info("Page %d table %d: successfully processed %d transaction rows (total now: %d)", 
-                                              page_index, table_index, processed, len(transactions))
-                            
-                            # If we found and processed tables, no need to try other strategies
-                            if tables_found and len(transactions) > 0:
-                                break
-                    except Exception as e:
-                        logger.debug("Page %d: strategy '%s' failed: %s", page_index, strategy["name"], str(e))
-                        continue
+            if tables and len(tables) > 0:
+                tables_found = True
+                columns = _process_page_tables(
+                    tables, page_index, strategy["name"], page_transactions, scan.columns, classifier, stats
+                )
                 
-                # Log page summary
-                transactions_added = len(transactions) - transactions_before_page
-                if transactions_added > 0:
-                    logger.info("Page %d: Added %d transactions (total: %d)", page_index, transactions_added, len(transactions))
-                
-                if not tables_found:
-                    logger.warning("Page %d: No tables found with any extraction strategy", page_index)
-                    # Try to extract text and see if we can find transaction-like patterns
-                    page_text = page.extract_text()
-                    if page_text:
-                        # Look for date patterns in the text
-                        date_patterns = re.findall(r'\d{1,2}[./-]\d{1,2}[./-]\d{2,4}', page_text)
-                        if date_patterns:
-                            logger.info("Page %d: Found %d date-like patterns in text (but no tables extracted)", 
-                                      page_index, len(date_patterns))
-                            logger.debug("Sample dates found: %s", ", ".join(date_patterns[:5]))
-                    
-    except Exception as e:  # pragma: no cover
-        logger.error("Exception during PDF extraction: %s", str(e))
-        traceback.print_exc()
-        return [], metadata
+                # If this strategy produced rows for the page, no need to try other strategies.
+                # The check is page-local so a page gives the same rows whether it is
+                # processed sequentially or inside a parallel worker.
+                if page_transactions:
+                    scan.record_page(strategy["name"], len(page_transactions), columns)
+                    scan.learn_region(page, strategy)
+                    break
+        except Exception as e:
+            logger.debug("Page %d: strategy '%s' failed: %s", page_index, strategy["name"], str(e))
+            continue
 
-    # Only use text-based extraction if table-based extraction found no transactions
-    # Table-based extraction is more reliable, so we prefer it when it finds transactions
-    if not transactions:
-        logger.info("No transactions found via table extraction, trying text-based extraction")
-        text_based_rows = _extract_transactions_from_text(pdf_path)
-        if text_based_rows:
-            logger.info("Text-based extraction found %d transactions", len(text_based_rows))
-            transactions = text_based_rows
-    else:
-        logger.info("Using table-based extraction results (%d transactions found)", len(transactions))
+    return page_transactions, tables_found
+
+
+def _probe_table_strategies(
+    page,
+    page_index: int,
+    scan: _StrategyScan,
+    classifier: Optional["CellClassifier"] = None,
+    stats: Optional[ExtractionStats] = None,
+) -> Tuple[List[RawTransaction], bool]:
+    """Run every strategy on a probe page; keep the rows of the first productive one, as the ordinary search would."""
+    stats = stats or ExtractionStats()
+    candidates: Dict[str, List[RawTransaction]] = {}
+    candidate_columns: Dict[str, Optional[TableColumns]] = {}
+    tables_found = False
+    for strategy in TABLE_STRATEGIES:
+        try:
+            with stats.timed(STRATEGY_STAGE_PREFIX + strategy["name"]):
+                tables = page.extract_tables(table_settings=strategy["settings"])
+            stats.count(f"strategy:{strategy['name']}")
+            if stats.trace:
+                logger.info("Page %d: probing strategy '%s' extracted %d tables", page_index, strategy["name"], len(tables))
+        except Exception as e:
+            logger.debug("Page %d: strategy '%s' failed: %s", page_index, strategy["name"], str(e))
+            continue
+        if not tables:
+            continue
+        tables_found = True
+        rows: List[RawTransaction] = []
+        columns = _process_page_tables(tables, page_index, strategy["name"], rows, scan.columns, classifier, stats)
+        if rows:
+            candidates[strategy["name"]] = rows
+            candidate_columns[strategy["name"]] = columns
+
+    scan.record_probe(page_index, candidates)
+    if not candidates:
+        return [], tables_found
+    # Dicts keep insertion order, and candidates were added in TABLE_STRATEGIES order
+    first = next(iter(candidates))
+    scan.record_page(first, len(candidates[first]), candidate_columns[first])
+    scan.learn_region(page, next(strategy for strategy in TABLE_STRATEGIES if strategy["name"] == first))
+    return candidates[first], tables_found
+
+
+def _process_page_tables(
+    tables: List[List[List]],
+    page_index: int,
+    strategy_name: str,
+    page_transactions: List[RawTransaction],
+    columns: Optional[TableColumns] = None,
+    classifier: Optional["CellClassifier"] = None,
+    stats: Optional[ExtractionStats] = None,
+) -> Optional[TableColumns]:
+    """Process every table on a page. Returns the header-derived columns of the first productive table."""
+    stats = stats or ExtractionStats()
+    detected_columns: Optional[TableColumns] = None
+    # Process tables with this strategy
+    for table_index, table in enumerate(tables, start=1):
+        if not table or len(table) <= 1:
+            continue
+        stats.count("tables")
+        
+        # Log table structure and header row for debugging
+        if stats.trace:
+            logger.info("Page %d table %d (strategy: %s): %d rows, %d columns", 
+                      page_index, table_index, strategy_name, len(table), len(table[0]) if table else 0)
+            header_preview = " | ".join(str(cell)[:20] if cell else "" for cell in table[0][:5])
+            logger.info("Page %d table %d header: %s", page_index, table_index, header_preview)
+        
+        # Process this table. Known columns only stand in for header detection, so
+        # header-less tables keep the default positions either way.
+        table_columns = None
+        if _table_has_header(table):
+            table_columns = columns or _detect_table_columns(table[0])
+        with stats.timed("table"):
+            processed = _process_table(table, page_index, table_index, page_transactions, table_columns, classifier, stats)
+        if processed > 0:
+            if stats.trace:
+                    logger.info("Page %d table %d: successfully processed %d transaction rows (total now: %d)", 
+                          page_index, table_index, processed, len(page_transactions))
+            if detected_columns is None:
+                detected_columns = table_columns
+    return detected_columns
+
+
+def _extract_page_tables(
+    document: ParsedDocument,
+    page_index: int,
+    scan: Optional[_StrategyScan] = None,
+) -> List[RawTransaction]:
+    """Run the table strategies on one page and return the rows they produced."""
+    scan = scan or _StrategyScan()
+    page = document.page(page_index)
+    digest: Optional[str] = None
+    if scan.screen is not None:
+        skip_reason, digest = _screen_page(page, scan.screen)
+        if skip_reason:
+            document.stats.count(f"pages_skipped_{skip_reason}")
+            if document.stats.trace:
+                logger.info("Page %d: skipped before table extraction (%s)", page_index, skip_reason.replace("_", " "))
+            return []
+    page_transactions: List[RawTransaction] = []
+    tables_found = False
+    if scan.grid:
+        page_transactions = _extract_grid_rows(document, page_index, scan)
+        tables_found = bool(page_transactions)
+    if not page_transactions and scan.probing:
+        page_transactions, tables_found = _probe_table_strategies(page, page_index, scan, document.cells, document.stats)
+    elif not page_transactions:
+        page_transactions, tables_found = _run_table_strategies(
+            page, page_index, scan.strategies_for_page(), scan, document.cells, document.stats
+        )
+        if scan.undershoots(len(page_transactions)):
+            logger.info(
+                "Page %d: locked strategy '%s' yielded %d rows, running full search",
+                page_index, scan.locked, len(page_transactions),
+            )
+            fallback_rows, fallback_tables = _run_table_strategies(
+                page, page_index, scan.fallback_strategies(), scan, document.cells, document.stats
+            )
+            if len(fallback_rows) > len(page_transactions):
+                page_transactions = fallback_rows
+            tables_found = tables_found or fallback_tables
+    
+    # Log page summary
+    if page_transactions and document.stats.trace:
+        logger.info("Page %d: Added %d transactions", page_index, len(page_transactions))
+    
+    if digest is not None and not page_transactions:
+        # Every strategy has run by now (probe, full search, or locked plus fallback); a page the
+        # text fallback can still read rows from is not boilerplate either
+        if not _parse_statement_lines([document.page_text(page_index)], document.dates):
+            scan.boilerplate_digests.append(digest)
+
+    if not tables_found:
+        document.stats.count("pages_without_tables")
+    if not tables_found and document.stats.trace:
+        logger.warning("Page %d: No tables found with any extraction strategy", page_index)
+        # Try to extract text and see if we can find transaction-like patterns
+        page_text = document.page_text(page_index)
+        if page_text:
+            # Look for date patterns in the text
+            date_patterns = DATE_LIKE_PATTERN.findall(page_text)
+            if date_patterns:
+                logger.info("Page %d: Found %d date-like patterns in text (but no tables extracted)", 
+                          page_index, len(date_patterns))
+                logger.debug("Sample dates found: %s", ", ".join(date_patterns[:5]))
+
+    return page_transactions
+
+
+def _iter_page_range(
+    document: ParsedDocument,
+    first_page: int,
+    last_page: int,
+    scan: Optional[_StrategyScan] = None,
+) -> Iterator[Tuple[int, List[RawTransaction]]]:
+    """Yield (page_index, rows) for the 1-based inclusive page range of an open document."""
+    scan = scan or _StrategyScan()
+    for page_index in range(first_page, last_page + 1):
+        with document.stats.timed("page"):
+            page_rows = _extract_page_tables(document, page_index, scan)
+        document.finish_page(page_index)
+        yield page_index, page_rows
+
+
+def _should_extract_in_parallel(total_pages: int, options: ExtractionOptions) -> bool:
+    return _resolve_worker_count(options.workers) > 1 and total_pages >= options.parallel_min_pages
+
+
+def _resolve_worker_count(workers: int) -> int:
+    # 0 (or a negative value) means "one worker per CPU core"
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def _chunk_page_ranges(
+    total_pages: int,
+    workers: int,
+    pages_per_chunk: Optional[int] = None,
+    first_page: int = 1,
+) -> List[Tuple[int, int]]:
+    """Split first_page..total_pages into contiguous inclusive ranges for the worker pool."""
+    page_count = total_pages - first_page + 1
+    if page_count <= 0:
+        return []
+    if not pages_per_chunk or pages_per_chunk <= 0:
+        # Two chunks per worker keeps the pool busy when some pages are much denser than others
+        pages_per_chunk = max(1, -(-page_count // (workers * 2)))
+    return [
+        (first, min(first + pages_per_chunk - 1, total_pages))
+        for first in range(first_page, total_pages + 1, pages_per_chunk)
+    ]
 
-    logger.info("PDF extraction completed: found %d transactions", len(transactions))
-    return transactions, metadata
+
+@dataclass
+class _PageRangeResult:
+    pages: List[Tuple[int, List[RawTransaction]]]
+    # Worker tallies folded back into the parent's _StrategyScan
+    strategy_rows: Dict[str, int]
+    learned_columns: Optional[TableColumns]
+    # Page texts the worker already extracted, reused by the parent's text fallback
+    page_texts: Dict[int, str]
+    peak_rss_mb: Optional[float] = None
+    # ExtractionStats counters, merged into the parent document's
+    counters: Optional[Dict[str, int]] = None
+    # Digests of the worker's pages that yielded no rows, added to the parent's _StrategyScan
+    boilerplate_digests: Optional[List[str]] = None
+    # Currency evidence from the worker's table cells, merged into the parent's detector
+    currency: Optional[CurrencyDetector] = None
+    # ExtractionStats stage timings, merged with the counters
+    timings: Optional[Dict[str, List[float]]] = None
+
+
+def _extract_page_range_worker(
+    pdf_path: str,
+    first_page: int,
+    last_page: int,
+    lock_in: bool = False,
+    probe_pages: int = 2,
+    locked_strategy: Optional[str] = None,
+    columns: Optional[TableColumns] = None,
+    low_memory: bool = False,
+    rss_ceiling_mb: Optional[float] = None,
+    trace: bool = True,
+    crop_tables: bool = False,
+    screen: Optional[PageScreen] = None,
+    grid: bool = False,
+    expected_rows: Optional[float] = None,
+) -> _PageRangeResult:
+    """Process-pool entry point: open the PDF independently and extract one page range."""
+    scan = _StrategyScan(lock_in, probe_pages, locked_strategy, columns, crop_tables, screen, grid, expected_rows)
+    with ParsedDocument.open(Path(pdf_path), low_memory, rss_ceiling_mb) as document:
+        document.stats.trace = trace
+        pages = list(_iter_page_range(document, first_page, last_page, scan))
+        page_texts = document.cached_texts()
+        peak_rss_mb = document.memory.peak_mb
+    return _PageRangeResult(
+        pages,
+        scan.strategy_rows,
+        scan.learned_columns,
+        page_texts,
+        peak_rss_mb,
+        document.stats.counters,
+        scan.boilerplate_digests,
+        document.currency,
+        document.stats.timings,
+    )
+
+
+def _iter_pages_in_parallel(
+    document: ParsedDocument,
+    options: ExtractionOptions,
+    scan: _StrategyScan,
+) -> Iterator[Tuple[int, List[RawTransaction]]]:
+    """Yield (page_index, rows) in page order while page ranges are extracted by a process pool."""
+    total_pages = document.page_count
+    first_pooled_page = 1
+    # Probe pages run here so every worker starts with the same locked strategy
+    while scan.probing and first_pooled_page <= total_pages:
+        with document.stats.timed("page"):
+            page_rows = _extract_page_tables(document, first_pooled_page, scan)
+        document.finish_page(first_pooled_page)
+        yield first_pooled_page, page_rows
+        first_pooled_page += 1
+
+    workers = _resolve_worker_count(options.workers)
+    ranges = _chunk_page_ranges(total_pages, workers, options.pages_per_chunk, first_pooled_page)
+    if not ranges:
+        return
+    workers = min(workers, len(ranges))
+    logger.info("Extracting %d pages in parallel: %d workers, %d page ranges", total_pages, workers, len(ranges))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                _extract_page_range_worker,
+                str(document.path),
+                first,
+                last,
+                scan.lock_in,
+                options.strategy_probe_pages,
+                scan.locked,
+                scan.columns,
+                document.low_memory,
+                document.memory.ceiling_mb,
+                document.stats.trace,
+                scan.crop_tables,
+                scan.screen,
+                scan.grid,
+                scan.expected_rows,
+            )
+            for first, last in ranges
+        ]
+        # Consume futures in submission order so rows are merged back in page order
+        for future in futures:
+            result = future.result()
+            scan.merge(result.strategy_rows, result.learned_columns)
+            document.add_cached_texts(result.page_texts)
+            document.stats.merge(result.counters or {}, result.timings)
+            scan.boilerplate_digests.extend(result.boilerplate_digests or [])
+            if result.currency is not None:
+                document.currency.merge(result.currency)
+            document.worker_peak_rss_mb = max(document.worker_peak_rss_mb or 0.0, result.peak_rss_mb or 0.0) or None
+            yield from result.pages
 
 
 def _clean_cell_text(value: Optional[str]) -> str:
     if not value:
         return ""
-    return re.sub(r"\s+", " ", value.replace("\xa0", " ")).strip()
+    # \s covers the non-breaking spaces pdfplumber leaves in cells
+    return WHITESPACE_PATTERN.sub(" ", value).strip()
 
 
 def _looks_like_time(value: str) -> bool:
     stripped = value.strip()
-    return bool(re.fullmatch(r"\d{1,2}:\d{2}(:\d{2})?", stripped))
+    return bool(TIME_PATTERN.fullmatch(stripped))
 
 
 def _is_masked_value(value: str) -> bool:
     if not value:
         return False
     normalized = value.replace(" ", "")
-    return bool(re.fullmatch(r"\*{2,}\d{2,}", normalized))
-
-
-def _collect_description_from_cells(cells: List[str]) -> str:
-    parts: List[str] = []
-    for cell in cells:
-        text = _clean_cell_text(cell)
-        if not text:
-            continue
-        if parse_date(text):
-            continue
-        if _looks_like_time(text):
-            continue
-        if parse_amount([text]):
-            continue
-        if _is_masked_value(text):
-            continue
-        # Skip cells that are purely numeric identifiers (6+ digits)
-        numeric_only = text.replace(" ", "")
-        if numeric_only.isdigit() and len(numeric_only) >= 6:
-            continue
-        parts.append(text)
-    deduped: List[str] = []
-    seen: set[str] = set()
-    for part in parts:
-        lowered = part.lower()
-        if lowered in seen:
-            continue
-        seen.add(lowered)
-        deduped.append(part)
-    return " ".join(deduped).strip()
+    return bool(MASKED_VALUE_PATTERN.fullmatch(normalized))
 
 
 def _line_starts_with_date(value: str) -> bool:
     stripped = value.strip()
-    return bool(re.match(r"^\d{1,2}[./-]\d{1,2}[./-]\d{2,4}", stripped))
+    return bool(DATE_PREFIX_PATTERN.match(stripped))
 
 
 def _strip_date_prefix(value: str) -> str:
     stripped = value.strip()
-    match = re.match(
-        r"^\d{1,2}[./-]\d{1,2}[./-]\d{2,4}\s*(\d{2}:\d{2})?\s*(\d{6,})?\s*(.*)$",
-        stripped,
-    )
+    match = DATE_PREFIX_REMAINDER_PATTERN.match(stripped)
     if match:
         remainder = match.group(3) or ""
         return remainder.strip()
@@ -680,15 +3252,9 @@ def _strip_date_prefix(value: str) -> str:
 def _normalize_description(value: str) -> str:
     if not value:
         return "Imported transaction"
-    text = re.sub(r"\s+", " ", value).strip()
-    text = re.sub(r"^\d{4,}\s+", "", text)
-    text = re.sub(r"\bоперация по карте\s+\*+\d+\b", "", text, flags=re.IGNORECASE)
-    text = re.sub(r"\bоперация по карте\b", "", text, flags=re.IGNORECASE)
-    text = re.sub(r"\bкарте\s+\*+\d+\b", "", text, flags=re.IGNORECASE)
-    text = re.sub(r"Продолжение на следующей странице.*", "", text, flags=re.IGNORECASE)
-    text = re.sub(r"Для проверки подлинности.*", "", text, flags=re.IGNORECASE)
-    text = re.sub(r"В ВАЛЮТЕ СЧЁТА.*", "", text, flags=re.IGNORECASE)
-    text = re.sub(r"\s+", " ", text).strip(" -")
+    text = WHITESPACE_PATTERN.sub(" ", value).strip()
+    text = DESCRIPTION_NOISE_PATTERN.sub("", DESCRIPTION_PREFIX_NOISE_PATTERN.sub("", text))
+    text = WHITESPACE_PATTERN.sub(" ", text).strip(" -")
     return text or "Imported transaction"
 
 
@@ -741,30 +3307,146 @@ DEBIT_KEYWORDS = (
     "cash withdrawal",
 )
 
-NUMBER_PATTERN = re.compile(r"[+-]?\d[\d\s]*[.,]\d{2}")
+# Header cell keywords per column, matched as substrings of the lowercased cell
+COLUMN_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "date": ("date", "дата", "თარიღი"),
+    # Includes the Georgian "ბრუნვა (დებ)" pattern
+    "debit": ("debit", "дебет", "დებეტი", "out", "გასავალი", "დებ"),
+    # Includes the Georgian "ბრუნვა (კრ)" pattern
+    "credit": ("credit", "кредит", "კრედიტი", "in", "შემოსავალი", "კრ"),
+    "description": (
+        "description", "описание", "აღწერა", "operation", "операция", "ოპერაცია", "details", "დეტალები", "დანიშნულება",
+    ),
+}
 
 
-def _looks_like_header(text: str) -> bool:
-    lowered = text.lower()
-    return any(keyword in lowered for keyword in HEADER_KEYWORDS)
+class KeywordMatcher:
+    """
+    Labels a string with every keyword class it contains in one left-to-right scan.
+
+    The keywords of all classes go into one trie, built once, which is emitted as a
+    prefix-factored regular expression: the regex engine then walks the trie in C instead
+    of the text being searched once per keyword. As in Aho-Corasick, each keyword carries
+    the classes of every keyword it contains, so a match stands for everything inside it;
+    after a keyword whose tail can start another keyword, the scan resumes one character
+    past the match start so overlapping keywords are still seen. Matching is on the
+    lowercased text, like the `keyword in text.lower()` checks it replaces.
+
+    matches() asks about a single class and runs that class's own, smaller trie: the
+    combined one would also stop on every keyword of the other classes. hits() counts the
+    distinct keywords of one class in the text, like summing `keyword in text` over them.
+    """
+
+    def __init__(self, classes: Dict[str, Iterable[str]]):
+        self.classes = tuple(classes)
+        self._bits = {label: 1 << index for index, label in enumerate(self.classes)}
+        self._all = (1 << len(self.classes)) - 1
+        keywords: Dict[str, int] = {}
+        for label, words in classes.items():
+            for word in words:
+                keywords[word.lower()] = keywords.get(word.lower(), 0) | self._bits[label]
+        # Output sets: a keyword also reports every class whose keywords occur inside it
+        self._masks = {
+            keyword: _keyword_mask(keyword, keywords) for keyword in keywords
+        }
+        self._overlapping = frozenset(
+            keyword for keyword in keywords
+            if any(other.startswith(keyword[start:]) for start in range(1, len(keyword)) for other in keywords)
+        )
+        # Keywords occurring inside each keyword (itself included), for hits()
+        self._contained = {
+            keyword: frozenset(other for other in keywords if other in keyword) for keyword in keywords
+        }
+        trie: Dict[str, Dict] = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        self._pattern = re.compile(_trie_pattern(trie)) if keywords else None
+        self._per_class = (
+            {label: KeywordMatcher({label: words}) for label, words in classes.items()} if len(classes) > 1 else {}
+        )
 
+    def _scan(self, text: str, wanted: int) -> int:
+        """Bitmask of the classes found; stops early once every class in `wanted` is found."""
+        found = 0
+        if self._pattern is None or not text:
+            return found
+        lowered = text.lower()
+        search = self._pattern.search
+        position = 0
+        while found & wanted != wanted:
+            match = search(lowered, position)
+            if match is None:
+                break
+            keyword = match.group()
+            found |= self._masks[keyword]
+            position = match.start() + 1 if keyword in self._overlapping else match.end()
+        return found
+
+    def labels(self, text: str, stop_at: Optional[str] = None) -> FrozenSet[str]:
+        """Every class with a keyword in `text`, or the ones seen up to the first `stop_at` keyword."""
+        found = self._scan(text, self._bits[stop_at] if stop_at else self._all)
+        return frozenset(label for label in self.classes if found & self._bits[label])
+
+    def matches(self, text: str, label: str) -> bool:
+        matcher = self._per_class.get(label, self)
+        return bool(matcher._scan(text, matcher._bits[label]))
+
+    def hits(self, text: str, label: str) -> int:
+        """Number of distinct `label` keywords in `text`."""
+        matcher = self._per_class.get(label, self)
+        if matcher._pattern is None or not text:
+            return 0
+        lowered = text.lower()
+        search = matcher._pattern.search
+        found: Set[str] = set()
+        position = 0
+        while True:
+            match = search(lowered, position)
+            if match is None:
+                break
+            keyword = match.group()
+            found |= matcher._contained[keyword]
+            position = match.start() + 1 if keyword in matcher._overlapping else match.end()
+        return len(found)
+
+
+def _keyword_mask(keyword: str, keywords: Dict[str, int]) -> int:
+    mask = 0
+    for other, other_mask in keywords.items():
+        if other in keyword:
+            mask |= other_mask
+    return mask
+
+
+def _trie_pattern(node: Dict[str, Dict]) -> str:
+    # Children are tried before the end of a keyword, so the longest keyword at a position wins
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    return f"(?:{body})?" if "" in node else body
 
-def _description_indicates_credit(text: str) -> bool:
-    lowered = text.lower()
-    return any(keyword in lowered for keyword in CREDIT_KEYWORDS)
 
+TRANSACTION_KEYWORDS = KeywordMatcher({"header": HEADER_KEYWORDS, "credit": CREDIT_KEYWORDS, "debit": DEBIT_KEYWORDS})
+TABLE_COLUMN_KEYWORDS = KeywordMatcher(COLUMN_KEYWORDS)
 
-def _description_indicates_debit(text: str) -> bool:
-    lowered = text.lower()
-    return any(keyword in lowered for keyword in DEBIT_KEYWORDS)
+
+def _looks_like_header(text: str) -> bool:
+    return TRANSACTION_KEYWORDS.matches(text, "header")
 
 
-def _parse_text_transaction_line(line: str) -> Optional[Tuple[str, str, float]]:
-    match = re.match(r"(?P<date>\d{2}\.\d{2}\.\d{4})(?:\s+(?P<time>\d{2}:\d{2}))?\s+(?P<body>.+)", line)
+def _parse_text_transaction_line(
+    line: str,
+    dates: Optional[DateFormatLearner] = None,
+) -> Optional[Tuple[str, str, float]]:
+    match = TEXT_TRANSACTION_LINE_PATTERN.match(line)
     if not match:
         return None
     date_raw = match.group("date")
-    date_value = parse_date(date_raw)
+    date_value = dates.parse(date_raw) if dates else parse_date(date_raw)
     if not date_value:
         return None
     body = match.group("body").strip()
@@ -781,12 +3463,12 @@ def _parse_text_transaction_line(line: str) -> Optional[Tuple[str, str, float]]:
         meta_text = "Imported transaction"
     if amount_text.strip().startswith("+"):
         amount = abs(amount_value)
-    elif amount_value < 0 or _description_indicates_debit(meta_text):
+    elif amount_value < 0:
         amount = -abs(amount_value)
-    elif _description_indicates_credit(meta_text):
-        amount = abs(amount_value)
     else:
-        amount = -abs(amount_value)
+        # Debit wording wins over credit wording; neither means a debit
+        labels = TRANSACTION_KEYWORDS.labels(meta_text, stop_at="debit")
+        amount = abs(amount_value) if "credit" in labels and "debit" not in labels else -abs(amount_value)
     return date_value, meta_text, amount
 
 
@@ -801,64 +3483,81 @@ def _finalize_pending_transaction(pending: _PendingTextTransaction) -> RawTransa
     return pending.record
 
 
-def _extract_transactions_from_text(pdf_path: Path) -> List[RawTransaction]:
-    text_transactions: List[RawTransaction] = []
-    pending: Optional[_PendingTextTransaction] = None
+def _extract_transactions_from_text(pdf_path: Path, document: Optional[ParsedDocument] = None) -> List[RawTransaction]:
+    """Parse statement lines from the page text; reuses `document`'s cached text when given."""
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            total_pages = len(pdf.pages)
-            logger.info("Text-based extraction: processing all %d pages", total_pages)
-            for page in pdf.pages:
-                page_text = page.extract_text() or ""
-                for raw_line in page_text.splitlines():
-                    line = raw_line.strip()
-                    if not line:
-                        continue
-                    parsed = _parse_text_transaction_line(line)
-                    if parsed:
-                        if pending:
-                            text_transactions.append(_finalize_pending_transaction(pending))
-                        date_value, meta_text, amount = parsed
-                        meta_clean = meta_text.strip()
-                        pending = _PendingTextTransaction(
-                            record=RawTransaction(
-                                date=date_value,
-                                description=meta_clean or "Imported transaction",
-                                amount=amount,
-                            ),
-                            meta_parts=[meta_clean] if meta_clean else [],
-                            detail_parts=[],
-                        )
-                        continue
-
-                    if pending is None:
-                        continue
-
-                    if _looks_like_header(line):
-                        continue
-
-                    if _is_masked_value(line):
-                        continue
-
-                    if parse_amount([line]):
-                        continue
-
-                    if _line_starts_with_date(line):
-                        remainder = _strip_date_prefix(line)
-                        if remainder:
-                            pending.detail_parts.append(remainder)
-                        continue
-
-                    if parse_date(line):
-                        continue
-
-                    pending.detail_parts.append(line)
-
-            if pending:
-                text_transactions.append(_finalize_pending_transaction(pending))
+        if document is not None:
+            return _parse_text_pages(document)
+        with ParsedDocument.open(pdf_path) as own_document:
+            return _parse_text_pages(own_document)
     except Exception:
         logger.exception("Text-based PDF parsing failed")
         return []
+
+
+def _parse_text_pages(document: ParsedDocument) -> List[RawTransaction]:
+    logger.info("Text-based extraction: processing all %d pages", document.page_count)
+    return _parse_statement_lines(_iter_finished_page_texts(document), document.dates)
+
+
+def _iter_finished_page_texts(document: ParsedDocument) -> Iterator[str]:
+    for page_index in range(1, document.page_count + 1):
+        page_text = document.page_text(page_index)
+        document.finish_page(page_index)
+        yield page_text
+
+
+def _parse_statement_lines(page_texts: Iterable[str], dates: DateFormatLearner) -> List[RawTransaction]:
+    """Text-fallback parser: a line with a date and an amount starts a row, the lines after it describe it."""
+    text_transactions: List[RawTransaction] = []
+    pending: Optional[_PendingTextTransaction] = None
+    for page_text in page_texts:
+        for raw_line in page_text.splitlines():
+            line = raw_line.strip()
+            if not line:
+                continue
+            parsed = _parse_text_transaction_line(line, dates)
+            if parsed:
+                if pending:
+                    text_transactions.append(_finalize_pending_transaction(pending))
+                date_value, meta_text, amount = parsed
+                meta_clean = meta_text.strip()
+                pending = _PendingTextTransaction(
+                    record=RawTransaction(
+                        date=date_value,
+                        description=meta_clean or "Imported transaction",
+                        amount=amount,
+                    ),
+                    meta_parts=[meta_clean] if meta_clean else [],
+                    detail_parts=[],
+                )
+                continue
+
+            if pending is None:
+                continue
+
+            if _looks_like_header(line):
+                continue
+
+            if _is_masked_value(line):
+                continue
+
+            if parse_amount([line]):
+                continue
+
+            if _line_starts_with_date(line):
+                remainder = _strip_date_prefix(line)
+                if remainder:
+                    pending.detail_parts.append(remainder)
+                continue
+
+            if dates.parse(line):
+                continue
+
+            pending.detail_parts.append(line)
+
+    if pending:
+        text_transactions.append(_finalize_pending_transaction(pending))
     return text_transactions
 
 
@@ -869,77 +3568,314 @@ def _score_transactions(rows: List[RawTransaction]) -> float:
     if not absolute_values:
         return float("inf")
     median = absolute_values[len(absolute_values) // 2]
+    return median * _transaction_penalty(rows)
+
+
+def _transaction_penalty(rows: List[RawTransaction]) -> float:
+    """The factor _score_transactions puts on the median: 1.0 for clean rows, more for header and zero-amount rows."""
+    if not rows or all(tx.amount is None for tx in rows):
+        return float("inf")
     header_penalty = sum(1 for tx in rows if _looks_like_header(tx.description)) / len(rows)
     zero_penalty = sum(1 for tx in rows if tx.amount == 0) / len(rows)
-    return median * (1 + header_penalty + zero_penalty)
+    return 1 + header_penalty + zero_penalty
 
 
-def _process_table(table: List[List], page_index: int, table_index: int, transactions: List[RawTransaction]) -> int:
-    """Process a single table and extract transactions. Returns number of transactions extracted."""
-    if not table or len(table) <= 1:
-        return 0
-    
+def _table_has_header(table: List[List]) -> bool:
     # Check if first row is actually a header or a data row
     first_row = table[0] if table and len(table) > 0 else None
     first_row_text = " ".join(str(cell).lower().strip() if cell else "" for cell in first_row) if first_row else ""
-    is_first_row_header = _looks_like_header(first_row_text) if first_row_text else False
-    
-    # If first row is a header, skip it; otherwise include it in body
-    body = table[1:] if is_first_row_header else table
-    rows_processed = 0
+    return _looks_like_header(first_row_text) if first_row_text else False
 
-    # Try to detect column structure from header row if available
-    header = table[0] if is_first_row_header and table and len(table) > 0 else None
+
+def _detect_table_columns(header: List) -> TableColumns:
+    """Find the date/debit/credit/description column indices from a header row."""
     date_col_idx = None
     debit_col_idx = None
     credit_col_idx = None
     desc_col_idx = None
     
-    # Try to find column indices from header
-    if header:
-        header_lower = [str(cell).lower().strip() if cell else "" for cell in header]
-        header_original = [str(cell).strip() if cell else "" for cell in header]
-        for idx, header_cell in enumerate(header_lower):
-            # Date column detection
-            if any(keyword in header_cell for keyword in ['date', 'дата', 'თარიღი']):
-                date_col_idx = idx
-            # Debit column detection - includes Georgian "ბრუნვა (დებ)" pattern
-            if any(keyword in header_cell for keyword in ['debit', 'дебет', 'დებეტი', 'out', 'გასავალი', 'დებ']):
-                debit_col_idx = idx
-            # Also check original text for Georgian patterns
-            if header_original[idx] and ('ბრუნვა (დებ)' in header_original[idx] or 'დებ' in header_original[idx]):
-                debit_col_idx = idx
-            # Credit column detection - includes Georgian "ბრუნვა (კრ)" pattern
-            if any(keyword in header_cell for keyword in ['credit', 'кредит', 'კრედიტი', 'in', 'შემოსავალი', 'კრ']):
-                credit_col_idx = idx
-            # Also check original text for Georgian patterns
-            if header_original[idx] and ('ბრუნვა (კრ)' in header_original[idx] or 'კრ' in header_original[idx]):
-                credit_col_idx = idx
-            # Description column detection
-            if any(keyword in header_cell for keyword in ['description', 'описание', 'აღწერა', 'operation', 'операция', 'ოპერაცია', 'details', 'დეტალები', 'დანიშნულება']):
-                desc_col_idx = idx
+    for idx, cell in enumerate(header):
+        # Later columns win when several match, e.g. "ბრუნვა (დებ)" and a plain "out" column
+        labels = TABLE_COLUMN_KEYWORDS.labels(str(cell).strip()) if cell else frozenset()
+        if "date" in labels:
+            date_col_idx = idx
+        if "debit" in labels:
+            debit_col_idx = idx
+        if "credit" in labels:
+            credit_col_idx = idx
+        if "description" in labels:
+            desc_col_idx = idx
     
     # Fallback to default positions if not found in header
-    if date_col_idx is None:
-        date_col_idx = 0
-    if debit_col_idx is None:
-        debit_col_idx = 2
-    if credit_col_idx is None:
-        credit_col_idx = 3
-    if desc_col_idx is None:
-        desc_col_idx = 5
+    defaults = TableColumns()
+    return TableColumns(
+        date=defaults.date if date_col_idx is None else date_col_idx,
+        debit=defaults.debit if debit_col_idx is None else debit_col_idx,
+        credit=defaults.credit if credit_col_idx is None else credit_col_idx,
+        description=defaults.description if desc_col_idx is None else desc_col_idx,
+    )
+
+
+def _may_be_date(cell: str) -> bool:
+    """False only when parse_date() is certain to return None for the cell."""
+    cleaned = cell.strip()
+    return bool(cleaned) and bool(YEAR_DIGITS_PATTERN.search(cleaned) or SHORT_YEAR_DATE_PATTERN.match(cleaned))
+
+
+def _may_be_amount(cell: str) -> bool:
+    """False only when parse_amount() is certain to return None (letters are stripped, so a digit is required)."""
+    return bool(DIGIT_PATTERN.search(cell))
+
+
+def _date_search_order(columns: TableColumns, width: int) -> List[int]:
+    """Columns in the order a row's date is looked for: description, date, then the rest."""
+    order = [idx for idx in (columns.description, columns.date) if idx < width]
+    order = list(dict.fromkeys(order))
+    return order + [idx for idx in range(width) if idx not in order]
+
+
+def _find_row_date(cells: List[str], columns: TableColumns, classifier: "CellClassifier") -> Optional[Tuple[str, int]]:
+    """Probe the row's cells for a date. Returns (date, column index) or None."""
+    for idx in _date_search_order(columns, len(cells)):
+        date_value = classifier.classify(cells[idx]).date
+        if date_value:
+            return date_value, idx
+    return None
+
+
+def _find_row_amount(cells: List[str], classifier: "CellClassifier") -> Optional[Tuple[int, float, str]]:
+    """Probe every cell for an amount, rightmost first but avoiding the last column. Returns (index, amount, cell)."""
+    amount_candidates: List[Tuple[int, float, str]] = []
+    for idx in range(len(cells) - 1, -1, -1):
+        amount = classifier.classify(cells[idx]).amount_candidate
+        if amount is not None:
+            amount_candidates.append((idx, amount, cells[idx]))
+    if not amount_candidates:
+        return None
+    preferred = [candidate for candidate in amount_candidates if candidate[0] != len(cells) - 1]
+    return (preferred or amount_candidates)[0]
+
+
+@dataclass(frozen=True)
+class CellToken:
+    """What one cleaned table cell parses as. Computed once per distinct string by CellClassifier."""
+
+    date: Optional[str] = None
+    amount: Optional[float] = None
+    is_time: bool = False
+    is_masked: bool = False
+    # Purely numeric identifier (6+ digits, no separators), e.g. an operation number
+    is_id: bool = False
+
+    @property
+    def kind(self) -> str:
+        if self.date:
+            return "date"
+        if self.is_time:
+            return "time"
+        if self.is_masked:
+            return "masked"
+        if self.amount_candidate is not None:
+            return "amount"
+        return "text"
+
+    @property
+    def amount_candidate(self) -> Optional[float]:
+        """The amount this cell contributes when amounts are searched outside the debit/credit columns."""
+        if self.date or self.is_time or self.is_masked or self.is_id:
+            return None
+        return self.amount or None
+
+
+EMPTY_CELL = CellToken()
+
+
+class CellClassifier:
+    """
+    Parses each distinct cell string once into a CellToken shared by every row-level check.
+
+    Statements repeat the same cells constantly ("საბარათე ოპერაცია", "GEL", empty debit
+    columns), and one cell used to go through parse_date, parse_amount and the time/masked
+    checks several times per row. Dates go through the document's DateFormatLearner when
+    one is given. The memo is bounded: past `max_entries` the oldest entries are dropped.
+
+    When the page texts held no currency evidence, each distinct cell is also handed to the
+    document's CurrencyDetector until it is done, so amounts like "3.54 GEL" still settle
+    the currency without another pass over the rows.
+    """
+
+    def __init__(
+        self,
+        dates: Optional[DateFormatLearner] = None,
+        currency: Optional[CurrencyDetector] = None,
+        max_entries: int = 4096,
+    ):
+        self.dates = dates
+        self.currency = currency
+        self.max_entries = max_entries
+        self._tokens: Dict[str, CellToken] = {}
+
+    def classify(self, cell: str) -> CellToken:
+        token = self._tokens.get(cell)
+        if token is not None:
+            return token
+        token = self._parse(cell)
+        if len(self._tokens) >= self.max_entries:
+            # dicts keep insertion order, so this drops the oldest entry
+            del self._tokens[next(iter(self._tokens))]
+        self._tokens[cell] = token
+        return token
+
+    def _parse(self, cell: str) -> CellToken:
+        if not cell.strip():
+            return EMPTY_CELL
+        # Bare numbers (most amounts and balances) can't hold a currency signal
+        # Cells only matter while the page texts gave no currency at all (see CurrencyDetector)
+        if (
+            self.currency is not None
+            and not self.currency.has_page_evidence
+            and not self.currency.done
+            and AMOUNT_NOISE_PATTERN.search(cell)
+        ):
+            self.currency.feed(cell, cell=True)
+        numeric_only = cell.replace(" ", "")
+        return CellToken(
+            date=self.dates.parse(cell) if self.dates else parse_date(cell),
+            amount=parse_amount([cell]),
+            is_time=_looks_like_time(cell),
+            is_masked=_is_masked_value(cell),
+            is_id=numeric_only.isdigit() and len(numeric_only) >= 6 and "," not in cell and "." not in cell,
+        )
+
+
+class _TableSchema:
+    """
+    Column kinds (date, time, masked, amount, text, empty) sampled from a table's first rows.
+
+    Lets _process_table read a row's date and fallback amount by direct index instead of
+    running every parser over every cell. Each fast path first checks that the row fits:
+    the cells the full search would have tried earlier must be unable to hold a date or
+    amount (a cheap exact test). Rows that don't fit return None and are probed cell by
+    cell as before, so a wrong guess costs time but never changes the result.
+    """
+
+    SAMPLE_ROWS = 8
+
+    def __init__(self, kinds: List[str], columns: TableColumns):
+        self.kinds = kinds
+        self.width = len(kinds)
+        order = _date_search_order(columns, self.width)
+        self.date_column = next((idx for idx in order if kinds[idx] == "date"), None)
+        self._date_skipped = order[:order.index(self.date_column)] if self.date_column is not None else []
+
+        last = self.width - 1
+        amount_columns = [idx for idx, kind in enumerate(kinds) if kind == "amount"]
+        preferred = [idx for idx in amount_columns if idx != last]
+        self.amount_column = max(preferred or amount_columns) if amount_columns else None
+        if self.amount_column is None:
+            self._amount_skipped: List[int] = []
+        elif self.amount_column == last:
+            self._amount_skipped = list(range(last))
+        else:
+            self._amount_skipped = list(range(self.amount_column + 1, last))
+
+    @classmethod
+    def infer(
+        cls,
+        rows: List[List],
+        columns: TableColumns,
+        classifier: CellClassifier,
+        sample_rows: Optional[int] = None,
+    ) -> Optional["_TableSchema"]:
+        sample: List[List[str]] = []
+        for row in rows:
+            cells = [_clean_cell_text(cell) for cell in row]
+            if any(cells):
+                sample.append(cells)
+            if len(sample) >= (sample_rows or cls.SAMPLE_ROWS):
+                break
+        if not sample:
+            return None
+        width = max(len(cells) for cells in sample)
+        kinds: List[str] = []
+        for idx in range(width):
+            votes: Dict[str, int] = {}
+            for cells in sample:
+                if idx < len(cells) and cells[idx]:
+                    kind = classifier.classify(cells[idx]).kind
+                    votes[kind] = votes.get(kind, 0) + 1
+            kinds.append(max(votes, key=lambda kind: votes[kind]) if votes else "empty")
+        return cls(kinds, columns)
+
+    def row_date(self, cells: List[str], classifier: CellClassifier) -> Optional[Tuple[str, int]]:
+        if self.date_column is None or len(cells) != self.width:
+            return None
+        if any(_may_be_date(cells[idx]) for idx in self._date_skipped):
+            return None
+        date_value = classifier.classify(cells[self.date_column]).date
+        return (date_value, self.date_column) if date_value else None
+
+    def row_amount(self, cells: List[str], classifier: CellClassifier) -> Optional[Tuple[int, float, str]]:
+        if self.amount_column is None or len(cells) != self.width:
+            return None
+        if any(_may_be_amount(cells[idx]) for idx in self._amount_skipped):
+            return None
+        amount = classifier.classify(cells[self.amount_column]).amount_candidate
+        return (self.amount_column, amount, cells[self.amount_column]) if amount is not None else None
+
+
+def _process_table(
+    table: List[List],
+    page_index: int,
+    table_index: int,
+    transactions: List[RawTransaction],
+    columns: Optional[TableColumns] = None,
+    classifier: Optional[CellClassifier] = None,
+    stats: Optional["ExtractionStats"] = None,
+) -> int:
+    """
+    Process a single table and extract transactions. Returns number of transactions extracted.
+
+    `columns` skips header-based column detection, e.g. when a cached layout recipe already knows them.
+    `classifier` is the document's CellClassifier; without one the table gets a fresh one.
+    Skipped rows are counted in `stats`; per-row log lines are only written when stats.trace is set.
+    """
+    if not table or len(table) <= 1:
+        return 0
     
-    # Log detected column structure for debugging
-    if header:
-        logger.debug("Page %d table %d: Detected columns - Date: %s, Debit: %s, Credit: %s, Desc: %s", 
-                    page_index, table_index, date_col_idx, debit_col_idx, credit_col_idx, desc_col_idx)
+    is_first_row_header = _table_has_header(table)
+    
+    # If first row is a header, skip it; otherwise include it in body
+    body = table[1:] if is_first_row_header else table
+    rows_processed = 0
+
+    # Try to detect column structure from header row if available
+    header = table[0] if is_first_row_header else None
+    if columns is None:
+        columns = _detect_table_columns(header) if header else TableColumns()
+        # Log detected column structure for debugging
+        if header:
+            logger.debug("Page %d table %d: Detected columns - Date: %s, Debit: %s, Credit: %s, Desc: %s", 
+                        page_index, table_index, columns.date, columns.debit, columns.credit, columns.description)
+    date_col_idx = columns.date
+    debit_col_idx = columns.debit
+    credit_col_idx = columns.credit
+    desc_col_idx = columns.description
     
     recent_transaction: Optional[RawTransaction] = None
+    classifier = classifier or CellClassifier()
+    stats = stats or ExtractionStats()
+    trace = stats.trace
+    schema = _TableSchema.infer(body, columns, classifier)
+    if trace and schema is not None:
+        logger.debug("Page %d table %d: column kinds %s", page_index, table_index, ", ".join(schema.kinds))
 
     for row_idx, row in enumerate(body, start=1):
         cells = [_clean_cell_text(cell) for cell in row]
         if not any(cells):
             continue
+        # Full per-row detail only for the first rows of traced documents
+        detail = trace and row_idx <= 6
 
         # Check if this row looks like a header row BEFORE processing
         # But be careful - don't skip valid transactions that happen to contain header-like words
@@ -951,26 +3887,27 @@ def _process_table(table: List[List], page_index: int, table_index: int, transac
             # Check if it has a date - if yes, it's probably a transaction row, not a header
             has_date = False
             for cell in cells:
-                if parse_date(cell):
+                if classifier.classify(cell).date:
                     has_date = True
                     break
             
             # If it has a date, don't treat it as a header
             if has_date:
                 is_header = False
-                if row_idx <= 6:
+                if detail:
                     logger.info("Row %d contains header-like text but has a date - treating as transaction", row_idx)
         
         if is_header:
-            if row_idx <= 6:
+            if detail:
                 logger.info("SKIPPING ROW %d: Detected as header row", row_idx)
                 logger.info("  Row text: %s", row_text[:100])
-            else:
+            elif trace:
                 logger.debug("Skipping header row %d: %s", row_idx, " | ".join(cells[:5]))
+            stats.count("rows_skipped_header")
             continue
 
         # Log raw cells for first 6 rows to debug
-        if row_idx <= 6:
+        if detail:
             logger.info("=" * 80)
             logger.info("PROCESSING ROW %d (Page %d, Table %d)", row_idx, page_index, table_index)
             logger.info("Raw cells (%d total):", len(cells))
@@ -979,32 +3916,16 @@ def _process_table(table: List[List], page_index: int, table_index: int, transac
             if len(cells) > 8:
                 logger.info("  ... (%d more cells)", len(cells) - 8)
         
-        row_description_hint = _collect_description_from_cells(cells)
-
-        # Try to find date in description column first (user's request)
+        # Date: description column first (user's request), then the date column, then the rest.
+        # The schema reads it by index when the row fits; otherwise probe every cell.
+        found_date = schema.row_date(cells, classifier) if schema else None
+        if found_date is None:
+            found_date = _find_row_date(cells, columns, classifier)
         date_value = None
-        if desc_col_idx < len(cells) and cells[desc_col_idx]:
-            date_value = parse_date(cells[desc_col_idx])
-            if date_value and row_idx <= 6:
-                logger.info("Found date in description column: '%s' -> %s", cells[desc_col_idx][:50], date_value)
-        
-        # If date not found in description, try date column
-        if not date_value and date_col_idx < len(cells):
-            date_value = parse_date(cells[date_col_idx])
-            if date_value and row_idx <= 6:
-                logger.info("Found date in date column: '%s' -> %s", cells[date_col_idx][:50], date_value)
-        
-        # If date still not found, try all other columns (excluding description and date columns already checked)
-        if not date_value:
-            for idx, cell in enumerate(cells):
-                # Skip description and date columns (already checked)
-                if idx == desc_col_idx or idx == date_col_idx:
-                    continue
-                date_value = parse_date(cell)
-                if date_value:
-                    if row_idx <= 6:
-                        logger.info("Found date in column[%d]: '%s' -> %s", idx, cell[:50], date_value)
-                    break
+        if found_date is not None:
+            date_value, date_found_idx = found_date
+            if detail:
+                logger.info("Found date in column[%d]: '%s' -> %s", date_found_idx, cells[date_found_idx][:50], date_value)
         
         # Skip rows without dates - don't modify previous transactions
         # Only skip if we also don't have valid amounts (to avoid skipping valid transactions)
@@ -1012,27 +3933,29 @@ def _process_table(table: List[List], page_index: int, table_index: int, transac
             # Check if this row has any amounts - if yes, it might be a valid transaction with date in wrong column
             has_amounts = False
             if debit_col_idx < len(cells) and cells[debit_col_idx]:
-                if parse_amount([cells[debit_col_idx]]):
+                if classifier.classify(cells[debit_col_idx]).amount:
                     has_amounts = True
             if not has_amounts and credit_col_idx < len(cells) and cells[credit_col_idx]:
-                if parse_amount([cells[credit_col_idx]]):
+                if classifier.classify(cells[credit_col_idx]).amount:
                     has_amounts = True
             
             # If no date and no amounts, skip this row entirely without modifying previous transaction
             if not has_amounts:
-                if row_idx <= 6:
+                if detail:
                     logger.info("SKIPPING ROW %d: No date and no amounts", row_idx)
                     logger.info("  Cells: %s", " | ".join(cells[:8]))
-                else:
+                elif trace:
                     logger.debug("Skipping row %d: no date and no amounts. Cells: %s", row_idx, " | ".join(cells[:5]))
+                stats.count("rows_skipped_no_date_no_amount")
                 continue
             
             # If we have amounts but no date, try harder to find date or skip
-            if row_idx <= 6:
+            if detail:
                 logger.info("SKIPPING ROW %d: Has amounts but no date (skipping to avoid misalignment)", row_idx)
                 logger.info("  Cells: %s", " | ".join(cells[:8]))
-            else:
+            elif trace:
                 logger.debug("Row %d has amounts but no date, skipping to avoid misalignment", row_idx)
+            stats.count("rows_skipped_no_date")
             continue
 
         # Extract amounts from debit/credit columns - be very strict about column indices
@@ -1040,7 +3963,7 @@ def _process_table(table: List[List], page_index: int, table_index: int, transac
         credit_amount = None
         
         # Log column indices and amount extraction for first 6 rows
-        if row_idx <= 6:
+        if detail:
             logger.info("Column indices - Date: %s, Debit: %s, Credit: %s, Desc: %s", 
                        date_col_idx, debit_col_idx, credit_col_idx, desc_col_idx)
             logger.info("Date extraction: '%s' -> %s", cells[date_col_idx] if date_col_idx < len(cells) else "N/A", date_value)
@@ -1048,37 +3971,23 @@ def _process_table(table: List[List], page_index: int, table_index: int, transac
         if debit_col_idx < len(cells):
             debit_text = cells[debit_col_idx].replace("\n", " ").strip()
             if debit_text:
-                debit_amount = parse_amount([debit_text])
-                if row_idx <= 6:
+                debit_amount = classifier.classify(debit_text).amount
+                if detail:
                     logger.info("Debit column[%s]: '%s' -> %s", debit_col_idx, debit_text[:40], debit_amount)
         if credit_col_idx < len(cells):
             credit_text = cells[credit_col_idx].replace("\n", " ").strip()
             if credit_text:
-                credit_amount = parse_amount([credit_text])
-                if row_idx <= 6:
+                credit_amount = classifier.classify(credit_text).amount
+                if detail:
                     logger.info("Credit column[%s]: '%s' -> %s", credit_col_idx, credit_text[:40], credit_amount)
         
         # If amounts not found in expected columns, try to find in any column
         if debit_amount is None and credit_amount is None:
-            amount_candidates: List[Tuple[int, float, str]] = []
-            for idx in range(len(cells) - 1, -1, -1):
-                cell = cells[idx]
-                if not cell:
-                    continue
-                if parse_date(cell) or _looks_like_time(cell):
-                    continue
-                if _is_masked_value(cell):
-                    continue
-                stripped_digits = cell.replace(" ", "")
-                if stripped_digits.isdigit() and len(stripped_digits) >= 6 and "," not in cell and "." not in cell:
-                    continue
-                amount = parse_amount([cell])
-                if amount is None or amount == 0:
-                    continue
-                amount_candidates.append((idx, amount, cell))
-            if amount_candidates:
-                preferred = [candidate for candidate in amount_candidates if candidate[0] != len(cells) - 1]
-                target_idx, candidate_value, raw_cell = (preferred or amount_candidates)[0]
+            found_amount = schema.row_amount(cells, classifier) if schema else None
+            if found_amount is None:
+                found_amount = _find_row_amount(cells, classifier)
+            if found_amount is not None:
+                target_idx, candidate_value, raw_cell = found_amount
                 raw_stripped = raw_cell.strip()
                 if candidate_value < 0 or raw_stripped.startswith("-") or raw_stripped.startswith("("):
                     debit_amount = abs(candidate_value)
@@ -1098,7 +4007,8 @@ def _process_table(table: List[List], page_index: int, table_index: int, transac
                 if idx != desc_col_idx and cells[idx]:
                     text = cells[idx].replace("\n", " ")
                     # Skip if it looks like a date or pure amount
-                    if not parse_date(text) and not parse_amount([text]):
+                    token = classifier.classify(text)
+                    if not token.date and not token.amount:
                         description_segments.append(text)
             
             description_text = " ".join(segment for segment in description_segments if segment).strip()
@@ -1117,12 +4027,13 @@ def _process_table(table: List[List], page_index: int, table_index: int, transac
             amount_value = abs(credit_amount)
         
         if amount_value is None:
-            if row_idx <= 6:
+            if detail:
                 logger.warning("SKIPPING ROW %d: Could not extract amount", row_idx)
                 logger.warning("  Debit amount: %s, Credit amount: %s", debit_amount, credit_amount)
                 logger.warning("  Cells: %s", " | ".join(cells[:8]))
-            else:
+            elif trace:
                 logger.warning("Row %d: Could not extract amount. Cells: %s", row_idx, " | ".join(cells[:8]))
+            stats.count("rows_skipped_no_amount")
             continue
 
         # Extract description - STRICTLY use ONLY description column (column 5)
@@ -1131,7 +4042,7 @@ def _process_table(table: List[List], page_index: int, table_index: int, transac
         if desc_col_idx < len(cells):
             description = cells[desc_col_idx].replace("\n", " ").strip()
         
-        if row_idx <= 6:
+        if detail:
             logger.info("Description extraction:")
             logger.info("  Description column[%s]: '%s'", desc_col_idx, description[:80] if description else "(empty)")
             if len(cells) > 1:
@@ -1148,7 +4059,7 @@ def _process_table(table: List[List], page_index: int, table_index: int, transac
                     generic_operations = ['საბარათე ოპერაცია', 'card operation', 'გადახდები', 'payments']
                     if operation_text not in generic_operations:
                         description = operation_text
-                        if row_idx <= 6:
+                        if detail:
                             logger.info("  Using operation column as fallback: '%s'", description[:80])
         
         # Final fallback
@@ -1157,19 +4068,20 @@ def _process_table(table: List[List], page_index: int, table_index: int, transac
         
         # Final check: if description looks like a header, skip this row
         if _looks_like_header(description.lower()):
-            if row_idx <= 6:
+            if detail:
                 logger.info("SKIPPING ROW %d: Description looks like header", row_idx)
                 logger.info("  Description: %s", description[:100])
-            else:
+            elif trace:
                 logger.debug("Skipping row %d: description looks like header: %s", row_idx, description[:50])
+            stats.count("rows_skipped_header_description")
             continue
         
         # Clean up description - remove any embedded amounts that might have been extracted
         # This prevents "გადახდა - LTD MADAGONI 2 3.54 GEL" from being in description when amount is already extracted
-        description = re.sub(r'\d+\.\d{2}\s*(?:GEL|USD|EUR|RUB|₾|₽|\$|€)', '', description, flags=re.IGNORECASE).strip()
-        description = re.sub(r'\s+', ' ', description).strip()
+        description = EMBEDDED_AMOUNT_PATTERN.sub('', description).strip()
+        description = WHITESPACE_PATTERN.sub(' ', description).strip()
         
-        if row_idx <= 6:
+        if detail:
             logger.info("  Final description: '%s'", description[:100])
 
         new_transaction = RawTransaction(
@@ -1179,7 +4091,7 @@ def _process_table(table: List[List], page_index: int, table_index: int, transac
         )
         
         # Log transaction details for first 6 rows
-        if row_idx <= 6:
+        if detail:
             logger.info("EXTRACTED TRANSACTION:")
             logger.info("  Date: %s", date_value)
             logger.info("  Amount: %.2f (debit: %s, credit: %s)", 
@@ -1193,21 +4105,10 @@ def _process_table(table: List[List], page_index: int, table_index: int, transac
         recent_transaction = new_transaction
         rows_processed += 1
     
+    stats.count("rows_parsed", rows_processed)
     return rows_processed
 
 
-def extract_transactions_with_mineru(pdf_path: Path) -> List[RawTransaction]:
-    if mineru is None:  # pragma: no cover - placeholder extraction
-        return sample_transactions()
-
-    try:  # pragma: no cover
-        # TODO: integrate MinerU pipeline here.
-        return sample_transactions()
-    except Exception:
-        traceback.print_exc()
-        return sample_transactions()
-
-
 def load_classifier(model_path: Path):
     if joblib is None:
         return None
@@ -1316,42 +4217,28 @@ def predict_category(description_en: str, model) -> Tuple[Optional[str], float]:
 
 
 def main() -> int:
-    if len(sys.argv) < 2:
+    # --ndjson streams one JSON line per transaction followed by a metadata line
+    args = [arg for arg in sys.argv[1:] if arg != "--ndjson"]
+    ndjson = len(args) != len(sys.argv) - 1
+
+    if not args:
         print(json.dumps({"transactions": [], "metadata": {}}))
         return 0
 
-    pdf_path = Path(sys.argv[1]).expanduser().resolve()
+    pdf_path = Path(args[0]).expanduser().resolve()
     model_path = (
-        Path(sys.argv[2]).expanduser().resolve()
-        if len(sys.argv) > 2
+        Path(args[1]).expanduser().resolve()
+        if len(args) > 1
         else Path(__file__).resolve().parent / "models" / "transactions_model.joblib"
     )
 
-    extracted_transactions: List[RawTransaction] = []
-    metadata = StatementMetadata(source=pdf_path.name)
-
-    if pdfplumber is not None:
-        extracted_transactions, metadata = extract_transactions_with_pdfplumber(pdf_path)
+    if ndjson:
+        return _stream_ndjson(pdf_path, load_classifier(model_path))
 
-    if not extracted_transactions:
-        logger.warning("pdfplumber extraction returned zero rows, attempting mineru fallback")
-        extracted_transactions = extract_transactions_with_mineru(pdf_path)
+    extracted_transactions, metadata = extract_transactions(pdf_path)
 
     if extracted_transactions:
         logger.info("Extracted %d transactions from PDF", len(extracted_transactions))
-        # Check if we got sample data (indicates extraction failed)
-        if len(extracted_transactions) == 3:
-            sample_descriptions = ['Sample Subscription', 'Coffee Shop', 'Salary']
-            is_sample = all(
-                any(sample in tx.description for sample in sample_descriptions)
-                for tx in extracted_transactions
-            )
-            if is_sample:
-                logger.error("PDF extraction failed - received sample transaction data. The PDF structure may not match the expected format.")
-                logger.error("Expected table structure: Date | Operation | Debit | Credit | ... | Description | Beneficiary")
-                logger.error("Please check the PDF format and ensure it contains a transaction table.")
-                # Return empty list instead of sample data
-                extracted_transactions = []
     else:
         logger.warning("No transactions extracted from PDF. The PDF structure may not match the expected format.")
 
@@ -1359,38 +4246,50 @@ def main() -> int:
 
     payload = {
         "transactions": [],
-        "metadata": {
-            "currency": metadata.currency,
-            "currencyConfidence": metadata.currency_confidence,
-            "currencyDetectionMethod": metadata.currency_detection_method,
-            "source": metadata.source,
-            "periodStart": metadata.period_start,
-            "periodEnd": metadata.period_end,
-        },
+        "metadata": _metadata_payload(metadata),
     }
 
-    for index, item in enumerate(extracted_transactions, start=1):
-        if index == 1:
-            logger.info("Starting translation + categorisation for %d transactions", len(extracted_transactions))
-        translated = translate_to_english(item.description)
-        if index % 25 == 0 or index == len(extracted_transactions):
-            logger.info("Progress: processed %d/%d rows", index, len(extracted_transactions))
-        category, confidence = predict_category(translated, model)
-        payload["transactions"].append(
-            {
-                "date": item.date,
-                "description": item.description,
-                "translatedDescription": translated,
-                "amount": round(float(item.amount), 2),
-                "category": category,
-                "confidence": round(float(confidence), 2),
-            }
-        )
+    if extracted_transactions:
+        logger.info("Starting translation + categorisation for %d transactions", len(extracted_transactions))
+        payload["transactions"] = _enrich_batch(extracted_transactions, model)
+        logger.info("Progress: processed %d/%d rows", len(extracted_transactions), len(extracted_transactions))
 
     print(json.dumps(payload, ensure_ascii=False))
     return 0
 
 
+def _stream_ndjson(pdf_path: Path, model) -> int:
+    """
+    Write {"transaction": {...}} lines as pages are extracted, then one {"metadata": {...}} line.
+
+    The metadata line carries the row count and, if extraction failed part-way, an "error"
+    so the caller can tell a complete statement from a truncated one.
+    """
+    metadata = StatementMetadata(source=pdf_path.name)
+    count = 0
+    error: Optional[str] = None
+    try:
+        for row in iter_transactions(pdf_path, model, metadata=metadata):
+            count += 1
+            sys.stdout.write(json.dumps({"transaction": row}, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+            if count % 25 == 0:
+                logger.info("Progress: streamed %d rows", count)
+    except Exception as e:  # pragma: no cover
+        logger.error("Exception during PDF extraction: %s", str(e))
+        traceback.print_exc()
+        error = str(e)
+
+    if not count:
+        logger.warning("No transactions extracted from PDF. The PDF structure may not match the expected format.")
+    final_line: Dict = {"metadata": _metadata_payload(metadata), "count": count}
+    if error:
+        final_line["error"] = error
+    sys.stdout.write(json.dumps(final_line, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+    return 0
+
+
 if __name__ == "__main__":  # pragma: no cover
     if hasattr(sys.stdout, "reconfigure"):
         try:  # pragma: no cover